@@ -0,0 +1,41 @@
+"""
+Run the fare prediction service.
+
+Each uvicorn worker process builds its own app (and loads the model once);
+model and batching settings come from FARE_API_* environment variables.
+
+    python -m entrypoint.serve --port 8000 --workers 4
+"""
+
+import argparse
+import logging
+
+import uvicorn
+
+
+def main():
+    """Main entry point for the prediction service."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--log-level", default="info", help="uvicorn log level")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    uvicorn.run(
+        "src.api.service:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+        # Fare quotes are small JSON bodies; skip per-request access logging
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
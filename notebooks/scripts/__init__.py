@@ -1,3 +1,11 @@
 """
 Helper scripts for Flight Fare Prediction EDA notebooks.
 """
+
+import sys
+from pathlib import Path
+
+# Make the project's src package importable from the notebooks directory
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
@@ -3,20 +3,24 @@ Analysis utilities for Flight Fare Prediction project.
 """
 
 import pandas as pd
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
+from src.data.cube import FareCube
+from src.data.query import FlightData, as_frame
+from src.data.routes import ROUTE_COLUMNS, RouteIndex, route_column
 
-def analyze_categorical_variable(df: pd.DataFrame, column: str, top_n: int = 10) -> None:
+
+def analyze_categorical_variable(df: FlightData, column: str, top_n: int = 10) -> None:
     """
     Analyze a categorical variable.
 
     Args:
-        df: DataFrame containing the data
+        df: DataFrame or FlightQuery containing the data
         column: Column name to analyze
         top_n: Number of top categories to display
     """
     print(f"\n{column} Distribution:")
-    value_counts = df[column].value_counts()
+    value_counts = as_frame(df, [column])[column].value_counts()
 
     if len(value_counts) <= top_n:
         print(value_counts)
@@ -25,26 +29,39 @@ def analyze_categorical_variable(df: pd.DataFrame, column: str, top_n: int = 10)
         print(f"... and {len(value_counts) - top_n} more")
 
 
+def _covers(cube: Optional[FareCube], columns: List[str], fare_col: str) -> bool:
+    """Whether a cube can answer fare statistics grouped by each of ``columns``."""
+    return cube is not None and cube.measure == fare_col and set(columns) <= set(cube.dimensions)
+
+
 def analyze_fare_by_category(
-    df: pd.DataFrame, category_col: str, fare_col: str = "Total Fare (BDT)", top_n: int = 5
+    df: FlightData,
+    category_col: str,
+    fare_col: str = "Total Fare (BDT)",
+    top_n: int = 5,
+    cube: Optional[FareCube] = None,
 ) -> pd.DataFrame:
     """
     Analyze average fares by category.
 
     Args:
-        df: DataFrame containing the data
+        df: DataFrame or FlightQuery containing the data
         category_col: Column to group by
         fare_col: Fare column name
         top_n: Number of top categories to show
+        cube: Pre-aggregated fare cube; if it covers the column, the statistics
+            are rolled up from it instead of grouping ``df`` (medians are then
+            approximate)
 
     Returns:
         DataFrame with aggregated statistics
     """
-    stats = (
-        df.groupby(category_col)[fare_col]
-        .agg(["mean", "median", "count"])
-        .sort_values("mean", ascending=False)
-    )
+    if _covers(cube, [category_col], fare_col):
+        stats = cube.rollup([category_col])[["mean", "median", "count"]]
+    else:
+        df = as_frame(df, [category_col, fare_col])
+        stats = df.groupby(category_col, observed=True)[fare_col].agg(["mean", "median", "count"])
+    stats = stats.sort_values("mean", ascending=False)
 
     print(f"\nAverage {fare_col} by {category_col} (Top {top_n}):")
     print(stats.head(top_n))
@@ -52,44 +69,76 @@ def analyze_fare_by_category(
     return stats
 
 
-def create_route_feature(df: pd.DataFrame) -> pd.DataFrame:
+def _with_column(df: pd.DataFrame, name: str, values: pd.Series, inplace: bool) -> pd.DataFrame:
+    """
+    Add a column without copying the existing ones.
+
+    Args:
+        df: DataFrame to extend
+        name: New column name
+        values: Column values aligned with ``df``
+        inplace: Add the column to ``df`` itself instead of a new frame
+
+    Returns:
+        ``df`` itself if inplace, else a new frame sharing ``df``'s column data
+    """
+    # A shallow copy shares the existing columns, so only the new column is allocated
+    result = df if inplace else df.copy(deep=False)
+    result[name] = values
+    return result
+
+
+def route_feature(df: FlightData) -> pd.Series:
+    """
+    Compute the route feature from source and destination.
+
+    Args:
+        df: DataFrame or FlightQuery with Source and Destination columns
+
+    Returns:
+        Categorical "Route" Series aligned with ``df``
+    """
+    df = as_frame(df, list(ROUTE_COLUMNS))
+    return pd.Series(route_column(df), index=df.index, name="Route")
+
+
+def create_route_feature(df: FlightData, inplace: bool = False) -> pd.DataFrame:
     """
     Create route feature from source and destination.
 
     Args:
-        df: DataFrame containing the data
+        df: DataFrame containing the data (a FlightQuery is read in full)
+        inplace: Add the column to ``df`` instead of returning a new frame
 
     Returns:
-        DataFrame with new Route column
+        DataFrame with new categorical Route column (shares the other
+        columns' data with ``df`` unless inplace)
     """
-    df_copy = df.copy()
-    df_copy["Route"] = df_copy["Source"] + " → " + df_copy["Destination"]
-    return df_copy
+    df = as_frame(df)
+    return _with_column(df, "Route", route_feature(df), inplace)
 
 
-def analyze_routes(df: pd.DataFrame, top_n: int = 10) -> Dict[str, pd.Series]:
+def analyze_routes(df: FlightData, top_n: int = 10) -> Dict[str, pd.Series]:
     """
     Analyze most popular and expensive routes.
 
     Args:
-        df: DataFrame with Route column
+        df: DataFrame or FlightQuery with Source and Destination columns
         top_n: Number of routes to show
 
     Returns:
         Dictionary with popular and expensive routes
     """
+    df = as_frame(df, [*ROUTE_COLUMNS, "Total Fare (BDT)"])
+    routes = RouteIndex.from_frame(df, track_quantiles=False)
+
     # Most popular routes
     print(f"\nTop {top_n} Most Popular Routes:")
-    popular = df["Route"].value_counts().head(top_n)
+    popular = routes.popular(top_n)
     print(popular)
 
     # Most expensive routes (minimum flights filter)
-    route_fares = (
-        df.groupby("Route")["Total Fare (BDT)"]
-        .agg(["mean", "count"])
-        .sort_values("mean", ascending=False)
-    )
-    expensive = route_fares[route_fares["count"] >= 10].head(top_n)
+    expensive = routes.expensive(top_n, min_count=10)
 
     print(f"\nTop {top_n} Most Expensive Routes (min 10 flights):")
     print(expensive)
@@ -97,77 +146,112 @@ def analyze_routes(df: pd.DataFrame, top_n: int = 10) -> Dict[str, pd.Series]:
     return {"popular": popular, "expensive": expensive}
 
 
-def calculate_tax_percentage(df: pd.DataFrame) -> pd.DataFrame:
+def tax_percentage(df: FlightData) -> pd.Series:
+    """
+    Compute tax and surcharge as a percentage of the base fare.
+
+    Args:
+        df: DataFrame or FlightQuery containing fare data
+
+    Returns:
+        "Tax Percentage" Series aligned with ``df``
+    """
+    df = as_frame(df, ["Tax & Surcharge (BDT)", "Base Fare (BDT)"])
+    return (df["Tax & Surcharge (BDT)"] / df["Base Fare (BDT)"] * 100).rename("Tax Percentage")
+
+
+def calculate_tax_percentage(df: FlightData, inplace: bool = False) -> pd.DataFrame:
     """
     Calculate tax percentage from fare components.
 
     Args:
-        df: DataFrame containing fare data
+        df: DataFrame containing fare data (a FlightQuery is read in full)
+        inplace: Add the column to ``df`` instead of returning a new frame
 
     Returns:
-        DataFrame with Tax Percentage column
+        DataFrame with Tax Percentage column (shares the other columns' data
+        with ``df`` unless inplace)
     """
-    df_copy = df.copy()
-    df_copy["Tax Percentage"] = (
-        df_copy["Tax & Surcharge (BDT)"] / df_copy["Base Fare (BDT)"]
-    ) * 100
+    df = as_frame(df)
+    tax_pct = tax_percentage(df)
 
     print("\nFare Components:")
-    print(f"Base Fare - Mean:       {df_copy['Base Fare (BDT)'].mean():,.2f} BDT")
-    print(f"Tax & Surcharge - Mean: {df_copy['Tax & Surcharge (BDT)'].mean():,.2f} BDT")
-    print(f"Total Fare - Mean:      {df_copy['Total Fare (BDT)'].mean():,.2f} BDT")
-    print(f"\nAverage Tax Percentage: {df_copy['Tax Percentage'].mean():.2f}%")
+    print(f"Base Fare - Mean:       {df['Base Fare (BDT)'].mean():,.2f} BDT")
+    print(f"Tax & Surcharge - Mean: {df['Tax & Surcharge (BDT)'].mean():,.2f} BDT")
+    print(f"Total Fare - Mean:      {df['Total Fare (BDT)'].mean():,.2f} BDT")
+    print(f"\nAverage Tax Percentage: {tax_pct.mean():.2f}%")
 
-    return df_copy
+    return _with_column(df, "Tax Percentage", tax_pct, inplace)
 
 
-def generate_business_insights(df: pd.DataFrame, top_n: int = 3) -> Dict[str, Any]:
+def generate_business_insights(
+    df: Optional[FlightData], top_n: int = 3, cube: Optional[FareCube] = None
+) -> Dict[str, Any]:
     """
     Generate key business insights from the data.
 
     Args:
-        df: DataFrame containing flight data
+        df: DataFrame or FlightQuery containing flight data (may be None when
+            ``cube`` covers Airline, Seasonality and Class)
         top_n: Number of top items to show per category
+        cube: Pre-aggregated fare cube (see materialize_fare_cube); the
+            insights are rolled up from it instead of grouping ``df``, and the
+            route insights come from its Route dimension
 
     Returns:
         Dictionary with insights
     """
+    fare_col = "Total Fare (BDT)"
+    use_cube = _covers(cube, ["Airline", "Seasonality", "Class"], fare_col)
+    if use_cube:
+        has_routes = "Route" in cube.dimensions
+    else:
+        # Route insights need a Route column, as created by create_route_feature
+        has_routes = "Route" in df.columns
+        columns = ["Airline", "Seasonality", "Class", fare_col]
+        df = as_frame(df, columns + list(ROUTE_COLUMNS) if has_routes else columns)
+
+    def fare_stats(column: str) -> pd.DataFrame:
+        if use_cube:
+            return cube.rollup([column], median=False)[["mean", "count"]]
+        return df.groupby(column, observed=True)[fare_col].agg(["mean", "count"])
+
     print("=" * 60)
     print("KEY BUSINESS INSIGHTS")
     print("=" * 60)
 
     # Top airlines by fare
     print(f"\nAverage Fare Per Airline (Top {top_n}):")
-    top_airlines = (
-        df.groupby("Airline")["Total Fare (BDT)"]
-        .agg(["mean", "count"])
-        .sort_values("mean", ascending=False)
-        .head(top_n)
-    )
+    top_airlines = fare_stats("Airline").sort_values("mean", ascending=False).head(top_n)
     for idx, (airline, row) in enumerate(top_airlines.iterrows(), 1):
         print(f"   {idx}. {airline}: {row['mean']:,.2f} BDT (n={row['count']:,})")
 
-    # Most popular routes (assuming Route column exists)
-    if "Route" in df.columns:
+    # Most popular routes
+    if has_routes:
         print(f"\nMOST POPULAR ROUTES (Top {top_n}):")
-        top_routes = df["Route"].value_counts().head(top_n)
-        for idx, (route, count) in enumerate(top_routes.items(), 1):
-            avg_fare = df[df["Route"] == route]["Total Fare (BDT)"].mean()
-            print(f"   {idx}. {route}: {count:,} flights, Avg Fare: {avg_fare:,.2f} BDT")
+        if use_cube:
+            routes = fare_stats("Route").sort_values("count", ascending=False, kind="stable")
+            popular = routes.head(top_n)
+            for idx, (route, row) in enumerate(popular.iterrows(), 1):
+                print(
+                    f"   {idx}. {route}: {int(row['count']):,} flights, "
+                    f"Avg Fare: {row['mean']:,.2f} BDT"
+                )
+        else:
+            routes = RouteIndex.from_frame(df, track_quantiles=False)
+            for idx, (route, count) in enumerate(routes.popular(top_n).items(), 1):
+                avg_fare = routes.lookup(route)["mean"]
+                print(f"   {idx}. {route}: {count:,} flights, Avg Fare: {avg_fare:,.2f} BDT")
 
     # Seasonal variation
     print("\nSEASONAL FARE VARIATION:")
-    seasonal = df.groupby("Seasonality")["Total Fare (BDT)"].mean().sort_values(ascending=False)
+    seasonal = fare_stats("Seasonality")["mean"].sort_values(ascending=False)
     for idx, (season, fare) in enumerate(seasonal.items(), 1):
         print(f"   {idx}. {season}: {fare:,.2f} BDT")
 
     # Class impact
     print("\nCLASS IMPACT ON FARES:")
-    class_impact = (
-        df.groupby("Class")["Total Fare (BDT)"]
-        .agg(["mean", "count"])
-        .sort_values("mean", ascending=False)
-    )
+    class_impact = fare_stats("Class").sort_values("mean", ascending=False)
     for idx, (cls, row) in enumerate(class_impact.iterrows(), 1):
         print(f"   {idx}. {cls}: {row['mean']:,.2f} BDT ({row['count']:,} flights)")
 
@@ -2,21 +2,26 @@
 Data loading utilities for Flight Fare Prediction project.
 """
 
-import pandas as pd
 from pathlib import Path
 
+from src.data.loader import load_raw_data
+from src.data.query import FlightData, FlightQuery, as_frame
+
 
 def load_flight_data(
     data_path: str = "../data/01-raw/Flight_Price_Dataset_of_Bangladesh.csv",
-) -> pd.DataFrame:
+    lazy: bool = False,
+) -> FlightData:
     """
     Load the flight price dataset.
 
     Args:
         data_path: Path to the CSV file
+        lazy: Return a FlightQuery that reads only what each helper uses,
+            instead of loading the whole dataset
 
     Returns:
-        DataFrame containing flight data
+        DataFrame (or FlightQuery if lazy) containing flight data
 
     Raises:
         FileNotFoundError: If dataset file doesn't exist
@@ -26,7 +31,13 @@ def load_flight_data(
     if not path.exists():
         raise FileNotFoundError(f"Dataset not found at {path}")
 
-    df = pd.read_csv(path)
+    if lazy:
+        query = FlightQuery(path)
+        print(f"Dataset opened lazily: {len(query.columns)} columns, read on demand")
+        return query
+
+    # Malformed values load as missing so exploration can report them
+    df = load_raw_data(path, errors="coerce")
 
     print("Dataset loaded successfully!")
     print(f"Shape: {df.shape[0]:,} rows × {df.shape[1]} columns")
@@ -35,8 +46,9 @@ def load_flight_data(
     return df
 
 
-def display_basic_info(df: pd.DataFrame) -> None:
+def display_basic_info(df: FlightData) -> None:
     """Display basic dataset information."""
+    df = as_frame(df)
     print("Dataset Information:")
     df.info()
 
@@ -5,18 +5,22 @@ Data quality assessment utilities.
 import pandas as pd
 from typing import Dict, Any
 
+from src.data.duplicates import DUPLICATE_FLIGHT_COLUMNS, count_duplicates
+from src.data.query import FlightData, as_frame
 
-def check_missing_values(df: pd.DataFrame) -> pd.DataFrame:
+
+def check_missing_values(df: FlightData) -> pd.DataFrame:
     """
     Analyze missing values in the dataset.
 
     Args:
-        df: DataFrame to analyze
+        df: DataFrame or FlightQuery to analyze
 
     Returns:
         DataFrame with missing value statistics
     """
     print("Missing Values Analysis:")
+    df = as_frame(df)
     missing = df.isnull().sum()
     missing_pct = (missing / len(df)) * 100
 
@@ -27,20 +31,19 @@ def check_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     return missing_df[missing_df["Missing Count"] > 0]
 
 
-def check_duplicates(df: pd.DataFrame) -> Dict[str, int]:
+def check_duplicates(df: FlightData) -> Dict[str, int]:
     """
     Check for duplicate rows and flight records.
 
     Args:
-        df: DataFrame to analyze
+        df: DataFrame or FlightQuery to analyze
 
     Returns:
         Dictionary with duplicate counts
     """
-    duplicates = df.duplicated().sum()
-    duplicate_flights = df.duplicated(
-        subset=["Airline", "Source", "Destination", "Departure Date & Time"]
-    ).sum()
+    df = as_frame(df)
+    duplicates = count_duplicates(df)
+    duplicate_flights = count_duplicates(df, DUPLICATE_FLIGHT_COLUMNS)
 
     print(f"Duplicate Rows: {duplicates:,} ({duplicates/len(df)*100:.2f}%)")
     print(f"Duplicate Flight Records: {duplicate_flights:,}")
@@ -48,8 +51,9 @@ def check_duplicates(df: pd.DataFrame) -> Dict[str, int]:
     return {"duplicate_rows": duplicates, "duplicate_flights": duplicate_flights}
 
 
-def display_data_types(df: pd.DataFrame) -> None:
+def display_data_types(df: FlightData) -> None:
     """Display data types and unique value counts."""
+    df = as_frame(df)
     print("Data Types and Unique Values:")
     for col in df.columns:
         unique_count = df[col].nunique()
@@ -57,43 +61,45 @@ def display_data_types(df: pd.DataFrame) -> None:
         print(f"{col:<30} | Type: {str(dtype):<10} | Unique: {unique_count:>6,}")
 
 
-def verify_fare_calculation(df: pd.DataFrame, tolerance: float = 1.0) -> pd.DataFrame:
+def verify_fare_calculation(df: FlightData, tolerance: float = 1.0) -> pd.DataFrame:
     """
     Verify that Total Fare = Base Fare + Tax & Surcharge.
 
     Args:
-        df: DataFrame to check
+        df: DataFrame or FlightQuery to check
         tolerance: Maximum allowed difference in BDT
 
     Returns:
         DataFrame with rows that have mismatches
     """
-    df_temp = df.copy()
-    df_temp["Calculated Total"] = df_temp["Base Fare (BDT)"] + df_temp["Tax & Surcharge (BDT)"]
-    df_temp["Fare Difference"] = abs(df_temp["Total Fare (BDT)"] - df_temp["Calculated Total"])
+    df = as_frame(df, ["Base Fare (BDT)", "Tax & Surcharge (BDT)", "Total Fare (BDT)"])
+    calculated_total = df["Base Fare (BDT)"] + df["Tax & Surcharge (BDT)"]
+    difference = (df["Total Fare (BDT)"] - calculated_total).abs()
+    mismatch = difference > tolerance
 
-    mismatches = (df_temp["Fare Difference"] > tolerance).sum()
+    mismatches = mismatch.sum()
     print(f"\nFare Calculation Mismatches: {mismatches:,} rows ({mismatches/len(df)*100:.2f}%)")
 
     if mismatches > 0:
         print("\nSample mismatches:")
-        return df_temp[df_temp["Fare Difference"] > tolerance][
-            ["Base Fare (BDT)", "Tax & Surcharge (BDT)", "Total Fare (BDT)", "Fare Difference"]
-        ].head()
+        # Only the sampled rows are materialized, not a copy of the whole frame
+        sample = df.loc[mismatch, ["Base Fare (BDT)", "Tax & Surcharge (BDT)", "Total Fare (BDT)"]]
+        return sample.head().assign(**{"Fare Difference": difference[mismatch].head()})
 
     return pd.DataFrame()
 
 
-def generate_quality_summary(df: pd.DataFrame) -> Dict[str, Any]:
+def generate_quality_summary(df: FlightData) -> Dict[str, Any]:
     """
     Generate comprehensive data quality summary.
 
     Args:
-        df: DataFrame to analyze
+        df: DataFrame or FlightQuery to analyze
 
     Returns:
         Dictionary with quality metrics
     """
+    df = as_frame(df)
     print("=" * 60)
     print("DATA QUALITY SUMMARY")
     print("=" * 60)
@@ -104,7 +110,7 @@ def generate_quality_summary(df: pd.DataFrame) -> Dict[str, Any]:
 
     print("\nData Quality:")
     missing_total = df.isnull().sum().sum()
-    duplicate_total = df.duplicated().sum()
+    duplicate_total = count_duplicates(df)
     print(f"   Missing Values: {missing_total:,}")
     print(f"   Duplicate Rows: {duplicate_total:,}")
     print(f"   Complete Records: {len(df) - df.isnull().any(axis=1).sum():,}")
@@ -2,32 +2,182 @@
 Visualization utilities for Flight Fare Prediction EDA.
 """
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
-from typing import Optional
+import plotly.graph_objects as go
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from src.data.cube import FareCube
+from src.data.query import FlightData, as_frame
+from src.data.sampling import count_strata, sample_frame, stratum_source_columns
 
-def plot_target_distribution(df: pd.DataFrame, column: str = "Total Fare (BDT)") -> None:
+# Most outliers drawn on a box plot; the rest are summarized by the whiskers
+MAX_FLIERS = 500
+
+# Value bins used to locate quantiles before selecting them exactly
+QUANTILE_SEARCH_BINS = 4096
+
+
+def _column_values(df: FlightData, column: str) -> np.ndarray:
+    """Non-missing values of a column as a float64 array."""
+    values = as_frame(df, [column])[column]
+    if values.hasnans:
+        values = values.dropna()
+    return values.to_numpy(dtype=np.float64 if values.dtype.kind == "f" else None)
+
+
+def histogram(values: np.ndarray, bins: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bin values into equal-width bins.
+
+    Args:
+        values: Values to bin
+        bins: Number of bins
+
+    Returns:
+        Tuple of counts per bin and bin edges (one more than counts)
+    """
+    return np.histogram(values, bins=bins)
+
+
+def quantiles(values: np.ndarray, q: Sequence[float]) -> np.ndarray:
+    """
+    Exact quantiles with linear interpolation, like ``np.quantile``.
+
+    Instead of partitioning every value, the values are counted into
+    QUANTILE_SEARCH_BINS equal-width bins and only the bins holding the
+    wanted order statistics are partitioned.
+
+    Args:
+        values: Non-missing values
+        q: Quantiles in [0, 1]
+
+    Returns:
+        Array of quantile values
+    """
+    q = np.asarray(q, dtype=np.float64)
+    lo, hi = values.min(), values.max()
+    if lo == hi:
+        return np.full(len(q), lo, dtype=np.float64)
+
+    positions = q * (len(values) - 1)
+    below = np.floor(positions).astype(np.int64)
+    ranks = np.unique(np.concatenate([below, np.minimum(below + 1, len(values) - 1)]))
+
+    # Bin index is monotonic in the value, so order statistics stay in order
+    scale = QUANTILE_SEARCH_BINS / (float(hi) - float(lo))
+    index = np.minimum(((values - lo) * scale).astype(np.int64), QUANTILE_SEARCH_BINS - 1)
+    ends = np.cumsum(np.bincount(index, minlength=QUANTILE_SEARCH_BINS))
+    rank_bins = np.searchsorted(ends, ranks, side="right")
+
+    order_stats = {}
+    for bin_id in np.unique(rank_bins).tolist():
+        in_bin = values[index == bin_id]
+        in_bin_ranks = ranks[rank_bins == bin_id] - (ends[bin_id] - len(in_bin))
+        in_bin = np.partition(in_bin, in_bin_ranks)
+        order_stats.update(zip(ranks[rank_bins == bin_id].tolist(), in_bin[in_bin_ranks]))
+
+    lower = np.array([order_stats[r] for r in below.tolist()], dtype=np.float64)
+    upper = np.array(
+        [order_stats[min(r + 1, len(values) - 1)] for r in below.tolist()], dtype=np.float64
+    )
+    return lower + (upper - lower) * (positions - below)
+
+
+def box_plot_stats(values: np.ndarray, whis: float = 1.5) -> Dict[str, Any]:
+    """
+    Box plot statistics in the format of matplotlib's ``Axes.bxp``.
+
+    Whiskers follow matplotlib's rule (furthest points within ``whis`` IQRs
+    of the box); at most MAX_FLIERS outliers are kept, evenly spread over
+    their sorted distinct values.
+
+    Args:
+        values: Values to summarize
+        whis: Whisker length as a multiple of the interquartile range
+
+    Returns:
+        Dictionary with med, q1, q3, whislo, whishi and fliers
+    """
+    q1, median, q3 = quantiles(values, [0.25, 0.5, 0.75])
+    lo, hi = values.min(), values.max()
+    low, high = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+    outside = (values < low) | (values > high)
+
+    fliers = np.unique(values[outside])
+    if len(fliers) > MAX_FLIERS:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, MAX_FLIERS).astype(np.int64)]
+
+    return {
+        "med": median,
+        "q1": q1,
+        "q3": q3,
+        "whislo": lo if lo >= low else values[values >= low].min(),
+        "whishi": hi if hi <= high else values[values <= high].max(),
+        "fliers": fliers,
+    }
+
+
+def binned_trend(
+    x: np.ndarray, y: np.ndarray, bins: int = 50
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mean of y within equal-width bins of x, as a trend line over all points.
+
+    Args:
+        x: X values
+        y: Y values aligned with x
+        bins: Number of bins (integer x with fewer distinct values gets one bin per value)
+
+    Returns:
+        Tuple of bin centers, mean y per bin and point count per bin, for
+        non-empty bins only
+    """
+    lo, hi = x.min(), x.max()
+    if np.all(np.mod(x, 1) == 0) and hi - lo + 1 <= bins:
+        # One bin per integer value
+        index = (x - lo).astype(np.int64)
+        centers = np.arange(lo, hi + 1)
+    else:
+        edges = np.linspace(lo, hi, bins + 1)
+        index = np.clip(np.searchsorted(edges, x, side="right") - 1, 0, bins - 1)
+        centers = (edges[:-1] + edges[1:]) / 2
+
+    counts = np.bincount(index, minlength=len(centers))
+    sums = np.bincount(index, weights=y, minlength=len(centers))
+    present = counts > 0
+    return centers[present], sums[present] / counts[present], counts[present]
+
+
+def plot_target_distribution(df: FlightData, column: str = "Total Fare (BDT)") -> None:
     """
     Plot distribution of target variable.
 
+    The histogram and box plot are drawn from pre-computed bins and
+    quantiles, so plotting cost does not grow with the number of rows.
+
     Args:
-        df: DataFrame containing the data
+        df: DataFrame or FlightQuery containing the data
         column: Name of the column to plot
     """
+    values = _column_values(df, column)
+    counts, edges = histogram(values, bins=50)
+    box = box_plot_stats(values)
+
     fig, axes = plt.subplots(1, 2, figsize=(15, 5))
 
     # Histogram
-    axes[0].hist(df[column], bins=50, edgecolor="black", alpha=0.7)
+    axes[0].hist(edges[:-1], bins=edges, weights=counts, edgecolor="black", alpha=0.7)
     axes[0].set_xlabel(column, fontsize=12)
     axes[0].set_ylabel("Frequency", fontsize=12)
     axes[0].set_title(f"Distribution of {column}", fontsize=14, fontweight="bold")
     axes[0].grid(alpha=0.3)
 
     # Box plot
-    axes[1].boxplot(df[column], vert=True)
+    axes[1].bxp([box], vert=True)
     axes[1].set_ylabel(column, fontsize=12)
     axes[1].set_title(f"{column} Box Plot", fontsize=14, fontweight="bold")
     axes[1].grid(alpha=0.3)
@@ -36,36 +186,43 @@ def plot_target_distribution(df: pd.DataFrame, column: str = "Total Fare (BDT)")
     plt.show()
 
     print(f"\n{column} Statistics:")
-    print(f"Mean:   {df[column].mean():>12,.2f} BDT")
-    print(f"Median: {df[column].median():>12,.2f} BDT")
-    print(f"Min:    {df[column].min():>12,.2f} BDT")
-    print(f"Max:    {df[column].max():>12,.2f} BDT")
-    print(f"Std:    {df[column].std():>12,.2f} BDT")
+    print(f"Mean:   {values.mean(dtype=np.float64):>12,.2f} BDT")
+    print(f"Median: {box['med']:>12,.2f} BDT")
+    print(f"Min:    {values.min():>12,.2f} BDT")
+    print(f"Max:    {values.max():>12,.2f} BDT")
+    print(f"Std:    {values.std(ddof=1):>12,.2f} BDT")
 
 
 def plot_average_fare_by_category(
-    df: pd.DataFrame,
+    df: FlightData,
     category_col: str,
     fare_col: str = "Total Fare (BDT)",
     title: Optional[str] = None,
+    cube: Optional[FareCube] = None,
 ) -> pd.DataFrame:
     """
     Plot average fare by category using Plotly.
 
     Args:
-        df: DataFrame containing the data
+        df: DataFrame or FlightQuery containing the data
         category_col: Column to group by
         fare_col: Fare column name
         title: Plot title (optional)
+        cube: Pre-aggregated fare cube; if it covers the column, the statistics
+            are rolled up from it instead of grouping ``df`` (medians are then
+            approximate)
 
     Returns:
         DataFrame with aggregated results
     """
-    fare_stats = (
-        df.groupby(category_col)[fare_col]
-        .agg(["mean", "median", "count"])
-        .sort_values("mean", ascending=False)
-    )
+    if cube is not None and category_col in cube.dimensions and fare_col == cube.measure:
+        fare_stats = cube.rollup([category_col])[["mean", "median", "count"]]
+    else:
+        df = as_frame(df, [category_col, fare_col])
+        fare_stats = df.groupby(category_col, observed=True)[fare_col].agg(
+            ["mean", "median", "count"]
+        )
+    fare_stats = fare_stats.sort_values("mean", ascending=False)
 
     title = title or f"Average Fare by {category_col}"
 
@@ -84,18 +241,18 @@ def plot_average_fare_by_category(
     return fare_stats
 
 
-def plot_correlation_heatmap(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+def plot_correlation_heatmap(df: FlightData, columns: list) -> pd.DataFrame:
     """
     Plot correlation heatmap for numerical features.
 
     Args:
-        df: DataFrame containing the data
+        df: DataFrame or FlightQuery containing the data
         columns: List of column names to include
 
     Returns:
         Correlation matrix
     """
-    correlation_matrix = df[columns].corr()
+    correlation_matrix = as_frame(df, columns)[columns].corr()
 
     plt.figure(figsize=(10, 8))
     sns.heatmap(
@@ -115,16 +272,19 @@ def plot_correlation_heatmap(df: pd.DataFrame, columns: list) -> pd.DataFrame:
     return correlation_matrix
 
 
-def plot_booking_lead_time(df: pd.DataFrame, column: str = "Days Before Departure") -> None:
+def plot_booking_lead_time(df: FlightData, column: str = "Days Before Departure") -> None:
     """
     Plot booking lead time distribution.
 
     Args:
-        df: DataFrame containing the data
+        df: DataFrame or FlightQuery containing the data
         column: Column name for lead time
     """
+    values = _column_values(df, column)
+    counts, edges = histogram(values, bins=50)
+
     fig, ax = plt.subplots(figsize=(12, 5))
-    ax.hist(df[column], bins=50, edgecolor="black", alpha=0.7)
+    ax.hist(edges[:-1], bins=edges, weights=counts, edgecolor="black", alpha=0.7)
     ax.set_xlabel(column, fontsize=12)
     ax.set_ylabel("Frequency", fontsize=12)
     ax.set_title("Distribution of Booking Lead Time", fontsize=14, fontweight="bold")
@@ -132,34 +292,63 @@ def plot_booking_lead_time(df: pd.DataFrame, column: str = "Days Before Departur
     plt.show()
 
     print("\nBooking Lead Time Statistics:")
-    print(f"Mean:   {df[column].mean():.2f} days")
-    print(f"Median: {df[column].median():.2f} days")
-    print(f"Min:    {df[column].min()} days")
-    print(f"Max:    {df[column].max()} days")
+    print(f"Mean:   {values.mean(dtype=np.float64):.2f} days")
+    print(f"Median: {quantiles(values, [0.5])[0]:.2f} days")
+    print(f"Min:    {values.min():.0f} days")
+    print(f"Max:    {values.max():.0f} days")
 
 
 def plot_scatter_with_trend(
-    df: pd.DataFrame, x_col: str, y_col: str, sample_size: int = 5000, title: Optional[str] = None
+    df: FlightData,
+    x_col: str,
+    y_col: str,
+    sample_size: int = 5000,
+    title: Optional[str] = None,
+    bins: int = 50,
+    random_state: Optional[int] = 42,
+    stratify_by: Optional[List[str]] = None,
 ) -> None:
     """
     Plot scatter plot with trend line.
 
+    The trend line is the mean of ``y_col`` in bins of ``x_col`` over all
+    rows; only about ``sample_size`` points are drawn as the scatter.
+
     Args:
-        df: DataFrame containing the data
+        df: DataFrame or FlightQuery containing the data
         x_col: X-axis column name
         y_col: Y-axis column name
         sample_size: Number of points to sample for performance
         title: Plot title (optional)
+        bins: Number of x bins for the trend line
+        random_state: Seed for the point sample
+        stratify_by: Columns (e.g. ["Airline", "Route"]) to sample points
+            evenly across, so rare airlines or routes still appear
     """
     title = title or f"{y_col} vs {x_col}"
 
+    strata = stratum_source_columns(stratify_by or [])
+    data = as_frame(df, list(dict.fromkeys([x_col, y_col] + strata))).dropna(subset=[x_col, y_col])
+    x = data[x_col].to_numpy(dtype=np.float64)
+    y = data[y_col].to_numpy(dtype=np.float64)
+    centers, means, _ = binned_trend(x, y, bins=bins)
+
+    if stratify_by:
+        data = data.reset_index(drop=True)
+        per_stratum = max(1, -(-sample_size // count_strata(data, stratify_by)))
+        sample = sample_frame(data, by=stratify_by, per_stratum=per_stratum, seed=random_state)
+        sample = sample.index.to_numpy()
+    else:
+        rng = np.random.default_rng(random_state)
+        sample = rng.choice(len(x), min(sample_size, len(x)), replace=False)
+
     fig = px.scatter(
-        df.sample(min(sample_size, len(df))),
-        x=x_col,
-        y=y_col,
+        x=x[sample],
+        y=y[sample],
         opacity=0.5,
         title=title,
-        trendline="lowess",
+        labels={"x": x_col, "y": y_col},
     )
+    fig.add_trace(go.Scatter(x=centers, y=means, mode="lines", name=f"Mean {y_col}"))
     fig.update_layout(height=500)
     fig.show()
@@ -0,0 +1,367 @@
+"""
+Benchmark suite for ingestion, validation, summary and EDA helpers.
+
+Generates a synthetic dataset at the requested scale, runs every benchmark in
+a fresh process (so peak RSS is measured per benchmark) and writes throughput
+and memory results as JSON. A previous results file can be passed to flag
+regressions.
+
+Usage:
+    python scripts/benchmark.py --rows 100000 --output bench_results.json
+    python scripts/benchmark.py --rows 1000000 --baseline bench_results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import platform
+import queue as queue_module
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# notebooks/ goes first so "scripts" resolves to the notebook helper package
+sys.path.insert(0, str(PROJECT_ROOT / "notebooks"))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+BENCHMARKS: Dict[str, Callable[[Path], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """Register a benchmark setup function under a name."""
+
+    def register(setup: Callable[[Path], Callable[[], Any]]) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _load(data_path: Path):
+    """Load the typed dataset used by DataFrame benchmarks."""
+    from src.data.loader import load_raw_data
+
+    return load_raw_data(data_path)
+
+
+def _helpers():
+    """Import the notebook helper modules with a non-interactive plotting setup."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import plotly.basedatatypes
+
+    # Figure construction is measured; opening a browser or notebook output is not
+    plotly.basedatatypes.BaseFigure.show = lambda self, *args, **kwargs: None
+
+    from scripts import analysis, data_loader, data_quality, visualizations
+
+    return analysis, data_loader, data_quality, visualizations
+
+
+@benchmark("ingestion.calculate_file_hash")
+def bench_file_hash(data_path: Path) -> Callable[[], Any]:
+    from src.data.ingestion import DataIngestion
+
+    ingestion = DataIngestion(data_dir=str(data_path.parent))
+    return lambda: ingestion.calculate_file_hash(data_path)
+
+
+@benchmark("ingestion.validate_file")
+def bench_validate_file(data_path: Path) -> Callable[[], Any]:
+    from src.data.ingestion import DataIngestion
+
+    ingestion = DataIngestion(data_dir=str(data_path.parent))
+    return lambda: ingestion.validate_file(data_path)
+
+
+@benchmark("loader.load_raw_data")
+def bench_load_raw_data(data_path: Path) -> Callable[[], Any]:
+    from src.data.loader import load_raw_data
+
+    return lambda: load_raw_data(data_path)
+
+
+@benchmark("validation.FlightDataValidator.validate")
+def bench_validate(data_path: Path) -> Callable[[], Any]:
+    from src.data.validation import FlightDataValidator
+
+    df = _load(data_path)
+    validator = FlightDataValidator()
+    return lambda: validator.validate(df)
+
+
+@benchmark("validation.FlightDataValidator.validate_stream")
+def bench_validate_stream(data_path: Path) -> Callable[[], Any]:
+    from src.data.validation import FlightDataValidator
+
+    validator = FlightDataValidator()
+    return lambda: validator.validate_stream(data_path)
+
+
+@benchmark("data_summary.generate_data_summary")
+def bench_data_summary(data_path: Path) -> Callable[[], Any]:
+    import data_summary
+
+    return lambda: data_summary.generate_data_summary(str(data_path))
+
+
+@benchmark("notebooks.data_loader.load_flight_data")
+def bench_load_flight_data(data_path: Path) -> Callable[[], Any]:
+    _, data_loader, _, _ = _helpers()
+    return lambda: data_loader.load_flight_data(str(data_path))
+
+
+def _register_helper(name: str, module_index: int, function: str, *args: Any, route=False):
+    """Register a notebook helper benchmark that runs on the loaded DataFrame."""
+
+    def setup(data_path: Path) -> Callable[[], Any]:
+        module = _helpers()[module_index]
+        df = _load(data_path)
+        if route:
+            df = _helpers()[0].create_route_feature(df)
+        return lambda: getattr(module, function)(df, *args)
+
+    BENCHMARKS[f"notebooks.{name}"] = setup
+
+
+_register_helper("data_loader.display_basic_info", 1, "display_basic_info")
+_register_helper("data_quality.check_missing_values", 2, "check_missing_values")
+_register_helper("data_quality.check_duplicates", 2, "check_duplicates")
+_register_helper("data_quality.display_data_types", 2, "display_data_types")
+_register_helper("data_quality.verify_fare_calculation", 2, "verify_fare_calculation")
+_register_helper("data_quality.generate_quality_summary", 2, "generate_quality_summary")
+_register_helper(
+    "analysis.analyze_categorical_variable", 0, "analyze_categorical_variable", "Airline"
+)
+_register_helper("analysis.analyze_fare_by_category", 0, "analyze_fare_by_category", "Class")
+_register_helper("analysis.create_route_feature", 0, "create_route_feature")
+_register_helper("analysis.route_feature", 0, "route_feature")
+_register_helper("analysis.analyze_routes", 0, "analyze_routes", route=True)
+_register_helper("analysis.calculate_tax_percentage", 0, "calculate_tax_percentage")
+_register_helper("analysis.tax_percentage", 0, "tax_percentage")
+_register_helper("analysis.generate_business_insights", 0, "generate_business_insights", route=True)
+_register_helper("visualizations.plot_target_distribution", 3, "plot_target_distribution")
+_register_helper(
+    "visualizations.plot_average_fare_by_category", 3, "plot_average_fare_by_category", "Airline"
+)
+_register_helper(
+    "visualizations.plot_correlation_heatmap",
+    3,
+    "plot_correlation_heatmap",
+    ["Duration (hrs)", "Base Fare (BDT)", "Total Fare (BDT)", "Days Before Departure"],
+)
+_register_helper("visualizations.plot_booking_lead_time", 3, "plot_booking_lead_time")
+_register_helper(
+    "visualizations.plot_scatter_with_trend",
+    3,
+    "plot_scatter_with_trend",
+    "Days Before Departure",
+    "Total Fare (BDT)",
+)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return round(peak / (1024**2 if sys.platform == "darwin" else 1024), 1)
+
+
+def _run_benchmark(name: str, data_path: Path, repeat: int, queue) -> None:
+    """Run one benchmark in a child process and report its measurements."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    result: Dict[str, Any] = {"name": name}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run = BENCHMARKS[name](data_path)
+            result["setup_peak_rss_mb"] = _peak_rss_mb()
+
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+                plt.close("all")
+
+        result["seconds"] = round(min(timings), 6)
+        result["peak_rss_mb"] = _peak_rss_mb()
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    queue.put(result)
+
+
+def _wait_for_result(name: str, process, queue, timeout: Optional[float]) -> Dict[str, Any]:
+    """
+    Wait for a benchmark process to report, or record why it did not.
+
+    The queue is polled so a child killed before reporting (e.g. by the
+    out-of-memory killer) or running past the timeout gives an error result
+    instead of blocking the suite.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        try:
+            return queue.get(timeout=1.0)
+        except queue_module.Empty:
+            pass
+        if process.exitcode is not None:
+            # The result may have arrived just before the process exited
+            try:
+                return queue.get(timeout=1.0)
+            except queue_module.Empty:
+                return {"name": name, "error": f"Process exited with code {process.exitcode}"}
+        if deadline is not None and time.monotonic() > deadline:
+            process.terminate()
+            return {"name": name, "error": f"Timed out after {timeout:g}s"}
+
+
+def run_benchmarks(
+    data_path: Path, rows: int, names: List[str], repeat: int = 1, timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run benchmarks, each in a fresh process.
+
+    Args:
+        data_path: Path to the dataset CSV
+        rows: Number of rows in the dataset (for throughput)
+        names: Benchmark names to run
+        repeat: Timed repetitions per benchmark (the fastest is reported)
+        timeout: Seconds after which a benchmark is stopped and recorded as
+            an error (no limit if None)
+
+    Returns:
+        List of result dictionaries
+    """
+    context = multiprocessing.get_context("spawn")
+    file_mb = data_path.stat().st_size / 1024**2
+    results = []
+
+    for name in names:
+        queue = context.Queue()
+        process = context.Process(target=_run_benchmark, args=(name, data_path, repeat, queue))
+        process.start()
+        result = _wait_for_result(name, process, queue, timeout)
+        process.join()
+
+        if "seconds" in result and result["seconds"] > 0:
+            result["rows_per_second"] = round(rows / result["seconds"], 1)
+            result["mb_per_second"] = round(file_mb / result["seconds"], 2)
+
+        status = result.get("error") or f"{result['seconds']:.3f}s"
+        print(f"   {name:<60} {status}")
+        results.append(result)
+
+    return results
+
+
+def find_regressions(
+    results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Compare results against a baseline run.
+
+    Args:
+        results: Current benchmark results
+        baseline: Previously written results JSON
+        tolerance: Allowed relative slowdown or memory growth (0.2 = 20%)
+
+    Returns:
+        List of human-readable regression descriptions
+    """
+    previous = {r["name"]: r for r in baseline.get("results", [])}
+    regressions = []
+
+    for result in results:
+        old = previous.get(result["name"])
+        if old is None or "seconds" not in result or "seconds" not in old:
+            continue
+        if result["seconds"] > old["seconds"] * (1 + tolerance):
+            regressions.append(
+                f"{result['name']}: {old['seconds']:.3f}s -> {result['seconds']:.3f}s"
+            )
+        if (
+            result.get("peak_rss_mb")
+            and old.get("peak_rss_mb")
+            and result["peak_rss_mb"] > old["peak_rss_mb"] * (1 + tolerance)
+        ):
+            regressions.append(
+                f"{result['name']}: peak RSS {old['peak_rss_mb']} MB -> {result['peak_rss_mb']} MB"
+            )
+
+    return regressions
+
+
+def main() -> int:
+    """Main entry point for the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic rows (1e5 to 1e8)")
+    parser.add_argument("--data-dir", default="data/benchmarks", help="Where to write datasets")
+    parser.add_argument("--output", default="bench_results.json", help="Results JSON path")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed repetitions")
+    parser.add_argument("--only", nargs="*", help="Run only benchmarks containing these names")
+    parser.add_argument("--timeout", type=float, help="Seconds allowed per benchmark")
+    args = parser.parse_args()
+
+    from src.data.synthetic import write_synthetic_csv
+
+    data_path = Path(args.data_dir) / f"synthetic_{args.rows}.csv"
+    if not data_path.exists():
+        print(f"Generating {args.rows:,} synthetic rows at {data_path}...")
+        write_synthetic_csv(data_path, args.rows)
+
+    names = [name for name in BENCHMARKS if not args.only or any(key in name for key in args.only)]
+
+    print("\n" + "=" * 70)
+    print(f"BENCHMARKS ({args.rows:,} rows)")
+    print("=" * 70)
+    results = run_benchmarks(data_path, args.rows, names, repeat=args.repeat, timeout=args.timeout)
+
+    report = {
+        "rows": args.rows,
+        "file_size_mb": round(data_path.stat().st_size / 1024**2, 2),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            exit_code = 1
+        else:
+            print(f"\n✅ No regressions against {args.baseline}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,62 @@ Quick data summary script for Flight Price Dataset.
 Generates a comprehensive report without external dependencies like Pandera.
 """
 
-import pandas as pd
-import numpy as np
+import sys
 from pathlib import Path
+from typing import Any, Dict
+
+# Make the project's src package importable when run as a script
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from src.data.accumulators import SummaryAccumulator  # noqa: E402
+from src.data.loader import csv_partition, iter_flight_chunks, iter_partition_chunks  # noqa: E402
+from src.data.manifest import RawDataManifest  # noqa: E402
+
+
+def compute_data_summary(filepath: str, chunksize: int = 500_000) -> Dict[str, Any]:
+    """
+    Compute every aggregate of the summary report in one pass over the data.
+
+    Malformed values are counted as missing instead of stopping the report.
+    Results are cached in the raw data manifest and reused while the file is
+    unchanged since it was ingested. The accumulator state is saved too, so
+    when rows were appended to the file only those rows are read.
+
+    Args:
+        filepath: Path to the raw CSV file
+        chunksize: Number of rows per chunk
+
+    Returns:
+        Dictionary of summary aggregates (see SummaryAccumulator.result)
+    """
+    manifest = RawDataManifest(Path(filepath).parent)
+    cached = manifest.get_result(filepath, "summary")
+    if cached is not None:
+        print("Using cached summary (file unchanged since ingestion)")
+        return cached
+
+    saved = manifest.load_state(filepath, "summary")
+    if saved is None:
+        accumulator = SummaryAccumulator()
+        chunks = iter_flight_chunks(filepath, chunksize=chunksize, errors="coerce")
+    else:
+        accumulator, start = saved
+        chunks = iter([])
+        if start < Path(filepath).stat().st_size:
+            print("Summarizing the appended rows only")
+            chunks = iter_partition_chunks(
+                csv_partition(filepath, start), chunksize=chunksize, errors="coerce"
+            )
+    for chunk in chunks:
+        accumulator.update(chunk)
+    summary = accumulator.result()
+
+    if manifest.is_current(filepath):
+        manifest.save_state(filepath, "summary", accumulator)
+        manifest.set_result(filepath, "summary", summary)
+    return summary
 
 
 def generate_data_summary(filepath: str) -> dict:
@@ -17,38 +70,40 @@ def generate_data_summary(filepath: str) -> dict:
 
     # Load data
     print(f"\nLoading data from: {filepath}")
-    df = pd.read_csv(filepath)
+    summary = compute_data_summary(filepath)
     print("Data loaded successfully!")
 
+    total_rows = summary["total_rows"]
+
     # Basic info
     print(f"\n{'='*70}")
     print("DATASET OVERVIEW")
     print("=" * 70)
-    print(f"Total Rows:    {len(df):>15,}")
-    print(f"Total Columns: {len(df.columns):>15,}")
-    print(f"Memory Usage:  {df.memory_usage(deep=True).sum() / 1024**2:>14,.2f} MB")
+    print(f"Total Rows:    {total_rows:>15,}")
+    print(f"Total Columns: {len(summary['columns']):>15,}")
+    print(f"Memory Usage:  {summary['memory_mb']:>14,.2f} MB")
 
     # Columns
     print(f"\n{'='*70}")
     print("COLUMNS")
     print("=" * 70)
-    for i, col in enumerate(df.columns, 1):
-        dtype = str(df[col].dtype)
-        unique = df[col].nunique()
-        print(f"{i:2d}. {col:<40} {dtype:<10} (Unique: {unique:>7,})")
+    for i, column in enumerate(summary["columns"], 1):
+        print(
+            f"{i:2d}. {column['name']:<40} {column['dtype']:<10} (Unique: {column['unique']:>7,})"
+        )
 
     # Missing values
     print(f"\n{'='*70}")
     print("MISSING VALUES")
     print("=" * 70)
-    missing = df.isnull().sum()
-    total_missing = missing.sum()
+    missing = summary["missing_values"]
+    total_missing = sum(missing.values())
 
     if total_missing > 0:
-        for col in missing[missing > 0].index:
-            count = missing[col]
-            pct = (count / len(df)) * 100
-            print(f"   {col:<40} {count:>8,} ({pct:>5.2f}%)")
+        for col, count in missing.items():
+            if count > 0:
+                pct = (count / total_rows) * 100
+                print(f"   {col:<40} {count:>8,} ({pct:>5.2f}%)")
     else:
         print("   No missing values found!")
 
@@ -56,11 +111,9 @@ def generate_data_summary(filepath: str) -> dict:
     print(f"\n{'='*70}")
     print("DUPLICATE ANALYSIS")
     print("=" * 70)
-    dup_rows = df.duplicated().sum()
-    dup_flights = df.duplicated(
-        subset=["Airline", "Source", "Destination", "Departure Date & Time"]
-    ).sum()
-    print(f"Duplicate Rows:          {dup_rows:>10,} ({dup_rows/len(df)*100:>5.2f}%)")
+    dup_rows = summary["duplicate_rows"]
+    dup_flights = summary["duplicate_flights"]
+    print(f"Duplicate Rows:          {dup_rows:>10,} ({dup_rows/total_rows*100:>5.2f}%)")
     print(f"Duplicate Flight Records:{dup_flights:>10,}")
 
     # Numerical summary
@@ -68,82 +121,61 @@ def generate_data_summary(filepath: str) -> dict:
     print("NUMERICAL FEATURES SUMMARY")
     print("=" * 70)
 
-    numerical_cols = df.select_dtypes(include=[np.number]).columns
-    for col in numerical_cols:
+    for col, stats in summary["numeric"].items():
         print(f"\n{col}:")
-        print(f"   Mean:   {df[col].mean():>15,.2f}")
-        print(f"   Median: {df[col].median():>15,.2f}")
-        print(f"   Min:    {df[col].min():>15,.2f}")
-        print(f"   Max:    {df[col].max():>15,.2f}")
-        print(f"   Std:    {df[col].std():>15,.2f}")
+        print(f"   Mean:   {stats['mean']:>15,.2f}")
+        print(f"   Median: {stats['median']:>15,.2f}")
+        print(f"   Min:    {stats['min']:>15,.2f}")
+        print(f"   Max:    {stats['max']:>15,.2f}")
+        print(f"   Std:    {stats['std']:>15,.2f}")
 
     # Categorical summary
     print(f"\n{'='*70}")
     print("CATEGORICAL FEATURES SUMMARY")
     print("=" * 70)
 
-    categorical_cols = ["Airline", "Class", "Stopovers", "Seasonality", "Booking Source"]
-    for col in categorical_cols:
-        if col in df.columns:
-            print(f"\n{col}:")
-            value_counts = df[col].value_counts()
-            for val, count in value_counts.head(5).items():
-                pct = (count / len(df)) * 100
-                print(f"   {str(val):<30} {count:>8,} ({pct:>5.2f}%)")
-            if len(value_counts) > 5:
-                print(f"   ... and {len(value_counts) - 5} more")
+    for col, value_counts in summary["value_counts"].items():
+        print(f"\n{col}:")
+        for val, count in value_counts[:5]:
+            pct = (count / total_rows) * 100
+            print(f"   {str(val):<30} {count:>8,} ({pct:>5.2f}%)")
+        if len(value_counts) > 5:
+            print(f"   ... and {len(value_counts) - 5} more")
 
     # Business insights
     print(f"\n{'='*70}")
     print("KEY BUSINESS INSIGHTS")
     print("=" * 70)
 
+    group_means = summary["group_means"]
+
     # Average fare by airline
     print("\nAverage Fare by Airline (Top 5):")
-    airline_fares = (
-        df.groupby("Airline")["Total Fare (BDT)"]
-        .agg(["mean", "count"])
-        .sort_values("mean", ascending=False)
-        .head(5)
-    )
-    for i, (airline, row) in enumerate(airline_fares.iterrows(), 1):
-        print(f"   {i}. {airline:<30} {row['mean']:>12,.2f} BDT (n={row['count']:,})")
+    for i, (airline, mean, count) in enumerate(group_means.get("Airline", [])[:5], 1):
+        print(f"   {i}. {airline:<30} {mean:>12,.2f} BDT (n={count:,})")
 
     # Most popular routes
-    df["Route"] = df["Source"] + " → " + df["Destination"]
     print("\nMost Popular Routes (Top 5):")
-    top_routes = df["Route"].value_counts().head(5)
-    for i, (route, count) in enumerate(top_routes.items(), 1):
-        avg_fare = df[df["Route"] == route]["Total Fare (BDT)"].mean()
+    for i, (route, count, avg_fare) in enumerate(summary["routes"][:5], 1):
         print(f"   {i}. {route:<30} {count:>6,} flights, Avg: {avg_fare:>10,.2f} BDT")
 
     # Seasonal impact
     print("\nSeasonal Fare Variation:")
-    seasonal = (
-        df.groupby("Seasonality")["Total Fare (BDT)"]
-        .agg(["mean", "count"])
-        .sort_values("mean", ascending=False)
-    )
-    for i, (season, row) in enumerate(seasonal.iterrows(), 1):
-        print(f"   {i}. {season:<30} {row['mean']:>12,.2f} BDT (n={row['count']:,})")
+    for i, (season, mean, count) in enumerate(group_means.get("Seasonality", []), 1):
+        print(f"   {i}. {season:<30} {mean:>12,.2f} BDT (n={count:,})")
 
     # Class impact
     print("\nClass Impact:")
-    class_impact = (
-        df.groupby("Class")["Total Fare (BDT)"]
-        .agg(["mean", "count"])
-        .sort_values("mean", ascending=False)
-    )
-    for i, (cls, row) in enumerate(class_impact.iterrows(), 1):
-        print(f"   {i}. {cls:<30} {row['mean']:>12,.2f} BDT (n={row['count']:,})")
+    for i, (cls, mean, count) in enumerate(group_means.get("Class", []), 1):
+        print(f"   {i}. {cls:<30} {mean:>12,.2f} BDT (n={count:,})")
 
     # Data quality score
     print(f"\n{'='*70}")
     print("DATA QUALITY SCORE")
     print("=" * 70)
 
-    completeness = ((len(df) - df.isnull().any(axis=1).sum()) / len(df)) * 100
-    uniqueness = (1 - dup_rows / len(df)) * 100
+    completeness = ((total_rows - summary["incomplete_rows"]) / total_rows) * 100
+    uniqueness = (1 - dup_rows / total_rows) * 100
     overall_quality = (completeness + uniqueness) / 2
 
     print(f"Completeness:  {completeness:>6.2f}%  {'✅' if completeness > 95 else '⚠️'}")
@@ -164,20 +196,14 @@ def generate_data_summary(filepath: str) -> dict:
         recommendations.append("• Investigate and remove duplicate rows")
 
     # Check fare calculation
-    df["Calculated Total"] = df["Base Fare (BDT)"] + df["Tax & Surcharge (BDT)"]
-    fare_mismatches = (abs(df["Total Fare (BDT)"] - df["Calculated Total"]) > 1.0).sum()
+    fare_mismatches = summary["fare_mismatches"]
     if fare_mismatches > 0:
         recommendations.append(
             f"• Verify {fare_mismatches:,} rows with fare calculation mismatches"
         )
 
     # Check for outliers
-    Q1 = df["Total Fare (BDT)"].quantile(0.25)
-    Q3 = df["Total Fare (BDT)"].quantile(0.75)
-    IQR = Q3 - Q1
-    outliers = (
-        (df["Total Fare (BDT)"] < Q1 - 1.5 * IQR) | (df["Total Fare (BDT)"] > Q3 + 1.5 * IQR)
-    ).sum()
+    outliers = summary.get("target_outliers", 0)
     if outliers > 0:
         recommendations.append(f"• Investigate {outliers:,} potential outliers in Total Fare")
 
@@ -196,7 +222,7 @@ def generate_data_summary(filepath: str) -> dict:
     print("=" * 70 + "\n")
 
     return {
-        "shape": df.shape,
+        "shape": (total_rows, len(summary["columns"])),
         "missing_total": total_missing,
         "duplicates": dup_rows,
         "quality_score": overall_quality,
@@ -0,0 +1,52 @@
+"""
+Train a fare model and save it for the API and batch scoring.
+
+    python scripts/train_model.py --model linear
+    python scripts/train_model.py --model random_forest
+    python scripts/train_model.py --model xgboost --tune --trials 27 --jobs 8
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Make the project's src package importable when run as a script
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from src.training.models import MODEL_FACTORIES  # noqa: E402
+from src.training.train import train_model  # noqa: E402
+
+
+def main():
+    """Parse arguments and train."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", choices=sorted(MODEL_FACTORIES), default="xgboost")
+    parser.add_argument("--tune", action="store_true", help="Run successive-halving search")
+    parser.add_argument("--trials", type=int, default=27, help="Configurations to sample")
+    parser.add_argument("--eta", type=int, default=3, help="Successive-halving reduction factor")
+    parser.add_argument("--jobs", type=int, default=-1, help="Parallel trials (-1: all cores)")
+    parser.add_argument(
+        "--data", default="data/01-raw/Flight_Price_Dataset_of_Bangladesh.csv", help="Raw data"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    report = train_model(
+        args.data,
+        model_name=args.model,
+        tune=args.tune,
+        n_trials=args.trials,
+        eta=args.eta,
+        n_jobs=args.jobs,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
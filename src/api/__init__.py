@@ -0,0 +1 @@
+"""Prediction service package for Flight Fare Prediction."""
@@ -0,0 +1,134 @@
+"""
+Micro-batching of concurrent prediction requests.
+
+Requests are queued with a future each. A single worker task takes the first
+waiting request, keeps collecting for at most ``max_wait_ms`` (or until
+``max_batch_size`` requests), and hands the whole batch to one vectorized
+call in a worker thread, so the event loop keeps accepting requests while
+the model runs. Requests arriving during a model call form the next batch,
+so batches grow with load and latency stays near one window plus one call.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Coalesces concurrent submit() calls into batched calls of a function."""
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 256,
+        max_wait_ms: float = 2.0,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            predict_batch: Function mapping a list of items to one result per item
+            max_batch_size: Largest batch passed to predict_batch
+            max_wait_ms: Longest time the first item of a batch waits for others
+        """
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "asyncio.Queue[Tuple[Any, asyncio.Future]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.items = 0
+
+    async def start(self) -> None:
+        """Start the worker task (on the running event loop)."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the worker, failing requests still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue an item and wait for its result.
+
+        Args:
+            item: Input passed to predict_batch as part of a batch
+
+        Returns:
+            The result for this item
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def submit_many(self, items: Sequence[Any]) -> List[Any]:
+        """
+        Queue several items and wait for all of their results.
+
+        Args:
+            items: Inputs passed to predict_batch
+
+        Returns:
+            Results in the order of ``items``
+        """
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in items]
+        for item, future in zip(items, futures):
+            self._queue.put_nowait((item, future))
+        return list(await asyncio.gather(*futures))
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Wait for the first request, then gather more until the window or size limit."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        """Worker loop: collect a batch, predict it off the event loop, resolve futures."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Requests whose client went away need no prediction
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.predict_batch, items)
+            except Exception as e:
+                logger.exception(f"Batch of {len(items)} predictions failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
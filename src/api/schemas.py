@@ -0,0 +1,103 @@
+"""
+Request and response models of the prediction service.
+
+The request model is generated from FlightDataValidator's schema, so the API
+accepts exactly the columns and types the training data is validated
+against, and every request is checked with the schema's compiled
+RecordValidator (same ranges and enums as batch validation, in
+microseconds). Fields use the dataset's column names as aliases (e.g.
+"Departure Date & Time"); snake_case names are accepted too.
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, Field, create_model, model_validator
+
+from src.data.record_validation import RecordValidator
+from src.data.validation import FlightDataValidator
+from src.features.builder import INPUT_COLUMNS, TARGET_COLUMN
+
+# Fare columns are what the service predicts, not inputs
+EXCLUDED_COLUMNS = ["Base Fare (BDT)", "Tax & Surcharge (BDT)", TARGET_COLUMN]
+
+
+def field_name(column: str) -> str:
+    """Python identifier for a column name, e.g. "Duration (hrs)" -> "duration_hrs"."""
+    return re.sub(r"[^0-9a-z]+", "_", column.lower()).strip("_")
+
+
+def _python_type(dtype: Any) -> type:
+    """Python type accepted for a Pandera column dtype."""
+    name = str(dtype)
+    if name.startswith("datetime64"):
+        return datetime
+    if name.startswith("float"):
+        return float
+    if name.startswith("int"):
+        return int
+    return str
+
+
+def build_request_model(validator: Optional[FlightDataValidator] = None) -> Type[BaseModel]:
+    """
+    Create the pydantic model of one flight from the validator's schema.
+
+    Columns needed for a prediction are required; the other schema columns
+    are optional. Values are checked against the schema's checks after parsing,
+    and failures are reported as validation errors.
+
+    Args:
+        validator: Validator whose schema is used (a default one if omitted)
+
+    Returns:
+        Pydantic model class
+    """
+    schema = (validator or FlightDataValidator()).schema
+    columns = [column for column in schema.columns if column not in EXCLUDED_COLUMNS]
+    record_validator = RecordValidator(schema, columns=columns, required=INPUT_COLUMNS)
+
+    def check_schema(request: BaseModel) -> BaseModel:
+        failures = record_validator.failure_cases(
+            request.model_dump(by_alias=True, exclude_none=True)
+        )
+        if failures:
+            raise ValueError(
+                "; ".join(
+                    f"{failure['column'] or failure['failure_case']}: {failure['check']}"
+                    for failure in failures
+                )
+            )
+        return request
+
+    fields: Dict[str, Tuple[Any, Any]] = {}
+    for column in columns:
+        spec = schema.columns[column]
+        python_type = _python_type(spec.dtype)
+        if column in INPUT_COLUMNS and not spec.nullable:
+            fields[field_name(column)] = (python_type, Field(alias=column))
+        else:
+            fields[field_name(column)] = (Optional[python_type], Field(None, alias=column))
+
+    return create_model(
+        "FlightRequest",
+        __config__=ConfigDict(populate_by_name=True, extra="ignore"),
+        __validators__={"check_schema": model_validator(mode="after")(check_schema)},
+        **fields,
+    )
+
+
+FlightRequest = build_request_model()
+
+
+class PredictionResponse(BaseModel):
+    """Predicted fare of one flight."""
+
+    total_fare: float = Field(description="Predicted Total Fare (BDT)")
+
+
+class BatchPredictionResponse(BaseModel):
+    """Predicted fares of several flights, in request order."""
+
+    total_fares: List[float] = Field(description="Predicted Total Fare (BDT) per flight")
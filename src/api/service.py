@@ -0,0 +1,96 @@
+"""
+FastAPI fare prediction service.
+
+The model and the encoder registry are loaded once at startup. Concurrent
+/predict requests are coalesced by a MicroBatcher into one build_features
+and one model.predict call per batch, so throughput scales with load while
+each request waits at most one batching window.
+
+Settings are read from FARE_API_* environment variables (see ServiceSettings).
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from src.api.batcher import MicroBatcher
+from src.api.schemas import BatchPredictionResponse, FlightRequest, PredictionResponse
+from src.features.encoding import FEATURES_DIR
+from src.models.predictor import MODEL_PATH, FarePredictor
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceSettings(BaseSettings):
+    """Service configuration, overridable with FARE_API_* environment variables."""
+
+    model_config = SettingsConfigDict(env_prefix="FARE_API_", protected_namespaces=())
+
+    model_path: Path = MODEL_PATH
+    encoders_dir: Path = FEATURES_DIR
+    max_batch_size: int = 256
+    max_wait_ms: float = 2.0
+
+
+def _predict_requests(predictor: FarePredictor) -> Callable[[List[BaseModel]], List[float]]:
+    """Batch function of the MicroBatcher: parsed requests to predicted fares."""
+
+    def predict(flights: List[BaseModel]) -> List[float]:
+        return predictor.predict_records([flight.model_dump(by_alias=True) for flight in flights])
+
+    return predict
+
+
+def create_app(
+    settings: Optional[ServiceSettings] = None, predictor: Optional[FarePredictor] = None
+) -> FastAPI:
+    """
+    Create the prediction service.
+
+    Args:
+        settings: Service settings (read from the environment if omitted)
+        predictor: Already loaded predictor (loaded from settings if omitted)
+
+    Returns:
+        FastAPI application
+    """
+    settings = settings or ServiceSettings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        loaded = predictor or FarePredictor.load(settings.model_path, settings.encoders_dir)
+        batcher = MicroBatcher(
+            _predict_requests(loaded),
+            max_batch_size=settings.max_batch_size,
+            max_wait_ms=settings.max_wait_ms,
+        )
+        await batcher.start()
+        app.state.batcher = batcher
+        yield
+        await batcher.stop()
+
+    app = FastAPI(title="Flight Fare Prediction", lifespan=lifespan)
+
+    @app.get("/health")
+    async def health(request: Request) -> Dict[str, Any]:
+        batcher: MicroBatcher = request.app.state.batcher
+        return {"status": "ok", "batches": batcher.batches, "predictions": batcher.items}
+
+    @app.post("/predict", response_model=PredictionResponse)
+    async def predict(flight: FlightRequest, request: Request) -> PredictionResponse:
+        total_fare = await request.app.state.batcher.submit(flight)
+        return PredictionResponse(total_fare=total_fare)
+
+    @app.post("/predict/batch", response_model=BatchPredictionResponse)
+    async def predict_batch(
+        flights: List[FlightRequest], request: Request
+    ) -> BatchPredictionResponse:
+        total_fares = await request.app.state.batcher.submit_many(flights)
+        return BatchPredictionResponse(total_fares=total_fares)
+
+    return app
@@ -0,0 +1,518 @@
+"""
+Mergeable accumulators for chunked validation and summaries of the Flight Price Dataset.
+
+Each accumulator consumes DataFrame chunks with ``update`` and combines with a
+peer built over another part of the data with ``merge``. Feeding a whole
+DataFrame as a single chunk yields exactly the same result as streaming it,
+which keeps the in-memory and streaming validation reports identical.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.duplicates import DUPLICATE_FLIGHT_COLUMNS, DuplicateIndex, fingerprint_rows
+from src.data.loader import DATETIME_COLUMNS, DATETIME_FORMAT, NUMERIC_DTYPES
+from src.data.routes import ROUTE_COLUMNS, RouteIndex
+from src.data.streaming_stats import StreamingStats, ValueCounts
+
+FARE_COLUMN = "Total Fare (BDT)"
+FARE_COMPONENT_COLUMNS = ["Base Fare (BDT)", "Tax & Surcharge (BDT)", FARE_COLUMN]
+
+# Aggregates planned by the data summary report
+SUMMARY_CATEGORICAL_COLUMNS = ["Airline", "Class", "Stopovers", "Seasonality", "Booking Source"]
+SUMMARY_GROUP_COLUMNS = ["Airline", "Seasonality", "Class"]
+
+
+def normalize_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give numeric and datetime columns a fixed dtype regardless of chunk contents.
+
+    A chunk containing a malformed value keeps that column as read, while
+    other chunks are fully typed. Normalizing (malformed values become
+    NaN/NaT) keeps row fingerprints and fare sums consistent across chunks.
+
+    Args:
+        df: DataFrame chunk
+
+    Returns:
+        DataFrame with float64 numeric and datetime64 date columns
+    """
+    df = df.copy(deep=False)
+    for col in NUMERIC_DTYPES:
+        if col in df.columns and df[col].dtype != np.float64:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float64)
+    for col in DATETIME_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], format=DATETIME_FORMAT, errors="coerce")
+    return df
+
+
+class FailureCaseSampler:
+    """Collects Pandera failure cases across chunks, keeping a capped sample per check."""
+
+    def __init__(self, max_cases_per_check: Optional[int] = None):
+        """
+        Initialize the sampler.
+
+        Args:
+            max_cases_per_check: Maximum failure cases kept per (column, check),
+                or None to keep all of them
+        """
+        self.max_cases_per_check = max_cases_per_check
+        self.cases: Dict[Tuple[Any, Any], List[Dict[str, Any]]] = {}
+        self._seen_frame_level: set = set()
+
+    def update(self, failure_cases: pd.DataFrame) -> "FailureCaseSampler":
+        """Add the failure cases reported by Pandera for one chunk."""
+        for record in failure_cases.to_dict("records"):
+            self._add(record)
+        return self
+
+    def merge(self, other: "FailureCaseSampler") -> "FailureCaseSampler":
+        """Merge failure cases collected by another sampler."""
+        for records in other.cases.values():
+            for record in records:
+                self._add(record)
+        return self
+
+    def _add(self, record: Dict[str, Any]) -> None:
+        """Add a single record, dropping the highest row indices beyond the cap."""
+        # Frame-level failures (missing column, wrong dtype) repeat in every chunk
+        if record.get("index") is None:
+            key = (record["schema_context"], record["column"], record["check"])
+            key += (str(record["failure_case"]),)
+            if key in self._seen_frame_level:
+                return
+            self._seen_frame_level.add(key)
+
+        records = self.cases.setdefault((record["column"], record["check"]), [])
+        records.append(record)
+        if self.max_cases_per_check is not None and len(records) > self.max_cases_per_check:
+            records.sort(key=_failure_sort_key)
+            del records[self.max_cases_per_check :]
+
+    def shift_index(self, offset: int) -> "FailureCaseSampler":
+        """
+        Shift row indices, e.g. from partition-local to file positions.
+
+        Args:
+            offset: Number of rows preceding the partition
+
+        Returns:
+            The sampler itself, to allow chaining
+        """
+        for records in self.cases.values():
+            for record in records:
+                if record.get("index") is not None:
+                    record["index"] = int(record["index"]) + offset
+        return self
+
+    def result(self) -> List[Dict[str, Any]]:
+        """Return the collected failure cases in a deterministic order."""
+        records = [record for group in self.cases.values() for record in group]
+        return sorted(records, key=_failure_sort_key)
+
+
+def _failure_sort_key(record: Dict[str, Any]) -> Tuple[str, str, str, int]:
+    """Sort failure cases by context, column, check and row index."""
+    index = record.get("index")
+    return (
+        str(record["schema_context"]),
+        str(record["column"]),
+        str(record["check"]),
+        -1 if index is None else int(index),
+    )
+
+
+class ValidationAccumulator:
+    """Accumulates business-rule counts and summary statistics over DataFrame chunks."""
+
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self.total_rows = 0
+        self.columns: List[str] = []
+        self.missing_values: Dict[str, int] = {}
+        self.fare_mismatches = 0
+        self.has_fare_components = True
+        self.has_duplicate_columns = True
+        self.row_index = DuplicateIndex()
+        self.flight_index = DuplicateIndex()
+        self.has_fare_column = False
+        self.fare_stats = StreamingStats()
+
+    def update(self, df: pd.DataFrame) -> "ValidationAccumulator":
+        """
+        Fold a chunk of flight data into the accumulator.
+
+        Args:
+            df: DataFrame chunk
+
+        Returns:
+            The accumulator itself, to allow chaining
+        """
+        if not self.columns:
+            self.columns = list(df.columns)
+
+        self.total_rows += len(df)
+        for col, count in df.isnull().sum().items():
+            self.missing_values[col] = self.missing_values.get(col, 0) + int(count)
+
+        df = normalize_chunk(df)
+
+        self.row_index.add_frame(df)
+
+        if all(col in df.columns for col in FARE_COMPONENT_COLUMNS):
+            calculated_total = df["Base Fare (BDT)"] + df["Tax & Surcharge (BDT)"]
+            diff = abs(calculated_total - df[FARE_COLUMN])
+            self.fare_mismatches += int((diff > 1.0).sum())  # Allow 1 BDT tolerance for rounding
+        else:
+            self.has_fare_components = False
+
+        if all(col in df.columns for col in DUPLICATE_FLIGHT_COLUMNS):
+            self.flight_index.add_frame(df, DUPLICATE_FLIGHT_COLUMNS)
+        else:
+            self.has_duplicate_columns = False
+
+        if FARE_COLUMN in df.columns:
+            self.has_fare_column = True
+            self.fare_stats.update(df[FARE_COLUMN])
+
+        return self
+
+    def merge(self, other: "ValidationAccumulator") -> "ValidationAccumulator":
+        """
+        Merge an accumulator built over another part of the data.
+
+        Args:
+            other: Accumulator to merge into this one
+
+        Returns:
+            The accumulator itself, to allow chaining
+        """
+        if not self.columns:
+            self.columns = list(other.columns)
+
+        self.total_rows += other.total_rows
+        for col, count in other.missing_values.items():
+            self.missing_values[col] = self.missing_values.get(col, 0) + count
+
+        self.fare_mismatches += other.fare_mismatches
+        self.has_fare_components = self.has_fare_components and other.has_fare_components
+        self.has_duplicate_columns = self.has_duplicate_columns and other.has_duplicate_columns
+        self.row_index.merge(other.row_index)
+        self.flight_index.merge(other.flight_index)
+        self.has_fare_column = self.has_fare_column or other.has_fare_column
+        self.fare_stats.merge(other.fare_stats)
+        return self
+
+    def business_warnings(self) -> list:
+        """
+        Build the business-rule warnings for the accumulated data.
+
+        Returns:
+            List of warnings
+        """
+        warnings = []
+
+        if self.has_fare_components and self.fare_mismatches > 0:
+            warnings.append(
+                {
+                    "rule": "Total Fare Calculation",
+                    "message": f"{self.fare_mismatches} rows have Total Fare != Base Fare + Tax",
+                    "severity": "warning",
+                }
+            )
+
+        if self.has_duplicate_columns:
+            duplicates = self.flight_index.duplicate_count
+            if duplicates > 0:
+                warnings.append(
+                    {
+                        "rule": "Duplicate Flights",
+                        "message": f"{duplicates} potential duplicate flight records found",
+                        "severity": "info",
+                    }
+                )
+
+        if self.has_fare_column:
+            # Median and counts come from the quantile sketch, within its relative accuracy
+            median_fare = self.fare_stats.median
+            outliers = self.fare_stats.sketch.count_outside(median_fare * 0.1, median_fare * 10)
+            if outliers > 0:
+                warnings.append(
+                    {
+                        "rule": "Fare Outliers",
+                        "message": f"{outliers} rows with extreme fares (10x or 0.1x median)",
+                        "severity": "info",
+                    }
+                )
+
+        return warnings
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Build summary statistics for the accumulated data.
+
+        Returns:
+            Dictionary of statistics
+        """
+        stats: Dict[str, Any] = {
+            "total_rows": self.total_rows,
+            "total_columns": len(self.columns),
+            "missing_values": dict(self.missing_values),
+            "duplicate_rows": self.row_index.duplicate_count,
+        }
+
+        if self.has_fare_column:
+            # Exact sums make these identical however the rows were partitioned
+            stats["fare_stats"] = self.fare_stats.summary()
+
+        return stats
+
+
+def _encode(series: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Integer codes (-1 for missing) and distinct values of a column."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Index(uniques)
+
+
+def _add_totals(totals: Dict[Any, List[float]], keys: Sequence[Any], *columns: np.ndarray):
+    """Add per-key totals (e.g. row count, fare sum) into a running dictionary."""
+    for key, *values in zip(keys, *(column.tolist() for column in columns)):
+        if key in totals:
+            totals[key] = [a + b for a, b in zip(totals[key], values)]
+        else:
+            totals[key] = values
+
+
+def _merge_totals(totals: Dict[Any, List[float]], other: Dict[Any, List[float]]) -> None:
+    """Merge per-key totals from another accumulator."""
+    for key, values in other.items():
+        _add_totals(totals, [key], *(np.array([value]) for value in values))
+
+
+class SummaryAccumulator:
+    """
+    Accumulates every aggregate of the data summary report in a single pass.
+
+    The aggregates are planned up front from the constructor arguments. Each
+    chunk is encoded once per key column, and counts, fare sums and fare
+    counts for every group come from ``np.bincount`` over those codes, instead
+    of one groupby per report section. Routes are aggregated by a RouteIndex.
+    """
+
+    def __init__(
+        self,
+        categorical_columns: Sequence[str] = SUMMARY_CATEGORICAL_COLUMNS,
+        group_columns: Sequence[str] = SUMMARY_GROUP_COLUMNS,
+        target: str = FARE_COLUMN,
+    ):
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            categorical_columns: Columns whose value counts are reported
+            group_columns: Columns whose mean target per value is reported
+            target: Numeric column averaged per group
+        """
+        self.categorical_columns = list(categorical_columns)
+        self.group_columns = list(group_columns)
+        self.target = target
+
+        self.total_rows = 0
+        self.columns: List[str] = []
+        self.dtypes: Dict[str, str] = {}
+        self.memory_bytes = 0
+        self.missing_values: Dict[str, int] = {}
+        self.incomplete_rows = 0
+        self.fare_mismatches = 0
+        # Distinct row fingerprints; duplicates are rows minus distinct rows
+        self.row_fingerprints = ValueCounts()
+        self.flight_fingerprints = ValueCounts()
+        # Per column: value -> [rows] for text columns, exact value table otherwise
+        self.category_counts: Dict[str, Dict[Any, List[float]]] = {}
+        self.value_counts: Dict[str, ValueCounts] = {}
+        # Per group column: value -> [target sum, target count]
+        self.group_totals: Dict[str, Dict[Any, List[float]]] = {}
+        self.route_index = RouteIndex(track_quantiles=False)
+
+    def update(self, df: pd.DataFrame) -> "SummaryAccumulator":
+        """
+        Fold a chunk of typed flight data into the accumulator.
+
+        Args:
+            df: DataFrame chunk
+
+        Returns:
+            The accumulator itself, to allow chaining
+        """
+        if not self.columns:
+            self.columns = list(df.columns)
+            self.dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
+
+        self.total_rows += len(df)
+
+        nulls = df.isnull()
+        for col, count in nulls.sum().items():
+            self.missing_values[col] = self.missing_values.get(col, 0) + int(count)
+        self.incomplete_rows += int(nulls.any(axis=1).sum())
+
+        self.row_fingerprints.update(fingerprint_rows(df))
+        if all(col in df.columns for col in DUPLICATE_FLIGHT_COLUMNS):
+            self.flight_fingerprints.update(fingerprint_rows(df, DUPLICATE_FLIGHT_COLUMNS))
+
+        if all(col in df.columns for col in FARE_COMPONENT_COLUMNS):
+            calculated_total = df["Base Fare (BDT)"] + df["Tax & Surcharge (BDT)"]
+            self.fare_mismatches += int((abs(df[FARE_COLUMN] - calculated_total) > 1.0).sum())
+
+        target = df[self.target].to_numpy(dtype=np.float64) if self.target in df else None
+        has_target = None if target is None else ~np.isnan(target)
+
+        encoded = {}
+        for col in df.columns:
+            if pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_datetime64_any_dtype(
+                df[col]
+            ):
+                self.value_counts.setdefault(col, ValueCounts()).update(df[col].to_numpy())
+                # Categorical (in-memory) size is added once per category in result()
+                self.memory_bytes += int(df[col].memory_usage(deep=True, index=False))
+                continue
+
+            codes, uniques = encoded[col] = _encode(df[col])
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            _add_totals(self.category_counts.setdefault(col, {}), uniques, counts)
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                self.memory_bytes += codes.nbytes
+            else:
+                self.memory_bytes += int(df[col].memory_usage(deep=True, index=False))
+
+        if target is not None:
+            for col in self.group_columns:
+                if col not in encoded:
+                    continue
+                codes, uniques = encoded[col]
+                valid = (codes >= 0) & has_target
+                sums = np.bincount(codes[valid], weights=target[valid], minlength=len(uniques))
+                counts = np.bincount(codes[valid], minlength=len(uniques))
+                _add_totals(self.group_totals.setdefault(col, {}), uniques, sums, counts)
+
+            if all(col in encoded for col in ROUTE_COLUMNS):
+                self.route_index.update(df, self.target)
+
+        return self
+
+    def merge(self, other: "SummaryAccumulator") -> "SummaryAccumulator":
+        """
+        Merge an accumulator built over another part of the data.
+
+        Args:
+            other: Accumulator to merge into this one
+
+        Returns:
+            The accumulator itself, to allow chaining
+        """
+        if not self.columns:
+            self.columns = list(other.columns)
+            self.dtypes = dict(other.dtypes)
+
+        self.total_rows += other.total_rows
+        self.memory_bytes += other.memory_bytes
+        for col, count in other.missing_values.items():
+            self.missing_values[col] = self.missing_values.get(col, 0) + count
+        self.incomplete_rows += other.incomplete_rows
+        self.fare_mismatches += other.fare_mismatches
+        self.row_fingerprints.merge(other.row_fingerprints)
+        self.flight_fingerprints.merge(other.flight_fingerprints)
+
+        for col, counts in other.category_counts.items():
+            _merge_totals(self.category_counts.setdefault(col, {}), counts)
+        for col, values in other.value_counts.items():
+            self.value_counts.setdefault(col, ValueCounts()).merge(values)
+        for col, totals in other.group_totals.items():
+            _merge_totals(self.group_totals.setdefault(col, {}), totals)
+        self.route_index.merge(other.route_index)
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Build the summary aggregates.
+
+        The result only holds plain Python values, so it can be cached as JSON.
+
+        Returns:
+            Dictionary of summary aggregates
+        """
+        # Categories are stored once per column in memory, not once per chunk
+        category_bytes = sum(
+            int(pd.Index(list(counts)).memory_usage(deep=True))
+            for col, counts in self.category_counts.items()
+            if self.dtypes.get(col) == "category"
+        )
+        memory_bytes = (
+            self.memory_bytes + category_bytes + pd.RangeIndex(self.total_rows).memory_usage()
+        )
+
+        def unique(col: str) -> int:
+            if col in self.value_counts:
+                return self.value_counts[col].nunique
+            return sum(1 for (count,) in self.category_counts.get(col, {}).values() if count)
+
+        def sorted_counts(col: str) -> List[List[Any]]:
+            counts = self.category_counts.get(col, {})
+            ranked = sorted(counts.items(), key=lambda item: -item[1][0])
+            return [[str(value), int(count)] for value, (count,) in ranked if count]
+
+        routes = self.route_index.summary().loc[self.route_index.popular().index]
+
+        result: Dict[str, Any] = {
+            "total_rows": self.total_rows,
+            "columns": [
+                {"name": col, "dtype": self.dtypes[col], "unique": unique(col)}
+                for col in self.columns
+            ],
+            "memory_mb": memory_bytes / 1024**2,
+            "missing_values": dict(self.missing_values),
+            "incomplete_rows": self.incomplete_rows,
+            "duplicate_rows": self.row_fingerprints.count - self.row_fingerprints.nunique,
+            "duplicate_flights": (
+                self.flight_fingerprints.count - self.flight_fingerprints.nunique
+            ),
+            "fare_mismatches": self.fare_mismatches,
+            "numeric": {
+                col: values.summary()
+                for col, values in self.value_counts.items()
+                if not self.dtypes[col].startswith("datetime")
+            },
+            "value_counts": {
+                col: sorted_counts(col)
+                for col in self.categorical_columns
+                if col in self.category_counts
+            },
+            "group_means": {
+                col: sorted(
+                    (
+                        [str(value), total / count, int(count)]
+                        for value, (total, count) in totals.items()
+                        if count
+                    ),
+                    key=lambda row: -row[1],
+                )
+                for col, totals in self.group_totals.items()
+            },
+            "routes": [
+                [route, int(rows), float(mean)]
+                for route, (rows, mean) in routes[["rows", "mean"]].iterrows()
+            ],
+        }
+
+        if self.target in self.value_counts:
+            target = self.value_counts[self.target]
+            q1, q3 = target.quantile(0.25), target.quantile(0.75)
+            iqr = q3 - q1
+            result["target_outliers"] = target.count_outside(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+
+        return result
@@ -0,0 +1,528 @@
+"""
+Pre-aggregated fare cube for fare-by-category analysis.
+
+FareCube materializes, for every observed combination of Airline, Class,
+Stopovers, Seasonality, Booking Source, Route and booking window, the count,
+sum and sum of squares of the fare plus the bins of a DDSketch. Slice and
+roll-up queries combine the matching cells without touching raw rows: counts,
+means and standard deviations are exact, medians come from the merged sketch
+bins within the sketch's relative accuracy.
+
+Cubes are saved to ``data/03-features`` as a NumPy archive with a JSON file
+describing the dimensions, and are keyed by the hash of the raw file they
+were built from.
+"""
+
+import json
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.loader import load_raw_data
+from src.data.manifest import current_file_hash
+from src.data.routes import FARE_COLUMN, ROUTE_COLUMNS, encode_routes
+from src.data.streaming_stats import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+DAYS_BEFORE_COLUMN = "Days Before Departure"
+
+CUBE_DIMENSIONS = [
+    "Airline",
+    "Class",
+    "Stopovers",
+    "Seasonality",
+    "Booking Source",
+    "Route",
+    "Booking Window",
+]
+
+# Days-before-departure buckets of the "Booking Window" dimension
+BOOKING_WINDOW_EDGES = [-np.inf, 7, 14, 30, 60, np.inf]
+BOOKING_WINDOW_LABELS = ["0-7 days", "8-14 days", "15-30 days", "31-60 days", "61+ days"]
+
+# Largest table of group keys (or group x sketch bin keys) counted densely instead of sorted
+DENSE_BINS_LIMIT = 1 << 24
+
+FEATURES_DIR = Path("data/03-features")
+CUBE_NAME = "fare_cube"
+
+Filters = Dict[str, Union[str, Sequence[str]]]
+
+
+def booking_window(days_before: pd.Series) -> pd.Categorical:
+    """
+    Bucket days before departure into booking windows.
+
+    Args:
+        days_before: Days between booking and departure
+
+    Returns:
+        Categorical of booking window labels
+    """
+    return pd.cut(days_before, BOOKING_WINDOW_EDGES, labels=BOOKING_WINDOW_LABELS)
+
+
+def _dimension_codes(df: pd.DataFrame, dimension: str) -> Tuple[np.ndarray, List[str]]:
+    """Integer codes (-1 for missing) and labels of one cube dimension."""
+    if dimension == "Route":
+        return encode_routes(df)
+    if dimension == "Booking Window":
+        series = pd.Series(booking_window(df[DAYS_BEFORE_COLUMN]))
+    else:
+        series = df[dimension]
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series, sort=True)
+    return codes.astype(np.int64), [str(value) for value in uniques]
+
+
+def _pack_bins(sketch: QuantileSketch, values: np.ndarray) -> np.ndarray:
+    """Encode each value's sketch bin (sign and key) as one int64."""
+    signs = np.sign(values).astype(np.int64)
+    keys = np.zeros(len(values), dtype=np.int64)
+    keys[signs > 0] = sketch.bin_keys(values[signs > 0])
+    keys[signs < 0] = sketch.bin_keys(-values[signs < 0])
+    return keys * 4 + signs + 1
+
+
+def _radix(columns: Sequence[np.ndarray], sizes: Sequence[int]) -> np.ndarray:
+    """Combine per-dimension codes into a single int64 key."""
+    if np.prod([float(size) for size in sizes]) >= 2**62:
+        raise ValueError("Too many distinct dimension values to combine into one key")
+    key = np.zeros(len(columns[0]) if len(columns) else 0, dtype=np.int64)
+    for column, size in zip(columns, sizes):
+        key = key * size + column
+    return key
+
+
+class FareCube:
+    """Materialized fare aggregates over categorical dimensions."""
+
+    def __init__(
+        self,
+        dimensions: List[str],
+        labels: Dict[str, List[str]],
+        cells: np.ndarray,
+        count: np.ndarray,
+        total: np.ndarray,
+        total_sq: np.ndarray,
+        bin_cell: np.ndarray,
+        bin_packed: np.ndarray,
+        bin_count: np.ndarray,
+        measure: str = FARE_COLUMN,
+        relative_accuracy: float = 0.01,
+        source_hash: Optional[str] = None,
+    ):
+        """
+        Initialize a cube from its arrays (see from_frame and load).
+
+        Args:
+            dimensions: Dimension names, in the column order of ``cells``
+            labels: Value labels per dimension, indexed by code
+            cells: (cells x dimensions) array of dimension codes
+            count: Number of measure values per cell
+            total: Sum of the measure per cell
+            total_sq: Sum of squared measure values per cell
+            bin_cell: Cell of each sketch bin entry
+            bin_packed: Packed sign and key of each sketch bin entry
+            bin_count: Number of values in each sketch bin entry
+            measure: Name of the aggregated column
+            relative_accuracy: Relative accuracy of the sketch bins
+            source_hash: SHA256 of the raw file the cube was built from
+        """
+        self.dimensions = dimensions
+        self.labels = labels
+        self.cells = cells
+        self.count = count
+        self.total = total
+        self.total_sq = total_sq
+        self.bin_cell = bin_cell
+        self.bin_packed = bin_packed
+        self.bin_count = bin_count
+        self.measure = measure
+        self.relative_accuracy = relative_accuracy
+        self.source_hash = source_hash
+        self._codes = {dim: {label: i for i, label in enumerate(labels[dim])} for dim in dimensions}
+        self._posting_lists: Dict[str, List[np.ndarray]] = {}
+        # Bins are stored sorted by cell: the bins of cell i are _bin_offsets[i]:_bin_offsets[i + 1]
+        self._bin_offsets = np.searchsorted(bin_cell, np.arange(len(cells) + 1))
+        self._packed_offset = int(bin_packed.min()) if len(bin_packed) else 0
+        self._packed_span = (
+            int(bin_packed.max()) - self._packed_offset + 1 if len(bin_packed) else 1
+        )
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        dimensions: Sequence[str] = CUBE_DIMENSIONS,
+        measure: str = FARE_COLUMN,
+        relative_accuracy: float = 0.01,
+    ) -> "FareCube":
+        """
+        Aggregate a DataFrame into a cube.
+
+        Rows with a missing dimension value or measure are left out.
+
+        Args:
+            df: Flight data with the dimension columns (Route and Booking
+                Window are derived from Source/Destination and Days Before
+                Departure)
+            dimensions: Dimensions of the cube
+            measure: Numeric column to aggregate
+            relative_accuracy: Relative accuracy of the per-cell quantile sketches
+
+        Returns:
+            Populated FareCube
+        """
+        dimensions = list(dimensions)
+        encoded = [_dimension_codes(df, dim) for dim in dimensions]
+        sizes = [max(len(labels), 1) for _, labels in encoded]
+
+        values = df[measure].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        for codes, _ in encoded:
+            valid &= codes >= 0
+        values = values[valid]
+
+        keys = _radix([codes[valid] for codes, _ in encoded], sizes)
+        cell_keys, cell_of_row = np.unique(keys, return_inverse=True)
+
+        cells = np.empty((len(cell_keys), len(dimensions)), dtype=np.int32)
+        remainder = cell_keys.copy()
+        for position in reversed(range(len(dimensions))):
+            cells[:, position] = remainder % sizes[position]
+            remainder //= sizes[position]
+
+        count = np.bincount(cell_of_row, minlength=len(cell_keys))
+        total = np.bincount(cell_of_row, weights=values, minlength=len(cell_keys))
+        total_sq = np.bincount(cell_of_row, weights=values**2, minlength=len(cell_keys))
+
+        # One (cell, bin) entry per distinct bin in each cell
+        packed = _pack_bins(QuantileSketch(relative_accuracy), values)
+        offset = packed.min() if len(packed) else 0
+        span = int(packed.max() - offset + 1) if len(packed) else 1
+        combined, bin_count = np.unique(cell_of_row * span + (packed - offset), return_counts=True)
+
+        return cls(
+            dimensions=dimensions,
+            labels={dim: labels for dim, (_, labels) in zip(dimensions, encoded)},
+            cells=cells,
+            count=count,
+            total=total,
+            total_sq=total_sq,
+            bin_cell=combined // span,
+            bin_packed=combined % span + offset,
+            bin_count=bin_count,
+            measure=measure,
+            relative_accuracy=relative_accuracy,
+        )
+
+    def __len__(self) -> int:
+        """Number of non-empty cells."""
+        return len(self.cells)
+
+    def _postings(self, dim: str) -> List[np.ndarray]:
+        """Sorted ids of the cells holding each value of a dimension, built on first use."""
+        if dim not in self._posting_lists:
+            column = self.cells[:, self.dimensions.index(dim)]
+            order = np.argsort(column, kind="stable")
+            bounds = np.cumsum(np.bincount(column, minlength=len(self.labels[dim])))
+            self._posting_lists[dim] = np.split(order, bounds[:-1])
+        return self._posting_lists[dim]
+
+    def _select(self, filters: Optional[Filters]) -> np.ndarray:
+        """
+        Sorted ids of the cells matching every filter.
+
+        The most selective filter is answered from its posting lists; the
+        remaining filters only check the cells it returned, so a narrow slice
+        costs time proportional to its size rather than to the cube's.
+        """
+        codes = {}
+        for dim, wanted in (filters or {}).items():
+            if dim not in self._codes:
+                raise KeyError(f"Unknown cube dimension: {dim}")
+            wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+            codes[dim] = [self._codes[dim][value] for value in wanted if value in self._codes[dim]]
+        if not codes:
+            return np.arange(len(self.cells))
+
+        sizes = {
+            dim: sum(len(self._postings(dim)[c]) for c in dim_codes)
+            for dim, dim_codes in codes.items()
+        }
+        first = min(sizes, key=sizes.get)
+        ids = np.concatenate(
+            [self._postings(first)[c] for c in codes[first]] + [np.zeros(0, np.int64)]
+        )
+        if len(codes[first]) > 1:
+            ids.sort()
+        for dim, dim_codes in codes.items():
+            if dim != first:
+                column = self.cells[ids, self.dimensions.index(dim)]
+                ids = ids[np.isin(column, dim_codes)]
+        return ids
+
+    def _bins(self, cell_ids: np.ndarray) -> np.ndarray:
+        """Indices of the stored bins of the given cells."""
+        if len(cell_ids) == len(self.cells):
+            return np.arange(len(self.bin_cell))
+        starts, ends = self._bin_offsets[cell_ids], self._bin_offsets[cell_ids + 1]
+        lengths = ends - starts
+        # Concatenated ranges starts[i]:ends[i] without a Python loop
+        firsts = np.cumsum(lengths) - lengths
+        return np.arange(lengths.sum()) + np.repeat(starts - firsts, lengths)
+
+    def _sketches(
+        self, bins: np.ndarray, groups: np.ndarray, n_groups: int
+    ) -> List[QuantileSketch]:
+        """Rebuild one quantile sketch per group from a subset of the stored bins."""
+        span = self._packed_span
+        flat = groups * span + (self.bin_packed[bins] - self._packed_offset)
+        if n_groups * span <= DENSE_BINS_LIMIT:
+            # Few groups: count into a dense (group, bin) array instead of sorting
+            dense = np.bincount(flat, weights=self.bin_count[bins], minlength=n_groups * span)
+            combined = np.flatnonzero(dense)
+            counts = dense[combined].astype(np.int64)
+        else:
+            combined, inverse = np.unique(flat, return_inverse=True)
+            counts = np.bincount(inverse, weights=self.bin_count[bins]).astype(np.int64)
+        combined_groups = combined // span
+        packed = combined % span + self._packed_offset
+        signs = np.mod(packed, 4) - 1
+        keys = (packed - signs - 1) // 4
+        bounds = np.searchsorted(combined_groups, np.arange(n_groups + 1))
+
+        sketches = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            sketch = QuantileSketch(self.relative_accuracy)
+            for sign, key, count in zip(
+                signs[start:end].tolist(), keys[start:end].tolist(), counts[start:end].tolist()
+            ):
+                if sign > 0:
+                    sketch.positive[key] = count
+                elif sign < 0:
+                    sketch.negative[key] = count
+                else:
+                    sketch.zero_count = count
+            sketch.count = int(counts[start:end].sum())
+            sketches.append(sketch)
+        return sketches
+
+    @staticmethod
+    def _moments(count: np.ndarray, total: np.ndarray, total_sq: np.ndarray):
+        """Mean and sample standard deviation from count, sum and sum of squares."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            variance = (total_sq - count * mean**2) / (count - 1)
+        return mean, np.sqrt(np.clip(variance, 0, None))
+
+    def query(self, filters: Optional[Filters] = None) -> Dict[str, float]:
+        """
+        Aggregate the measure over a slice of the cube.
+
+        Args:
+            filters: Dimension -> value or list of values, e.g.
+                ``{"Class": "Business", "Route": "DAC → CXB", "Seasonality": "Eid"}``
+
+        Returns:
+            Dictionary with count, mean, std and median
+        """
+        ids = self._select(filters)
+        count = np.array([self.count[ids].sum()])
+        mean, std = self._moments(
+            count, np.array([self.total[ids].sum()]), np.array([self.total_sq[ids].sum()])
+        )
+        bins = self._bins(ids)
+        return {
+            "count": int(count[0]),
+            "mean": float(mean[0]),
+            "std": float(std[0]),
+            "median": self._sketches(bins, np.zeros(len(bins), np.int64), 1)[0].quantile(0.5),
+        }
+
+    def rollup(
+        self, by: Sequence[str], filters: Optional[Filters] = None, median: bool = True
+    ) -> pd.DataFrame:
+        """
+        Roll the cube up to a set of dimensions, optionally within a slice.
+
+        Args:
+            by: Dimensions to keep
+            filters: Dimension filters applied before rolling up (see query)
+            median: Also estimate the median of each group from the sketches
+
+        Returns:
+            DataFrame indexed by the ``by`` dimensions with mean, median (if
+            requested), count and std, like ``groupby(by)[measure].agg(...)``
+        """
+        by = list(by)
+        ids = self._select(filters)
+        positions = [self.dimensions.index(dim) for dim in by]
+        sizes = [len(self.labels[dim]) for dim in by]
+
+        group_keys = _radix([self.cells[ids, position] for position in positions], sizes)
+        n_keys = int(np.prod(sizes))
+        if n_keys <= DENSE_BINS_LIMIT:
+            present = np.bincount(group_keys, minlength=n_keys) > 0
+            keys, group_of_cell = np.flatnonzero(present), (np.cumsum(present) - 1)[group_keys]
+        else:
+            keys, group_of_cell = np.unique(group_keys, return_inverse=True)
+
+        count = np.bincount(group_of_cell, weights=self.count[ids], minlength=len(keys))
+        total = np.bincount(group_of_cell, weights=self.total[ids], minlength=len(keys))
+        total_sq = np.bincount(group_of_cell, weights=self.total_sq[ids], minlength=len(keys))
+        mean, std = self._moments(count, total, total_sq)
+
+        codes = []
+        remainder = keys.copy()
+        for size in reversed(sizes):
+            codes.append(remainder % size)
+            remainder //= size
+        codes.reverse()
+        index_values = [np.array(self.labels[dim], dtype=object)[c] for dim, c in zip(by, codes)]
+        if len(by) == 1:
+            index = pd.Index(index_values[0], name=by[0])
+        else:
+            index = pd.MultiIndex.from_arrays(index_values, names=by)
+
+        result = pd.DataFrame({"mean": mean}, index=index)
+        if median:
+            bins = self._bins(ids)
+            bin_groups = np.repeat(group_of_cell, np.diff(self._bin_offsets)[ids])
+            sketches = self._sketches(bins, bin_groups, len(keys))
+            result["median"] = [sketch.quantile(0.5) for sketch in sketches]
+        result["count"] = count.astype(np.int64)
+        result["std"] = std
+        return result
+
+    def save(self, directory: Union[str, Path] = FEATURES_DIR, name: str = CUBE_NAME) -> Path:
+        """
+        Persist the cube as ``<name>.npz`` and ``<name>.json``.
+
+        Args:
+            directory: Output directory
+            name: Base file name
+
+        Returns:
+            Path to the NumPy archive
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Both files are written to a temporary directory and then moved into
+        # place; a shared version stamp lets load() detect a pair that was
+        # torn by a crash between the two renames
+        version = uuid.uuid4().hex
+        tmp_dir = directory / f".{name}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir()
+        try:
+            np.savez(
+                tmp_dir / f"{name}.npz",
+                cells=self.cells,
+                count=self.count,
+                total=self.total,
+                total_sq=self.total_sq,
+                bin_cell=self.bin_cell,
+                bin_packed=self.bin_packed,
+                bin_count=self.bin_count,
+                version=np.array(version),
+            )
+            metadata = {
+                "dimensions": self.dimensions,
+                "labels": self.labels,
+                "measure": self.measure,
+                "relative_accuracy": self.relative_accuracy,
+                "source_hash": self.source_hash,
+                "version": version,
+            }
+            with open(tmp_dir / f"{name}.json", "w") as f:
+                json.dump(metadata, f, indent=2, ensure_ascii=False)
+
+            archive_path = directory / f"{name}.npz"
+            (tmp_dir / f"{name}.npz").replace(archive_path)
+            (tmp_dir / f"{name}.json").replace(directory / f"{name}.json")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        logger.info(f"Fare cube with {len(self):,} cells saved to {archive_path}")
+        return archive_path
+
+    @classmethod
+    def load(cls, directory: Union[str, Path] = FEATURES_DIR, name: str = CUBE_NAME) -> "FareCube":
+        """
+        Load a cube saved with save().
+
+        Args:
+            directory: Directory holding the cube files
+            name: Base file name
+
+        Returns:
+            The loaded FareCube
+
+        Raises:
+            ValueError: If the archive and the JSON file are from different saves
+        """
+        directory = Path(directory)
+        with open(directory / f"{name}.json") as f:
+            metadata: Dict[str, Any] = json.load(f)
+        version = metadata.pop("version", None)
+        with np.load(directory / f"{name}.npz") as arrays:
+            arrays = {key: arrays[key] for key in arrays.files}
+        archive_version = arrays.pop("version", None)
+        if version != (None if archive_version is None else str(archive_version)):
+            raise ValueError(f"{name}.npz and {name}.json in {directory} are from different saves")
+        return cls(**arrays, **metadata)
+
+
+def materialize_fare_cube(
+    filepath: Union[str, Path],
+    directory: Union[str, Path] = FEATURES_DIR,
+    dimensions: Sequence[str] = CUBE_DIMENSIONS,
+) -> FareCube:
+    """
+    Load the fare cube for a raw file, building and saving it if it is missing or stale.
+
+    Args:
+        filepath: Path to the raw CSV file
+        directory: Directory where the cube is persisted
+        dimensions: Dimensions of the cube
+
+    Returns:
+        FareCube built from the current contents of the raw file
+    """
+    source_hash = current_file_hash(filepath)
+    if (Path(directory) / f"{CUBE_NAME}.json").exists():
+        try:
+            cube = FareCube.load(directory)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Rebuilding the fare cube in {directory}: {e}")
+        else:
+            if cube.source_hash == source_hash and cube.dimensions == list(dimensions):
+                return cube
+
+    derived = {"Route": list(ROUTE_COLUMNS), "Booking Window": [DAYS_BEFORE_COLUMN]}
+    columns = [FARE_COLUMN] + [col for dim in dimensions for col in derived.get(dim, [dim])]
+
+    logger.info(f"Building fare cube from {filepath}")
+    df = load_raw_data(filepath, columns=list(dict.fromkeys(columns)), errors="coerce")
+    cube = FareCube.from_frame(df, dimensions=dimensions)
+    cube.source_hash = source_hash
+    cube.save(directory)
+    return cube
+
+
+if __name__ == "__main__":
+    cube = materialize_fare_cube("data/01-raw/Flight_Price_Dataset_of_Bangladesh.csv")
+    print(cube.rollup(["Class", "Seasonality"]))
@@ -0,0 +1,298 @@
+"""
+Hash-based duplicate detection for flight records.
+
+Rows are reduced to 64-bit fingerprints and kept in compact sorted arrays,
+either in memory (DuplicateIndex) or split across on-disk partitions
+(PartitionedDuplicateIndex) for histories that do not fit in memory. Both
+answer "how many duplicates so far" and "which incoming records are
+duplicates" incrementally, so daily deltas can be checked against history
+without reloading it.
+"""
+
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+DUPLICATE_FLIGHT_COLUMNS = ["Airline", "Source", "Destination", "Departure Date & Time"]
+
+
+def fingerprint_rows(df: pd.DataFrame, columns: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Hash each row of a DataFrame into a 64-bit fingerprint.
+
+    Categorical columns are hashed by value, so fingerprints are stable across
+    chunks and files with different category sets.
+
+    Args:
+        df: DataFrame whose rows should be hashed
+        columns: Key columns to hash (all columns if omitted)
+
+    Returns:
+        Array of uint64 row fingerprints
+    """
+    if columns is not None:
+        df = df[columns]
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _first_occurrences(fingerprints: np.ndarray) -> np.ndarray:
+    """Boolean mask that is True for the first occurrence of each fingerprint."""
+    first = np.zeros(len(fingerprints), dtype=bool)
+    first[np.unique(fingerprints, return_index=True)[1]] = True
+    return first
+
+
+def _merge_runs(runs: List[np.ndarray]) -> np.ndarray:
+    """Merge sorted runs of fingerprints into one sorted array."""
+    # The stable sort detects the sorted runs and merges them in linear time
+    return np.sort(np.concatenate(runs), kind="stable")
+
+
+def _isin_sorted(fingerprints: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Boolean mask of fingerprints present in a sorted key array."""
+    if len(keys) == 0:
+        return np.zeros(len(fingerprints), dtype=bool)
+    positions = np.searchsorted(keys, fingerprints)
+    positions[positions == len(keys)] = len(keys) - 1
+    return keys[positions] == fingerprints
+
+
+class DuplicateIndex:
+    """
+    In-memory sorted fingerprint index.
+
+    Fingerprints are kept in sorted runs whose sizes at least halve from one
+    run to the next. A batch adds a new run, and runs are merged only when the
+    next older run is not much larger, so each fingerprint is merged
+    O(log n) times over a stream instead of the whole index being re-sorted
+    for every batch. Lookups binary-search each of the O(log n) runs.
+    """
+
+    def __init__(self, keys: Optional[np.ndarray] = None):
+        """
+        Initialize the index.
+
+        Args:
+            keys: Optional sorted array of unique fingerprints to start from
+        """
+        self._runs: List[np.ndarray] = [] if keys is None or len(keys) == 0 else [keys]
+        self.duplicate_count = 0
+
+    @property
+    def keys(self) -> np.ndarray:
+        """Sorted array of all indexed fingerprints (merges the runs)."""
+        if len(self._runs) > 1:
+            self._runs = [_merge_runs(self._runs)]
+        return self._runs[0] if self._runs else np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        """Number of unique fingerprints in the index."""
+        return sum(len(run) for run in self._runs)
+
+    def contains(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Check fingerprints against the index without adding them.
+
+        Args:
+            fingerprints: Array of uint64 fingerprints
+
+        Returns:
+            Boolean mask, True where the fingerprint is already indexed
+        """
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        found = np.zeros(len(fingerprints), dtype=bool)
+        for run in self._runs:
+            found |= _isin_sorted(fingerprints, run)
+        return found
+
+    def add(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Add fingerprints and report which of them are duplicates.
+
+        A fingerprint is a duplicate if it is already indexed or appears
+        earlier in the same batch.
+
+        Args:
+            fingerprints: Array of uint64 fingerprints
+
+        Returns:
+            Boolean mask, True where the record is a duplicate
+        """
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        # Sorted lookups walk each run front to back instead of jumping around it
+        unique, first = np.unique(fingerprints, return_index=True)
+        seen = self.contains(unique)
+        duplicates = np.ones(len(fingerprints), dtype=bool)
+        duplicates[first[~seen]] = False
+        self.duplicate_count += int(duplicates.sum())
+
+        new_keys = unique[~seen]
+        if len(new_keys):
+            self._runs.append(new_keys)
+            while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+                last = self._runs.pop()
+                self._runs[-1] = _merge_runs([self._runs[-1], last])
+        return duplicates
+
+    def add_frame(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Fingerprint a DataFrame and add its rows.
+
+        Args:
+            df: DataFrame of records
+            columns: Key columns to hash (all columns if omitted)
+
+        Returns:
+            Boolean mask, True where the record is a duplicate
+        """
+        return self.add(fingerprint_rows(df, columns))
+
+    def merge(self, other: "DuplicateIndex") -> "DuplicateIndex":
+        """
+        Merge an index built over another part of the data.
+
+        Args:
+            other: Index to merge into this one
+
+        Returns:
+            The index itself, to allow chaining
+        """
+        overlap = int(self.contains(other.keys).sum())
+        self.duplicate_count += other.duplicate_count + overlap
+        self._runs = [np.union1d(self.keys, other.keys)]
+        return self
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Persist the fingerprints as a .npy file."""
+        np.save(path, self.keys)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "DuplicateIndex":
+        """
+        Load fingerprints saved with save().
+
+        Args:
+            path: Path to the .npy file
+            mmap: Memory-map the file instead of reading it into memory
+
+        Returns:
+            DuplicateIndex over the saved fingerprints
+        """
+        return cls(np.load(path, mmap_mode="r" if mmap else None))
+
+
+class PartitionedDuplicateIndex:
+    """Fingerprint index split by leading hash bits into on-disk partitions."""
+
+    def __init__(self, directory: Union[str, Path], partition_bits: int = 8):
+        """
+        Initialize the index.
+
+        Args:
+            directory: Directory holding one sorted .npy file per partition
+            partition_bits: Number of leading fingerprint bits used to pick a partition
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.partition_bits = partition_bits
+        self.duplicate_count = 0
+
+    def _partition_path(self, partition: int) -> Path:
+        """Path of a partition file."""
+        return self.directory / f"part-{partition:05d}.npy"
+
+    def _load_partition(self, partition: int) -> np.ndarray:
+        """Memory-map a partition, or return an empty array if it does not exist."""
+        path = self._partition_path(partition)
+        if not path.exists():
+            return np.empty(0, dtype=np.uint64)
+        return np.load(path, mmap_mode="r")
+
+    def _partitions(self, fingerprints: np.ndarray) -> np.ndarray:
+        """Partition number for each fingerprint."""
+        return (fingerprints >> np.uint64(64 - self.partition_bits)).astype(np.int64)
+
+    def __len__(self) -> int:
+        """Number of unique fingerprints in the index."""
+        return sum(len(np.load(path, mmap_mode="r")) for path in self.directory.glob("part-*.npy"))
+
+    def contains(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Check fingerprints against the index without adding them.
+
+        Args:
+            fingerprints: Array of uint64 fingerprints
+
+        Returns:
+            Boolean mask, True where the fingerprint is already indexed
+        """
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        partitions = self._partitions(fingerprints)
+        found = np.zeros(len(fingerprints), dtype=bool)
+        for partition in np.unique(partitions):
+            mask = partitions == partition
+            found[mask] = _isin_sorted(fingerprints[mask], self._load_partition(int(partition)))
+        return found
+
+    def add(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Add fingerprints and report which of them are duplicates.
+
+        Only the partitions touched by the batch are read and rewritten, so
+        memory stays bounded by the batch and the largest partition.
+
+        Args:
+            fingerprints: Array of uint64 fingerprints
+
+        Returns:
+            Boolean mask, True where the record is a duplicate
+        """
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        duplicates = ~_first_occurrences(fingerprints)
+        partitions = self._partitions(fingerprints)
+
+        for partition in np.unique(partitions):
+            mask = partitions == partition
+            keys = self._load_partition(int(partition))
+            duplicates[mask] |= _isin_sorted(fingerprints[mask], keys)
+
+            new_keys = np.unique(fingerprints[mask & ~duplicates])
+            if len(new_keys):
+                merged = _merge_runs([keys, new_keys])
+                tmp_path = self._partition_path(int(partition)).with_suffix(".tmp.npy")
+                np.save(tmp_path, merged)
+                del keys
+                tmp_path.replace(self._partition_path(int(partition)))
+
+        self.duplicate_count += int(duplicates.sum())
+        return duplicates
+
+    def add_frame(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Fingerprint a DataFrame and add its rows.
+
+        Args:
+            df: DataFrame of records
+            columns: Key columns to hash (all columns if omitted)
+
+        Returns:
+            Boolean mask, True where the record is a duplicate
+        """
+        return self.add(fingerprint_rows(df, columns))
+
+
+def count_duplicates(df: pd.DataFrame, columns: Optional[List[str]] = None) -> int:
+    """
+    Count rows that duplicate an earlier row, like ``df.duplicated(subset=columns).sum()``.
+
+    Args:
+        df: DataFrame to check
+        columns: Key columns (all columns if omitted)
+
+    Returns:
+        Number of duplicate rows
+    """
+    fingerprints = fingerprint_rows(df, columns)
+    return int(len(fingerprints) - len(np.unique(fingerprints)))
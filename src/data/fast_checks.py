@@ -0,0 +1,114 @@
+"""
+Fast-path evaluation of a Pandera schema for low-cardinality columns.
+
+Text columns such as Source, Destination and Airline hold a handful of
+distinct values across millions of rows. FastSchemaCheck evaluates the
+schema's checks once per distinct value (cached across chunks) and broadcasts
+the result through the categorical codes, so the cost scales with
+cardinality rather than row count. It only answers "is this chunk valid";
+when it is not, the caller runs Pandera to build the detailed error report.
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+from pandera import Column, DataFrameSchema
+from pandera.engines import pandas_engine
+
+
+def _as_bool(result: Any) -> bool:
+    """Reduce a Pandera dtype/check result (bool or boolean Series) to a bool."""
+    if isinstance(result, (pd.Series, np.ndarray)):
+        return bool(np.all(result))
+    return bool(result)
+
+
+class FastSchemaCheck:
+    """Decides whether a DataFrame passes a schema without running Pandera."""
+
+    def __init__(self, schema: DataFrameSchema):
+        """
+        Initialize the fast path for a schema.
+
+        Args:
+            schema: Pandera schema whose column checks are evaluated
+        """
+        self.schema = schema
+        # Per-column cache of distinct value -> passes all checks
+        self._value_results: Dict[str, Dict[Any, bool]] = {name: {} for name in schema.columns}
+
+    def is_valid(self, df: pd.DataFrame) -> bool:
+        """
+        Check a DataFrame against the schema.
+
+        Args:
+            df: DataFrame to check
+
+        Returns:
+            True if the DataFrame certainly passes the schema, False if Pandera
+            should be run (the data may still turn out valid after coercion)
+        """
+        # Frame-level checks are not handled by the fast path
+        if self.schema.checks:
+            return False
+
+        for name, column in self.schema.columns.items():
+            if name not in df.columns:
+                if column.required:
+                    return False
+                continue
+            if not self._column_is_valid(name, column, df[name]):
+                return False
+        return True
+
+    def _column_is_valid(self, name: str, column: Column, series: pd.Series) -> bool:
+        """Check one column's dtype, nullability and checks."""
+        nulls = series.isna()
+        if not column.nullable and nulls.any():
+            return False
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            distinct = pd.Series(series.cat.categories)
+        elif series.dtype == object:
+            codes, uniques = pd.factorize(series)
+            distinct = pd.Series(uniques, dtype=object)
+        else:
+            return self._values_are_valid(column, series, nulls)
+
+        if column.dtype is not None and not _as_bool(
+            column.dtype.check(pandas_engine.Engine.dtype(distinct.dtype), distinct)
+        ):
+            return False
+
+        passed = self._distinct_results(name, column, distinct)
+        return not (~passed)[codes[codes >= 0]].any()
+
+    def _values_are_valid(self, column: Column, series: pd.Series, nulls: pd.Series) -> bool:
+        """Run checks row-wise on non-categorical (numeric or datetime) columns."""
+        if column.dtype is not None and not column.dtype.check(
+            pandas_engine.Engine.dtype(series.dtype)
+        ):
+            return False
+
+        for check in column.checks:
+            output = check(series).check_output
+            if check.ignore_na:
+                output = output | nulls
+            if not _as_bool(output):
+                return False
+        return True
+
+    def _distinct_results(self, name: str, column: Column, distinct: pd.Series) -> np.ndarray:
+        """Evaluate checks once per distinct value, reusing cached results."""
+        cache = self._value_results[name]
+        unseen = distinct[~distinct.isin(list(cache))] if cache else distinct
+
+        if len(unseen):
+            passed = np.ones(len(unseen), dtype=bool)
+            for check in column.checks:
+                passed &= np.asarray(check(unseen).check_output, dtype=bool)
+            cache.update(zip(unseen.tolist(), passed.tolist()))
+
+        return np.fromiter((cache[value] for value in distinct), dtype=bool, count=len(distinct))
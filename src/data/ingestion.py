@@ -4,12 +4,38 @@ Data ingestion module for downloading and validating the Flight Price Dataset.
 
 import os
 import logging
+import mmap
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Sequence
 import hashlib
 
 logger = logging.getLogger(__name__)
 
+PARQUET_ROW_GROUP_SIZE = 100_000
+
+# Large reads keep hashing disk-bound instead of syscall-bound
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# BLAKE2b is faster than SHA256 and ships with hashlib, so fingerprints are
+# identical on every machine (unlike optional non-cryptographic hashes)
+FINGERPRINT_ALGORITHM = "blake2b"
+
+
+def _cache_schema(schema: Any) -> Any:
+    """Arrow schema of the Parquet cache: every categorical as a dictionary of strings."""
+    import pyarrow as pa
+
+    fields = [
+        (
+            pa.field(field.name, pa.dictionary(pa.int32(), pa.string()))
+            if pa.types.is_dictionary(field.type)
+            else field
+        )
+        for field in schema
+    ]
+    return pa.schema(fields, metadata=schema.metadata)
+
 
 class DataIngestion:
     """Handles data download and initial validation from Kaggle."""
@@ -50,9 +76,7 @@ class DataIngestion:
                 return target_file
 
             logger.info(f"Downloading dataset: {self.dataset_name}")
-            api.dataset_download_files(
-                self.dataset_name, path=str(self.data_dir), unzip=True
-            )
+            api.dataset_download_files(self.dataset_name, path=str(self.data_dir), unzip=True)
 
             if not target_file.exists():
                 raise FileNotFoundError(
@@ -66,28 +90,250 @@ class DataIngestion:
             logger.error(f"Failed to download dataset: {str(e)}")
             raise
 
-    def calculate_file_hash(self, filepath: Path) -> str:
+    def calculate_file_hashes(
+        self,
+        filepath: Path,
+        algorithms: Sequence[str] = ("sha256", FINGERPRINT_ALGORITHM),
+        use_mmap: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Calculate several hashes of a file in a single read pass.
+
+        Args:
+            filepath: Path to the file
+            algorithms: hashlib algorithm names
+            use_mmap: Memory-map the file instead of reading it into a buffer
+
+        Returns:
+            Dictionary mapping algorithm name to hex digest
+        """
+        hashers = {name: hashlib.new(name) for name in algorithms}
+
+        with open(filepath, "rb") as f:
+            if use_mmap and os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    for start in range(0, len(view), HASH_BUFFER_SIZE):
+                        block = view[start : start + HASH_BUFFER_SIZE]
+                        for hasher in hashers.values():
+                            hasher.update(block)
+                    block.release()
+                    view.release()
+            else:
+                buffer = bytearray(HASH_BUFFER_SIZE)
+                view = memoryview(buffer)
+                while size := f.readinto(buffer):
+                    for hasher in hashers.values():
+                        hasher.update(view[:size])
+
+        return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+    def calculate_file_hash(
+        self, filepath: Path, algorithm: str = "sha256", use_mmap: bool = False
+    ) -> str:
         """
         Calculate SHA256 hash of a file for integrity checking.
 
         Args:
             filepath: Path to the file
+            algorithm: hashlib algorithm name (SHA256 by default)
+            use_mmap: Memory-map the file instead of reading it into a buffer
 
         Returns:
             Hex string of the file hash
         """
-        sha256_hash = hashlib.sha256()
-        with open(filepath, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        return self.calculate_file_hashes(filepath, (algorithm,), use_mmap)[algorithm]
+
+    def hash_file_async(
+        self, filepath: Path, algorithms: Sequence[str] = ("sha256", FINGERPRINT_ALGORITHM)
+    ) -> "Future[Dict[str, str]]":
+        """
+        Hash a file in a background thread.
+
+        hashlib releases the GIL on large buffers, so hashing overlaps with
+        other work such as parsing the CSV for the Parquet cache.
+
+        Args:
+            filepath: Path to the file
+            algorithms: hashlib algorithm names
+
+        Returns:
+            Future resolving to a dictionary of hex digests
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-hash")
+        future = executor.submit(self.calculate_file_hashes, filepath, algorithms)
+        executor.shutdown(wait=False)
+        return future
+
+    def get_parquet_cache_path(self, filepath: Path, file_hash: str) -> Path:
+        """
+        Build the Parquet cache path for a raw CSV, keyed by its content hash.
+
+        Args:
+            filepath: Path to the raw CSV file
+            file_hash: SHA256 hash of the raw CSV file
+
+        Returns:
+            Path of the Parquet copy stored next to the CSV
+        """
+        return filepath.parent / f"{filepath.stem}.{file_hash[:16]}.parquet"
 
-    def validate_file(self, filepath: Path) -> dict:
+    def write_parquet_cache(
+        self, filepath: Path, file_hash: Optional[str] = None
+    ) -> Optional[Path]:
+        """
+        Write a typed, compressed Parquet copy of the raw CSV.
+
+        The copy is keyed by the SHA256 of the CSV so that a changed raw file
+        never serves stale data. Stale copies of the same CSV are removed.
+        The CSV is converted one row group at a time, so memory stays bounded,
+        and values that cannot be parsed are stored as nulls for validation to
+        report instead of aborting the conversion.
+
+        Args:
+            filepath: Path to the raw CSV file
+            file_hash: Precomputed SHA256 hash of the file. If omitted, the hash
+                is computed in a background thread while the CSV is converted.
+
+        Returns:
+            Path to the Parquet cache, or None if pyarrow is not installed
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            logger.warning("pyarrow is not installed, skipping Parquet cache")
+            return None
+
+        if file_hash is not None:
+            cache_path = self.get_parquet_cache_path(filepath, file_hash)
+            if cache_path.exists():
+                logger.info(f"Parquet cache already exists at {cache_path}")
+                return cache_path
+            hash_future = None
+        else:
+            hash_future = self.hash_file_async(filepath, ("sha256",))
+
+        from src.data.loader import csv_partition
+
+        # Write to a temporary file first so readers never see a partial cache
+        tmp_path = filepath.with_name(f"{filepath.stem}.{os.getpid()}.parquet.tmp")
+        self._write_csv_rows(filepath, tmp_path, csv_partition(filepath))
+
+        if hash_future is not None:
+            cache_path = self.get_parquet_cache_path(filepath, hash_future.result()["sha256"])
+        self._publish_parquet_cache(filepath, tmp_path, cache_path)
+        return cache_path
+
+    def append_parquet_cache(
+        self, filepath: Path, previous_hash: str, file_hash: str, start: int
+    ) -> Optional[Path]:
+        """
+        Extend the Parquet cache of a CSV that was appended to.
+
+        Row groups of the previous cache are copied as they are and only the
+        CSV bytes from ``start`` onwards are parsed. Falls back to a full
+        rewrite if the previous cache is missing.
+
+        Args:
+            filepath: Path to the raw CSV file
+            previous_hash: SHA256 hash of the CSV before rows were appended
+            file_hash: SHA256 hash of the current CSV
+            start: Byte offset where the appended rows begin
+
+        Returns:
+            Path to the Parquet cache, or None if pyarrow is not installed
+        """
+        previous_path = self.get_parquet_cache_path(filepath, previous_hash)
+        cache_path = self.get_parquet_cache_path(filepath, file_hash)
+        if cache_path.exists() or not previous_path.exists():
+            return self.write_parquet_cache(filepath, file_hash)
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        from src.data.loader import csv_partition
+
+        tmp_path = filepath.with_name(f"{filepath.stem}.{os.getpid()}.parquet.tmp")
+        previous = pq.ParquetFile(previous_path)
+        try:
+            self._write_csv_rows(
+                filepath, tmp_path, csv_partition(filepath, start), previous=previous
+            )
+        except pa.ArrowInvalid:
+            # Appended values do not fit the previous cache's column types
+            tmp_path.unlink(missing_ok=True)
+            return self.write_parquet_cache(filepath, file_hash)
+
+        self._publish_parquet_cache(filepath, tmp_path, cache_path)
+        return cache_path
+
+    @staticmethod
+    def _write_csv_rows(
+        filepath: Path,
+        tmp_path: Path,
+        partition: Dict[str, Any],
+        previous: Optional[Any] = None,
+    ) -> None:
+        """
+        Convert CSV rows to Parquet one row group at a time.
+
+        Args:
+            filepath: Path to the raw CSV file
+            tmp_path: Parquet file to write
+            partition: Byte range of the CSV rows to convert
+            previous: ParquetFile whose row groups are copied first (and whose
+                schema the new rows are cast to)
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        from src.data.loader import iter_partition_chunks, read_flight_csv
+
+        schema = writer = None
+        try:
+            if previous is not None:
+                schema = previous.schema_arrow
+                writer = pq.ParquetWriter(tmp_path, schema, compression="zstd")
+                for row_group in range(previous.num_row_groups):
+                    writer.write_table(previous.read_row_group(row_group))
+
+            chunks = iter_partition_chunks(
+                partition, chunksize=PARQUET_ROW_GROUP_SIZE, errors="coerce", compact=False
+            )
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    # Categorical columns are written with Parquet dictionary encoding, and
+                    # moderate row groups let readers split the file across worker processes
+                    schema = _cache_schema(table.schema)
+                    writer = pq.ParquetWriter(tmp_path, schema, compression="zstd")
+                writer.write_table(table.select(schema.names).cast(schema))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            # No rows: keep the columns and types of the header
+            empty = read_flight_csv(filepath, nrows=0, errors="coerce", compact=False)
+            empty.to_parquet(tmp_path, engine="pyarrow", index=False)
+
+    def _publish_parquet_cache(self, filepath: Path, tmp_path: Path, cache_path: Path) -> None:
+        """Move a finished cache into place and remove stale copies of the same CSV."""
+        tmp_path.replace(cache_path)
+
+        for stale_cache in filepath.parent.glob(f"{filepath.stem}.*.parquet"):
+            if stale_cache != cache_path:
+                stale_cache.unlink()
+
+        logger.info(f"Parquet cache written to {cache_path}")
+
+    def validate_file(self, filepath: Path, file_hashes: Optional[Dict[str, str]] = None) -> dict:
         """
         Perform basic validation on the downloaded file.
 
         Args:
             filepath: Path to the file to validate
+            file_hashes: Precomputed SHA256 and fingerprint hashes (computed if omitted)
 
         Returns:
             Dictionary with validation results
@@ -96,6 +342,7 @@ class DataIngestion:
             "file_exists": filepath.exists(),
             "file_size_mb": 0.0,
             "file_hash": None,
+            "file_fingerprint": None,
             "is_readable": False,
         }
 
@@ -108,8 +355,10 @@ class DataIngestion:
         validation_results["file_size_mb"] = round(file_size / (1024 * 1024), 2)
         logger.info(f"File size: {validation_results['file_size_mb']} MB")
 
-        # File hash
-        validation_results["file_hash"] = self.calculate_file_hash(filepath)
+        # File hash (SHA256 for integrity) and fast fingerprint, in one read pass
+        hashes = file_hashes or self.calculate_file_hashes(filepath)
+        validation_results["file_hash"] = hashes["sha256"]
+        validation_results["file_fingerprint"] = hashes[FINGERPRINT_ALGORITHM]
         logger.info(f"File hash: {validation_results['file_hash']}")
 
         # Check if file is readable
@@ -131,17 +380,55 @@ class DataIngestion:
         Returns:
             Path to the validated data file
         """
+        from src.data.manifest import RawDataManifest, scan_file
+
         logger.info("Starting data ingestion pipeline...")
 
         # Download data
         data_path = self.download_from_kaggle()
 
+        # Compare against the manifest; unchanged files are not re-read
+        manifest = RawDataManifest(self.data_dir)
+        change = manifest.check(data_path)
+        previous = change["entry"]
+
+        if (
+            change["status"] == "unchanged"
+            and self.get_parquet_cache_path(data_path, previous["sha256"]).exists()
+        ):
+            if change["scan"] is not None:
+                # Touched but not modified: refresh the mtime so the next run skips hashing
+                manifest.record(data_path, change["scan"], previous["validation"])
+            logger.info(f"No changes to {data_path} since {previous['ingested_at']}")
+            return data_path
+
+        # An unchanged file only gets here when its Parquet cache is missing
+        scan = change["scan"] or scan_file(data_path)
+        logger.info(f"Raw file status: {change['status']} ({scan['row_count']:,} rows)")
+
         # Validate data
-        validation_results = self.validate_file(data_path)
+        validation_results = self.validate_file(
+            data_path, {"sha256": scan["sha256"], FINGERPRINT_ALGORITHM: scan["fingerprint"]}
+        )
 
         if not validation_results["is_readable"]:
             raise ValueError("Downloaded file failed validation")
 
+        # Cache a columnar copy so downstream loaders skip CSV parsing
+        if change["status"] == "appended":
+            self.append_parquet_cache(
+                data_path, previous["sha256"], scan["sha256"], start=previous["size"]
+            )
+        else:
+            self.write_parquet_cache(data_path, scan["sha256"])
+
+        manifest.record(
+            data_path,
+            scan,
+            validation_results,
+            appended_to=previous if change["status"] == "appended" else None,
+        )
+
         logger.info("Data ingestion completed successfully")
         logger.info(f"Data location: {data_path}")
         logger.info(f"Validation results: {validation_results}")
@@ -0,0 +1,497 @@
+"""
+Shared data loading utilities for the Flight Price Dataset.
+
+The dataset schema (dtypes and datetime format) is declared once here and used
+by every loader, the Parquet cache and the validator.
+
+Numeric columns are parsed as float64/int64 and only then downcast to the
+compact in-memory dtypes. The Parquet cache and validation keep the parsed
+(lossless) values, so range checks see exactly what the CSV says: float32
+can round a value onto a bound (999999.99 becomes 1e6) and an integer
+downcast that does not round-trip is refused instead of wrapping.
+"""
+
+import io
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.ingestion import DataIngestion
+from src.data.manifest import current_file_hash
+
+logger = logging.getLogger(__name__)
+
+# Low-cardinality text columns, stored as pandas categoricals
+CATEGORICAL_COLUMNS = [
+    "Airline",
+    "Source",
+    "Source Name",
+    "Destination",
+    "Destination Name",
+    "Stopovers",
+    "Aircraft Type",
+    "Class",
+    "Booking Source",
+    "Seasonality",
+]
+
+NUMERIC_DTYPES: Dict[str, str] = {
+    "Duration (hrs)": "float32",
+    "Base Fare (BDT)": "float32",
+    "Tax & Surcharge (BDT)": "float32",
+    "Total Fare (BDT)": "float32",
+    "Days Before Departure": "int16",
+}
+
+# Lossless dtypes the CSV is parsed into, kept by the Parquet cache and validation
+RAW_NUMERIC_DTYPES: Dict[str, str] = {
+    col: "int64" if dtype.startswith("int") else "float64" for col, dtype in NUMERIC_DTYPES.items()
+}
+
+DATETIME_COLUMNS = ["Departure Date & Time", "Arrival Date & Time"]
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+COLUMN_DTYPES: Dict[str, str] = {
+    **{col: "category" for col in CATEGORICAL_COLUMNS},
+    **NUMERIC_DTYPES,
+}
+
+RAW_COLUMN_DTYPES: Dict[str, str] = {
+    **{col: "category" for col in CATEGORICAL_COLUMNS},
+    **RAW_NUMERIC_DTYPES,
+}
+
+# Bytes read from disk at a time when streaming a CSV byte range
+CSV_RANGE_BUFFER = 1 << 20
+
+
+def _cast_numeric(series: pd.Series, dtype: str) -> pd.Series:
+    """Cast a numeric column, raising if an integer cast would wrap or truncate a value."""
+    if not np.issubdtype(np.dtype(dtype), np.integer):
+        return series.astype(dtype)
+    values = pd.to_numeric(series)
+    cast = values.astype(dtype)
+    if not (cast == values).all():
+        raise ValueError(f"{series.name} has values that do not fit {dtype}")
+    return cast
+
+
+def _coerce_numeric(series: pd.Series, dtype: str) -> pd.Series:
+    """Cast a numeric column, turning values that cannot be parsed into NaN."""
+    values = pd.to_numeric(series, errors="coerce")
+    if not np.issubdtype(np.dtype(dtype), np.integer):
+        return values.astype(dtype)
+    values = values.mask(values % 1 != 0)
+    # Integer columns with nulls stay float64, and values too large for dtype stay int64
+    if values.isna().any():
+        return values
+    info = np.iinfo(dtype)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        return values.astype(np.int64)
+    return values.astype(dtype)
+
+
+def apply_flight_dtypes(
+    df: pd.DataFrame, errors: str = "raise", compact: bool = True
+) -> pd.DataFrame:
+    """
+    Cast a flight DataFrame to the dataset schema.
+
+    Columns that already have the expected dtype are left untouched, so this
+    is cheap on frames read through the typed loader.
+
+    Args:
+        df: DataFrame with any subset of the dataset columns
+        errors: "raise" to fail on malformed values, "coerce" to turn them into
+            nulls (NaN/NaT) for reporting, or "ignore" to leave columns that
+            cannot be cast as read (so a validator can report them)
+        compact: Downcast numeric columns to float32/int16; False keeps the
+            lossless float64/int64 values (for validation and the Parquet cache)
+
+    Returns:
+        DataFrame with categorical, numeric and datetime64 columns
+    """
+    column_dtypes = COLUMN_DTYPES if compact else RAW_COLUMN_DTYPES
+    casts = {
+        col: dtype
+        for col, dtype in column_dtypes.items()
+        if col in df.columns and str(df[col].dtype) != dtype
+    }
+    dates = [
+        col
+        for col in DATETIME_COLUMNS
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col])
+    ]
+    # Parquet files extended with appended rows list new categories last
+    unsorted = [
+        col
+        for col in CATEGORICAL_COLUMNS
+        if col in df.columns
+        and col not in casts
+        and not df[col].cat.categories.is_monotonic_increasing
+    ]
+    if not casts and not dates and not unsorted:
+        return df
+
+    df = df.copy(deep=False)
+    for col in unsorted:
+        df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+    for col, dtype in casts.items():
+        try:
+            df[col] = (
+                df[col].astype(dtype) if dtype == "category" else _cast_numeric(df[col], dtype)
+            )
+        except (TypeError, ValueError):
+            if errors == "raise":
+                raise
+            if errors == "coerce":
+                df[col] = _coerce_numeric(df[col], dtype)
+
+    for col in dates:
+        try:
+            df[col] = pd.to_datetime(df[col], format=DATETIME_FORMAT)
+        except (TypeError, ValueError):
+            if errors == "raise":
+                raise
+            if errors == "coerce":
+                df[col] = pd.to_datetime(df[col], format=DATETIME_FORMAT, errors="coerce")
+
+    return df
+
+
+def _csv_dtypes(errors: str) -> Dict[str, str]:
+    """Dtypes to pass to read_csv, leaving numeric parsing to pandas when lenient."""
+    if errors == "raise":
+        # Parse wide; apply_flight_dtypes downcasts only values that round-trip
+        return RAW_COLUMN_DTYPES
+    return {col: "category" for col in CATEGORICAL_COLUMNS}
+
+
+def read_flight_csv(
+    filepath: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    errors: str = "raise",
+    compact: bool = True,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Parse the raw CSV with explicit dtypes and a fixed datetime format.
+
+    Args:
+        filepath: Path to the CSV file
+        columns: Optional subset of columns to read
+        errors: "raise", "coerce" or "ignore", see apply_flight_dtypes
+        compact: Downcast numeric columns, see apply_flight_dtypes
+        **kwargs: Extra keyword arguments passed to pd.read_csv
+
+    Returns:
+        Typed DataFrame containing flight data
+    """
+    df = pd.read_csv(filepath, usecols=columns, dtype=_csv_dtypes(errors), **kwargs)
+    return apply_flight_dtypes(df, errors=errors, compact=compact)
+
+
+def find_parquet_cache(filepath: Path) -> Optional[Path]:
+    """
+    Locate the Parquet cache written by DataIngestion for a raw CSV.
+
+    Args:
+        filepath: Path to the raw CSV file
+
+    Returns:
+        Path to the matching Parquet cache, or None if there is no up-to-date copy
+    """
+    # Avoid hashing the CSV when no cache was ever written for it
+    if not any(filepath.parent.glob(f"{filepath.stem}.*.parquet")):
+        return None
+
+    ingestion = DataIngestion(data_dir=str(filepath.parent))
+    cache_path = ingestion.get_parquet_cache_path(filepath, current_file_hash(filepath))
+    return cache_path if cache_path.exists() else None
+
+
+def resolve_data_path(filepath: Union[str, Path]) -> Path:
+    """
+    Return the file a loader should read: the Parquet cache of a CSV if present.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+
+    Returns:
+        Path to the Parquet cache, or the original path
+    """
+    path = Path(filepath)
+    if path.suffix == ".parquet":
+        return path
+
+    cache_path = find_parquet_cache(path)
+    if cache_path is not None:
+        logger.info(f"Reading Parquet cache {cache_path}")
+        return cache_path
+    return path
+
+
+def load_raw_data(
+    filepath: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    errors: str = "raise",
+    compact: bool = True,
+) -> pd.DataFrame:
+    """
+    Load the raw flight data, reading the Parquet cache when it exists.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        columns: Optional subset of columns to read
+        errors: "raise", "coerce" or "ignore", see apply_flight_dtypes
+        compact: Downcast numeric columns, see apply_flight_dtypes
+
+    Returns:
+        Typed DataFrame containing flight data
+    """
+    path = resolve_data_path(filepath)
+
+    if path.suffix == ".parquet":
+        return apply_flight_dtypes(
+            pd.read_parquet(path, columns=columns), errors=errors, compact=compact
+        )
+
+    return read_flight_csv(path, columns=columns, errors=errors, compact=compact)
+
+
+def iter_flight_chunks(
+    filepath: Union[str, Path],
+    chunksize: int = 100_000,
+    columns: Optional[List[str]] = None,
+    errors: str = "raise",
+    compact: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream the flight data as typed DataFrame chunks.
+
+    Chunks keep the row positions of the full file as their index. CSV input
+    is read from its Parquet cache when one exists.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        chunksize: Number of rows per chunk
+        columns: Optional subset of columns to read
+        errors: "raise", "coerce" or "ignore", see apply_flight_dtypes
+        compact: Downcast numeric columns, see apply_flight_dtypes
+
+    Yields:
+        Typed DataFrame chunks
+    """
+    path = resolve_data_path(filepath)
+
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        offset = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield apply_flight_dtypes(chunk, errors=errors, compact=compact)
+        return
+
+    reader = pd.read_csv(path, usecols=columns, dtype=_csv_dtypes(errors), chunksize=chunksize)
+    for chunk in reader:
+        yield apply_flight_dtypes(chunk, errors=errors, compact=compact)
+
+
+def plan_partitions(filepath: Union[str, Path], num_partitions: int) -> List[Dict[str, Any]]:
+    """
+    Split a data file into independently readable partitions.
+
+    Parquet files are split into contiguous row-group ranges. CSV files are
+    split into byte ranges aligned to line boundaries, which assumes no
+    quoted field contains a newline (true for the Kaggle export).
+
+    Args:
+        filepath: Path to the CSV or Parquet file (CSV input uses its Parquet cache if present)
+        num_partitions: Desired number of partitions
+
+    Returns:
+        List of partition descriptors in file order, for iter_partition_chunks
+    """
+    path = resolve_data_path(filepath)
+
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        num_row_groups = pq.ParquetFile(path).num_row_groups
+        bounds = [round(i * num_row_groups / num_partitions) for i in range(num_partitions + 1)]
+        groups = [list(range(lo, hi)) for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+        return [{"path": str(path), "format": "parquet", "row_groups": g} for g in groups]
+
+    file_size = path.stat().st_size
+    partitions = []
+    with open(path, "rb") as f:
+        header = f.readline()
+        start = f.tell()
+        for i in range(1, num_partitions + 1):
+            if i == num_partitions:
+                end = file_size
+            else:
+                f.seek(max(start, round(i * file_size / num_partitions)))
+                f.readline()  # Move to the start of the next line
+                end = min(f.tell(), file_size)
+            if end > start:
+                partitions.append(
+                    {
+                        "path": str(path),
+                        "format": "csv",
+                        "header": header,
+                        "start": start,
+                        "end": end,
+                    }
+                )
+            start = end
+    return partitions
+
+
+def csv_partition(filepath: Union[str, Path], start: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Partition descriptor covering a CSV's rows from a byte offset to the end.
+
+    Used to read only the rows appended to a file since a known size.
+
+    Args:
+        filepath: Path to the CSV file
+        start: Byte offset of the first row (the row after the header if omitted)
+
+    Returns:
+        Partition descriptor for iter_partition_chunks
+    """
+    path = Path(filepath)
+    with open(path, "rb") as f:
+        header = f.readline()
+    return {
+        "path": str(path),
+        "format": "csv",
+        "header": header,
+        "start": len(header) if start is None else start,
+        "end": path.stat().st_size,
+    }
+
+
+def partition_rows(partition: Dict[str, Any]) -> int:
+    """
+    Count the data rows of a partition without parsing it.
+
+    Parquet row counts come from the file metadata; CSV rows are counted as
+    the newlines in the partition's byte range.
+
+    Args:
+        partition: Partition descriptor from plan_partitions
+
+    Returns:
+        Number of data rows
+    """
+    if partition["format"] == "parquet":
+        import pyarrow.parquet as pq
+
+        metadata = pq.ParquetFile(partition["path"]).metadata
+        return sum(metadata.row_group(i).num_rows for i in partition["row_groups"])
+
+    rows, last = 0, b"\n"
+    with open(partition["path"], "rb") as f:
+        f.seek(partition["start"])
+        remaining = partition["end"] - partition["start"]
+        while remaining > 0:
+            block = f.read(min(remaining, 1 << 24))
+            rows += block.count(b"\n")
+            remaining -= len(block)
+            last = block[-1:]
+    # A final line without a trailing newline is still a row
+    return rows + (last != b"\n")
+
+
+class _CsvRange(io.RawIOBase):
+    """
+    Read-only stream of a CSV byte range with the file's header in front.
+
+    The range is read from disk as the parser asks for it, so memory stays
+    bounded by the parser's chunk rather than the size of the range.
+    """
+
+    def __init__(self, partition: Dict[str, Any]):
+        """
+        Open a CSV partition.
+
+        Args:
+            partition: CSV partition descriptor (path, header, start, end)
+        """
+        super().__init__()
+        self._header = memoryview(partition["header"])
+        self._file = open(partition["path"], "rb")
+        self._file.seek(partition["start"])
+        self._remaining = partition["end"] - partition["start"]
+
+    def readable(self) -> bool:
+        """The stream is readable."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Fill ``buffer`` with the next bytes of the header, then of the range."""
+        view = memoryview(buffer).cast("B")
+        if len(self._header):
+            size = min(len(view), len(self._header))
+            view[:size] = self._header[:size]
+            self._header = self._header[size:]
+            return size
+        size = self._file.readinto(view[: min(len(view), self._remaining)])
+        self._remaining -= size
+        return size
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def iter_partition_chunks(
+    partition: Dict[str, Any],
+    chunksize: int = 100_000,
+    errors: str = "raise",
+    compact: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream one partition from plan_partitions as typed DataFrame chunks.
+
+    Chunk indices are row positions within the partition, starting at 0.
+
+    Args:
+        partition: Partition descriptor
+        chunksize: Number of rows per chunk
+        errors: "raise", "coerce" or "ignore", see apply_flight_dtypes
+        compact: Downcast numeric columns, see apply_flight_dtypes
+
+    Yields:
+        Typed DataFrame chunks
+    """
+    if partition["format"] == "parquet":
+        import pyarrow.parquet as pq
+
+        offset = 0
+        parquet_file = pq.ParquetFile(partition["path"])
+        for batch in parquet_file.iter_batches(
+            batch_size=chunksize, row_groups=partition["row_groups"]
+        ):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield apply_flight_dtypes(chunk, errors=errors, compact=compact)
+        return
+
+    with _CsvRange(partition) as f:
+        reader = pd.read_csv(
+            io.BufferedReader(f, CSV_RANGE_BUFFER), dtype=_csv_dtypes(errors), chunksize=chunksize
+        )
+        for chunk in reader:
+            yield apply_flight_dtypes(chunk, errors=errors, compact=compact)
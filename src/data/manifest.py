@@ -0,0 +1,348 @@
+"""
+Content-addressed manifest of ingested raw data files.
+
+The manifest (``manifest.json`` next to the raw files) records, per file, its
+size, mtime, SHA256 hash, BLAKE2b fingerprint, row count, schema fingerprint
+and ingestion validation result. Scheduled ingestion runs compare the file
+against its entry first:
+
+- unchanged: size and mtime match, nothing is re-hashed or re-processed
+- appended: the old content is an exact prefix of the file, so only the new
+  rows need to be processed
+- changed or new: the file is processed from scratch
+
+Downstream steps (validation, summaries) can cache their results on the entry
+with set_result(); results are dropped as soon as the file content changes.
+They can also save their mergeable accumulator state with save_state(): when
+a file was appended to, load_state() returns the state of the previous
+content and the byte offset of the new rows, so only those rows are
+processed and folded in.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from src.data.ingestion import FINGERPRINT_ALGORITHM, HASH_BUFFER_SIZE, DataIngestion
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+# Pickled accumulator states of downstream steps, next to the manifest
+STATE_DIRNAME = ".state"
+
+
+def _json_default(value: Any) -> Any:
+    """Convert numpy scalars, timestamps and other objects for JSON output."""
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def schema_fingerprint(header: bytes) -> str:
+    """
+    Fingerprint a CSV header line, so column changes are detected.
+
+    Args:
+        header: Raw header line of the CSV file
+
+    Returns:
+        Hex digest of the header
+    """
+    return hashlib.blake2b(header.strip(), digest_size=8).hexdigest()
+
+
+def scan_file(filepath: Path, prefix_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Hash a file and count its rows in a single read pass.
+
+    Args:
+        filepath: Path to the CSV file
+        prefix_size: If given, also hash the first ``prefix_size`` bytes, to
+            check whether a previously seen file was only appended to
+
+    Returns:
+        Dictionary with sha256, fingerprint, prefix_sha256 (or None), row_count,
+        ends_with_newline and schema_fingerprint
+    """
+    sha256 = hashlib.sha256()
+    fingerprint = hashlib.new(FINGERPRINT_ALGORITHM)
+    prefix_sha256 = None
+    newlines = 0
+    position = 0
+    last_byte = None
+
+    buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(filepath, "rb") as f:
+        header = f.readline()
+        f.seek(0)
+        while size := f.readinto(buffer):
+            if prefix_size is not None and prefix_sha256 is None and position + size >= prefix_size:
+                cut = prefix_size - position
+                sha256.update(view[:cut])
+                prefix_sha256 = sha256.copy().hexdigest()
+                sha256.update(view[cut:size])
+            else:
+                sha256.update(view[:size])
+            fingerprint.update(view[:size])
+            newlines += buffer.count(b"\n", 0, size)
+            last_byte = buffer[size - 1]
+            position += size
+
+    ends_with_newline = last_byte == ord("\n")
+    # One line per row plus the header; the last row may lack a trailing newline
+    lines = newlines + (0 if ends_with_newline or last_byte is None else 1)
+
+    return {
+        "sha256": sha256.hexdigest(),
+        "fingerprint": fingerprint.hexdigest(),
+        "prefix_sha256": prefix_sha256,
+        "row_count": max(lines - 1, 0),
+        "ends_with_newline": ends_with_newline,
+        "schema_fingerprint": schema_fingerprint(header),
+    }
+
+
+class RawDataManifest:
+    """JSON manifest of raw data files, keyed by file name."""
+
+    def __init__(self, data_dir: Union[str, Path] = "data/01-raw"):
+        """
+        Load the manifest, or start an empty one.
+
+        Args:
+            data_dir: Directory holding the raw files and the manifest
+        """
+        self.path = Path(data_dir) / MANIFEST_FILENAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f).get("files", {})
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"files": self.entries}, f, indent=2, default=_json_default)
+        tmp_path.replace(self.path)
+
+    def get(self, filepath: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        """Manifest entry for a file, or None if it was never ingested."""
+        return self.entries.get(Path(filepath).name)
+
+    def is_current(self, filepath: Union[str, Path]) -> bool:
+        """
+        Check whether a file still matches its entry, using only its size and mtime.
+
+        Args:
+            filepath: Path to the raw file
+
+        Returns:
+            True if the file has an entry and looks unchanged since it was recorded
+        """
+        entry = self.get(filepath)
+        if entry is None or not Path(filepath).exists():
+            return False
+        stat = os.stat(filepath)
+        return entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+
+    def check(self, filepath: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Compare a file against its entry.
+
+        Files whose size and mtime match are reported unchanged without being
+        read. Otherwise the file is hashed once, which also tells whether the
+        previous content is a prefix of the new content.
+
+        Args:
+            filepath: Path to the raw file
+
+        Returns:
+            Dictionary with "status" ("unchanged", "appended", "changed" or
+            "new"), the previous "entry" and, if the file was read, its "scan"
+            (see scan_file)
+        """
+        filepath = Path(filepath)
+        entry = self.get(filepath)
+        if self.is_current(filepath):
+            return {"status": "unchanged", "entry": entry, "scan": None}
+
+        size = filepath.stat().st_size
+        grown = entry is not None and size > entry["size"] and entry["ends_with_newline"]
+        scan = scan_file(filepath, prefix_size=entry["size"] if grown else None)
+
+        if entry is None:
+            status = "new"
+        elif scan["sha256"] == entry["sha256"]:
+            # Touched but not modified
+            status = "unchanged"
+        elif grown and scan["prefix_sha256"] == entry["sha256"]:
+            status = "appended"
+        else:
+            status = "changed"
+
+        return {"status": status, "entry": entry, "scan": scan}
+
+    def record(
+        self,
+        filepath: Union[str, Path],
+        scan: Dict[str, Any],
+        validation: Optional[Dict[str, Any]] = None,
+        appended_to: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Record a file after ingestion and save the manifest.
+
+        Cached results are kept if the content hash is unchanged and dropped
+        otherwise.
+
+        Args:
+            filepath: Path to the raw file
+            scan: Result of scan_file for the current content
+            validation: Ingestion validation result for the file
+            appended_to: Previous entry, if the file was appended to; its hash
+                and size let load_state() resume from the previous content
+
+        Returns:
+            The new manifest entry
+        """
+        filepath = Path(filepath)
+        stat = filepath.stat()
+        previous = self.get(filepath) or {}
+
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": scan["sha256"],
+            "fingerprint": scan["fingerprint"],
+            "row_count": scan["row_count"],
+            "ends_with_newline": scan["ends_with_newline"],
+            "schema_fingerprint": scan["schema_fingerprint"],
+            "validation": validation,
+            "ingested_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": (
+                previous.get("results", {}) if previous.get("sha256") == scan["sha256"] else {}
+            ),
+        }
+        if appended_to is not None:
+            entry["appended_to"] = {"sha256": appended_to["sha256"], "size": appended_to["size"]}
+        elif previous.get("sha256") == scan["sha256"] and "appended_to" in previous:
+            entry["appended_to"] = previous["appended_to"]
+        self.entries[filepath.name] = entry
+        self.save()
+        return entry
+
+    def get_result(self, filepath: Union[str, Path], name: str) -> Optional[Any]:
+        """
+        Cached downstream result for the file's current content.
+
+        Args:
+            filepath: Path to the raw file
+            name: Result name, e.g. "validation"
+
+        Returns:
+            The cached result, or None if missing or the file has changed
+        """
+        if not self.is_current(filepath):
+            return None
+        return self.get(filepath)["results"].get(name)
+
+    def set_result(self, filepath: Union[str, Path], name: str, result: Any) -> None:
+        """
+        Cache a downstream result for the file's current content and save.
+
+        Results are stored as JSON, so numpy scalars and timestamps come back
+        as plain numbers and ISO strings.
+
+        Args:
+            filepath: Path to the raw file
+            name: Result name, e.g. "validation"
+            result: JSON-serializable result
+        """
+        if not self.is_current(filepath):
+            logger.warning(f"{filepath} is not recorded in the manifest, not caching {name}")
+            return
+        self.get(filepath)["results"][name] = json.loads(json.dumps(result, default=_json_default))
+        self.save()
+
+    def _state_path(self, filepath: Union[str, Path], name: str, sha256: str) -> Path:
+        """Path of a saved state for one content hash of a file."""
+        return self.path.parent / STATE_DIRNAME / f"{Path(filepath).name}.{sha256[:16]}.{name}.pkl"
+
+    def save_state(self, filepath: Union[str, Path], name: str, state: Any) -> None:
+        """
+        Save the accumulator state of a downstream step for the file's current content.
+
+        States of older contents of the same file are removed.
+
+        Args:
+            filepath: Path to the raw file
+            name: State name, e.g. "validation"
+            state: Picklable state covering every row of the current content
+        """
+        if not self.is_current(filepath):
+            logger.warning(f"{filepath} is not recorded in the manifest, not saving {name} state")
+            return
+        path = self._state_path(filepath, name, self.get(filepath)["sha256"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".pkl.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+
+        for stale in path.parent.glob(f"{Path(filepath).name}.*.{name}.pkl"):
+            if stale != path:
+                stale.unlink()
+
+    def load_state(self, filepath: Union[str, Path], name: str) -> Optional[Tuple[Any, int]]:
+        """
+        Saved accumulator state to resume a downstream step from.
+
+        Args:
+            filepath: Path to the raw file
+            name: State name, e.g. "validation"
+
+        Returns:
+            The state and the byte offset of the first row it does not cover
+            (the file size if it covers the current content), or None if the
+            step has to start over
+        """
+        if not self.is_current(filepath):
+            return None
+        entry = self.get(filepath)
+        candidates = [(entry["sha256"], entry["size"])]
+        if "appended_to" in entry:
+            candidates.append((entry["appended_to"]["sha256"], entry["appended_to"]["size"]))
+
+        for sha256, size in candidates:
+            path = self._state_path(filepath, name, sha256)
+            if path.exists():
+                with open(path, "rb") as f:
+                    return pickle.load(f), size
+        return None
+
+
+def current_file_hash(filepath: Union[str, Path]) -> str:
+    """
+    SHA256 of a raw file, read from the manifest while the file is unchanged.
+
+    Args:
+        filepath: Path to the raw file
+
+    Returns:
+        Hex SHA256 digest of the file
+    """
+    filepath = Path(filepath)
+    manifest = RawDataManifest(filepath.parent)
+    if manifest.is_current(filepath):
+        return manifest.get(filepath)["sha256"]
+    return DataIngestion(data_dir=str(filepath.parent)).calculate_file_hash(filepath)
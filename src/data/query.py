@@ -0,0 +1,279 @@
+"""
+Lazy query layer over the flight dataset.
+
+A FlightQuery describes which columns and rows are wanted without reading
+anything. Columns and filters are pushed down to the reader when the query is
+collected:
+
+- Parquet (or a CSV with a Parquet cache): only the referenced columns are
+  read, and row groups whose statistics rule out the filters are skipped
+- CSV: only the referenced columns are parsed, chunk by chunk, and each
+  chunk is filtered before the next is read
+
+Notebook helpers accept a FlightQuery wherever they take a DataFrame and
+collect just the columns they use (see as_frame).
+"""
+
+import logging
+import operator
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from src.data.loader import (
+    DATETIME_COLUMNS,
+    NUMERIC_DTYPES,
+    apply_flight_dtypes,
+    iter_flight_chunks,
+    resolve_data_path,
+)
+
+logger = logging.getLogger(__name__)
+
+# Filter operators, named like pyarrow.parquet filters
+FILTER_OPERATORS: Dict[str, Callable[[pd.Series, Any], pd.Series]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda column, values: column.isin(values),
+    "not in": lambda column, values: ~column.isin(values),
+}
+
+Filter = Tuple[str, str, Any]
+
+
+def _filter_value(column: str, op: str, value: Any) -> Any:
+    """
+    Convert a filter value to the type of its column.
+
+    Parquet filters compare typed values, so e.g. a date given as a string
+    must become a Timestamp before it is pushed down.
+
+    Args:
+        column: Filtered column
+        op: Operator from FILTER_OPERATORS
+        value: Value (or values for "in" / "not in") as given
+
+    Returns:
+        Value (or list of values) of the column's type
+    """
+    if column in DATETIME_COLUMNS:
+        convert: Callable[[Any], Any] = pd.Timestamp
+    elif column in NUMERIC_DTYPES:
+        convert = pd.to_numeric
+    else:
+        return value
+    if op in ("in", "not in"):
+        return [convert(v) for v in value]
+    return convert(value)
+
+
+class FlightQuery:
+    """Immutable, lazily evaluated selection of columns and rows of the flight data."""
+
+    def __init__(
+        self,
+        source: Union[str, Path],
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        chunksize: int = 500_000,
+    ):
+        """
+        Describe a query; nothing is read until collect().
+
+        Args:
+            source: Path to the raw CSV (its Parquet cache is used if present)
+                or to a Parquet file
+            columns: Columns to return (all if omitted)
+            filters: (column, operator, value) predicates that rows must all
+                satisfy, with operators from FILTER_OPERATORS
+            chunksize: Rows per chunk when filtering a CSV
+        """
+        self.source = Path(source)
+        self.chunksize = chunksize
+        self._columns = list(columns) if columns is not None else None
+        self._filters: List[Filter] = []
+        self._path: Optional[Path] = None
+        self._schema: Optional[List[str]] = None
+        for column, op, value in filters or []:
+            if op not in FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {op}")
+            self._filters.append((column, op, _filter_value(column, op, value)))
+
+    def _derive(self, columns: Optional[List[str]], filters: List[Filter]) -> "FlightQuery":
+        """New query on the same source, sharing the resolved path and schema."""
+        query = FlightQuery(self.source, columns, filters, self.chunksize)
+        query._path, query._schema = self._path, self._schema
+        return query
+
+    @property
+    def path(self) -> Path:
+        """File the query reads, resolved once."""
+        if self._path is None:
+            self._path = resolve_data_path(self.source)
+        return self._path
+
+    @property
+    def schema(self) -> List[str]:
+        """All column names of the source, read from the file header or metadata."""
+        if self._schema is None:
+            if self.path.suffix == ".parquet":
+                import pyarrow.parquet as pq
+
+                self._schema = pq.read_schema(self.path).names
+            else:
+                self._schema = list(pd.read_csv(self.path, nrows=0).columns)
+        return self._schema
+
+    @property
+    def columns(self) -> List[str]:
+        """Columns the query returns."""
+        return list(self._columns) if self._columns is not None else self.schema
+
+    @property
+    def filters(self) -> List[Filter]:
+        """Row predicates of the query."""
+        return list(self._filters)
+
+    def select(self, *columns: str) -> "FlightQuery":
+        """
+        Restrict the query to some columns.
+
+        Args:
+            *columns: Column names, in the order they should be returned
+
+        Returns:
+            New query returning only these columns
+        """
+        unknown = set(columns) - set(self.columns)
+        if unknown:
+            raise KeyError(f"Columns not in query: {sorted(unknown)}")
+        return self._derive(list(columns), self._filters)
+
+    def filter(self, column: str, op: str, value: Any) -> "FlightQuery":
+        """
+        Keep only rows satisfying a predicate.
+
+        Args:
+            column: Column name (need not be selected)
+            op: Operator from FILTER_OPERATORS, e.g. "==" or "in"
+            value: Value (or list of values for "in" / "not in") to compare with
+
+        Returns:
+            New query with the predicate added
+        """
+        if column not in self.schema:
+            raise KeyError(f"Unknown column: {column}")
+        return self._derive(self._columns, self._filters + [(column, op, value)])
+
+    def where(self, **equals: Any) -> "FlightQuery":
+        """
+        Keep rows whose columns equal the given values.
+
+        Column names with spaces can be passed by unpacking a dict, e.g.
+        ``query.where(**{"Booking Source": "Online Website"})``.
+
+        Returns:
+            New query with one equality predicate per keyword
+        """
+        query = self
+        for column, value in equals.items():
+            query = query.filter(column, "==", value)
+        return query
+
+    def collect(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Read the selected columns of the matching rows.
+
+        Malformed values are read as missing (errors="coerce") from both
+        Parquet and CSV, so the result does not depend on which file is read.
+
+        Args:
+            columns: Further restrict the columns read (defaults to the query's)
+
+        Returns:
+            Typed DataFrame
+        """
+        columns = list(columns) if columns is not None else self.columns
+        needed = list(dict.fromkeys(columns + [column for column, _, _ in self._filters]))
+
+        if self.path.suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(self.path, columns=needed, filters=self._filters or None)
+            return apply_flight_dtypes(table.to_pandas(), errors="coerce")[columns]
+
+        if not self._filters:
+            chunks = iter_flight_chunks(
+                self.path, chunksize=self.chunksize, columns=columns, errors="coerce"
+            )
+            return self._concat(list(chunks), columns)
+
+        matching = []
+        for chunk in iter_flight_chunks(
+            self.path, chunksize=self.chunksize, columns=needed, errors="coerce"
+        ):
+            mask = pd.Series(True, index=chunk.index)
+            for column, op, value in self._filters:
+                mask &= FILTER_OPERATORS[op](chunk[column], value)
+            matching.append(chunk.loc[mask, columns])
+        return self._concat(matching, columns).reset_index(drop=True)
+
+    @staticmethod
+    def _concat(chunks: List[pd.DataFrame], columns: List[str]) -> pd.DataFrame:
+        """Concatenate typed chunks, keeping categorical columns categorical."""
+        if not chunks:
+            return pd.DataFrame(columns=columns)
+        if len(chunks) == 1:
+            return chunks[0][columns]
+        return apply_flight_dtypes(pd.concat(chunks)[columns], errors="coerce")
+
+    def count(self) -> int:
+        """
+        Number of matching rows, read from Parquet metadata when unfiltered.
+
+        Returns:
+            Row count
+        """
+        if not self._filters and self.path.suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            return pq.ParquetFile(self.path).metadata.num_rows
+        return len(self.collect(columns=[self._filters[0][0] if self._filters else self.schema[0]]))
+
+    def __getitem__(self, key: Union[str, Sequence[str]]) -> Union[pd.Series, "FlightQuery"]:
+        """A single column is read as a Series; a list of columns gives a narrower query."""
+        if isinstance(key, str):
+            return self.collect([key])[key]
+        return self.select(*key)
+
+    def __repr__(self) -> str:
+        """Describe the query without reading it."""
+        return (
+            f"FlightQuery({str(self.source)!r}, columns={self._columns}, filters={self._filters})"
+        )
+
+
+FlightData = Union[pd.DataFrame, FlightQuery]
+
+
+def as_frame(data: FlightData, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Materialize the columns a helper needs from a DataFrame or a FlightQuery.
+
+    DataFrames are returned as they are; queries read only ``columns``.
+
+    Args:
+        data: DataFrame or FlightQuery
+        columns: Columns the caller uses (all of the query's if omitted)
+
+    Returns:
+        DataFrame holding at least ``columns``
+    """
+    if isinstance(data, FlightQuery):
+        return data.collect(columns)
+    return data
@@ -0,0 +1,226 @@
+"""
+Per-record validation compiled from a Pandera schema.
+
+Validating one API request with Pandera means building a one-row DataFrame
+and running every check on it, which costs milliseconds. RecordValidator
+walks the schema once and compiles each column into plain Python predicates
+(types, nullability, ranges, enums, string lengths), so a record is checked
+with a few comparisons. Custom checks (lambdas such as "should be
+uppercase") cannot be compiled; they run through Pandera once per distinct
+value and the result is cached, like FastSchemaCheck does for batches.
+
+Failures are reported as dicts shaped like Pandera failure cases, so online
+and batch validation give the same errors for the same rules.
+"""
+
+import math
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandera import Check, Column, DataFrameSchema
+
+from src.data.loader import DATETIME_FORMAT
+
+# Largest number of custom check results cached per column
+MAX_CACHED_VALUES = 10_000
+
+Predicate = Callable[[Any], bool]
+
+# Built-in Pandera checks by name, as functions of (value, statistics)
+BUILTIN_CHECKS: Dict[str, Callable[[Any, Dict[str, Any]], bool]] = {
+    "greater_than": lambda v, s: v > s["min_value"],
+    "greater_than_or_equal_to": lambda v, s: v >= s["min_value"],
+    "less_than": lambda v, s: v < s["max_value"],
+    "less_than_or_equal_to": lambda v, s: v <= s["max_value"],
+    "equal_to": lambda v, s: v == s["value"],
+    "not_equal_to": lambda v, s: v != s["value"],
+    "in_range": lambda v, s: (
+        (v >= s["min_value"] if s.get("include_min", True) else v > s["min_value"])
+        and (v <= s["max_value"] if s.get("include_max", True) else v < s["max_value"])
+    ),
+    "isin": lambda v, s: v in s["allowed_values"],
+    "notin": lambda v, s: v not in s["forbidden_values"],
+    "str_length": lambda v, s: (
+        (s.get("min_value") is None or len(v) >= s["min_value"])
+        and (s.get("max_value") is None or len(v) <= s["max_value"])
+    ),
+    "str_startswith": lambda v, s: v.startswith(s["string"]),
+    "str_endswith": lambda v, s: v.endswith(s["string"]),
+}
+
+
+def _is_missing(value: Any) -> bool:
+    """True for None, NaN and NaT."""
+    return value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NaT
+
+
+def _coercer(dtype: Any) -> Callable[[Any], Any]:
+    """Function converting a record value to the column's Python type, raising if it cannot."""
+    name = str(dtype)
+    if name.startswith("datetime64"):
+
+        def to_datetime(value: Any) -> datetime:
+            if isinstance(value, datetime):
+                return value
+            return datetime.strptime(value, DATETIME_FORMAT)
+
+        return to_datetime
+
+    if name.startswith(("float", "int")):
+        integer = name.startswith("int")
+
+        def to_number(value: Any) -> Any:
+            if isinstance(value, bool) or not isinstance(value, (int, float, np.number)):
+                raise TypeError(f"expected a number, got {type(value).__name__}")
+            if integer and value != int(value):
+                raise TypeError("expected an integer")
+            return int(value) if integer else float(value)
+
+        return to_number
+
+    def to_str(value: Any) -> str:
+        if not isinstance(value, str):
+            raise TypeError(f"expected a string, got {type(value).__name__}")
+        return value
+
+    return to_str
+
+
+class _CompiledColumn:
+    """Checks of one schema column as Python predicates."""
+
+    def __init__(self, name: str, column: Column, required: bool):
+        self.name = name
+        self.required = required
+        self.nullable = column.nullable
+        self.dtype = str(column.dtype)
+        self.coerce = _coercer(column.dtype)
+        self.checks: List[Tuple[int, str, Predicate]] = []
+        for number, check in enumerate(column.checks):
+            self.checks.append((number, str(check.error), self._compile(check)))
+
+    def _compile(self, check: Check) -> Predicate:
+        """Predicate for a built-in check, or a cached Pandera call for a custom one."""
+        builtin = BUILTIN_CHECKS.get(check.name)
+        if builtin is not None:
+            statistics = dict(check.statistics)
+            if "allowed_values" in statistics:
+                statistics["allowed_values"] = frozenset(statistics["allowed_values"])
+            if "forbidden_values" in statistics:
+                statistics["forbidden_values"] = frozenset(statistics["forbidden_values"])
+            return lambda value: builtin(value, statistics)
+
+        cache: Dict[Any, bool] = {}
+
+        def custom(value: Any) -> bool:
+            passed = cache.get(value)
+            if passed is None:
+                output = check(pd.Series([value])).check_output
+                passed = bool(np.all(output))
+                if len(cache) >= MAX_CACHED_VALUES:
+                    cache.clear()
+                cache[value] = passed
+            return passed
+
+        return custom
+
+
+class RecordValidator:
+    """Validates single records (dicts keyed by column name) against a Pandera schema."""
+
+    def __init__(
+        self,
+        schema: DataFrameSchema,
+        columns: Optional[Sequence[str]] = None,
+        required: Optional[Sequence[str]] = None,
+    ):
+        """
+        Compile a schema.
+
+        Args:
+            schema: Pandera schema (e.g. FlightDataValidator().schema)
+            columns: Only validate these schema columns (all if omitted)
+            required: Columns a record must contain (the schema's required
+                columns if omitted); other columns are checked when present
+        """
+        self.schema = schema
+        self.columns = [
+            _CompiledColumn(name, column, column.required if required is None else name in required)
+            for name, column in schema.columns.items()
+            if columns is None or name in columns
+        ]
+
+    def failure_cases(self, record: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Check a record and describe every failure.
+
+        Args:
+            record: Mapping from column name to value
+
+        Returns:
+            Failure cases shaped like Pandera's (empty if the record is valid)
+        """
+        failures: List[Dict[str, Any]] = []
+        for column in self.columns:
+            if column.name not in record:
+                if column.required:
+                    failures.append(_failure(None, "column_in_dataframe", None, column.name))
+                continue
+
+            value = record[column.name]
+            if _is_missing(value):
+                if not column.nullable:
+                    failures.append(_failure(column.name, "not_nullable", None, None))
+                continue
+
+            try:
+                value = column.coerce(value)
+            except (TypeError, ValueError):
+                failures.append(_failure(column.name, f"dtype('{column.dtype}')", None, value))
+                continue
+
+            for number, label, predicate in column.checks:
+                if not predicate(value):
+                    failures.append(_failure(column.name, label, number, value))
+        return failures
+
+    def is_valid(self, record: Mapping[str, Any]) -> bool:
+        """
+        Check a record.
+
+        Args:
+            record: Mapping from column name to value
+
+        Returns:
+            True if the record passes every check
+        """
+        return not self.failure_cases(record)
+
+    def validate(self, record: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a record.
+
+        Args:
+            record: Mapping from column name to value
+
+        Returns:
+            Dictionary with is_valid and errors, like FlightDataValidator.validate
+        """
+        errors = self.failure_cases(record)
+        return {"is_valid": not errors, "errors": errors}
+
+
+def _failure(
+    column: Optional[str], check: str, check_number: Optional[int], failure_case: Any
+) -> Dict[str, Any]:
+    """Failure case in Pandera's layout, without a row index."""
+    return {
+        "schema_context": "Column" if column is not None else "DataFrameSchema",
+        "column": column,
+        "check": check,
+        "check_number": check_number,
+        "failure_case": failure_case,
+        "index": None,
+    }
@@ -0,0 +1,287 @@
+"""
+Route index for route-level fare insights.
+
+A route is a (Source, Destination) pair. encode_routes turns the pair into an
+integer route id per row without building per-row strings, and RouteIndex
+keeps per-route row counts, fare count/sum/sum-of-squares and a quantile
+sketch. Every route insight (popular routes, expensive routes, a single
+route's statistics) is then answered from the index instead of rescanning
+or masking the fact table once per route.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.streaming_stats import QuantileSketch
+
+ROUTE_COLUMNS = ("Source", "Destination")
+ROUTE_SEPARATOR = " → "
+FARE_COLUMN = "Total Fare (BDT)"
+
+
+def _codes(series: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Integer codes (-1 for missing) and distinct values of a column."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64), series.cat.categories
+    codes, uniques = pd.factorize(series)
+    return codes.astype(np.int64), pd.Index(uniques)
+
+
+def encode_routes(
+    df: pd.DataFrame, columns: Tuple[str, str] = ROUTE_COLUMNS
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Encode each row's (source, destination) pair as an integer route id.
+
+    Args:
+        df: DataFrame with the source and destination columns
+        columns: Source and destination column names
+
+    Returns:
+        Tuple of route ids (-1 where either end is missing) and route labels
+        ("DAC → CXB") indexed by id, sorted by label
+    """
+    sources, source_values = _codes(df[columns[0]])
+    destinations, destination_values = _codes(df[columns[1]])
+
+    valid = (sources >= 0) & (destinations >= 0)
+    pairs = sources[valid] * len(destination_values) + destinations[valid]
+
+    # Factorize integer pairs, then build one label per distinct route
+    pair_ids, keys = pd.factorize(pairs)
+    labels = np.array(
+        [
+            f"{source_values[key // len(destination_values)]}{ROUTE_SEPARATOR}"
+            f"{destination_values[key % len(destination_values)]}"
+            for key in keys.tolist()
+        ],
+        dtype=object,
+    )
+
+    # Renumber routes in label order, so ids do not depend on row order
+    order = np.argsort(labels, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+
+    route_ids = np.full(len(df), -1, dtype=np.int64)
+    route_ids[valid] = rank[pair_ids]
+    return route_ids, labels[order].tolist()
+
+
+def route_column(df: pd.DataFrame, columns: Tuple[str, str] = ROUTE_COLUMNS) -> pd.Categorical:
+    """
+    Build a categorical "SRC → DST" route column.
+
+    Only one string per distinct route is built; rows hold integer codes.
+
+    Args:
+        df: DataFrame with the source and destination columns
+        columns: Source and destination column names
+
+    Returns:
+        Categorical of route labels aligned with the rows of ``df``
+    """
+    route_ids, labels = encode_routes(df, columns)
+    return pd.Categorical.from_codes(route_ids, categories=labels)
+
+
+class RouteIndex:
+    """Per-route fare aggregates, built once and queried many times."""
+
+    def __init__(self, track_quantiles: bool = True, relative_accuracy: float = 0.001):
+        """
+        Initialize an empty index.
+
+        Args:
+            track_quantiles: Keep a quantile sketch per route (for medians)
+            relative_accuracy: Relative accuracy of the quantile sketches
+        """
+        self.track_quantiles = track_quantiles
+        self.relative_accuracy = relative_accuracy
+        self.labels: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self.rows = np.zeros(0, dtype=np.int64)
+        self.fare_count = np.zeros(0, dtype=np.int64)
+        self.fare_sum = np.zeros(0)
+        self.fare_sum_sq = np.zeros(0)
+        self.sketches: List[QuantileSketch] = []
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, fare_col: str = FARE_COLUMN, track_quantiles: bool = True
+    ) -> "RouteIndex":
+        """
+        Build an index over a DataFrame.
+
+        Args:
+            df: DataFrame with Source, Destination and fare columns
+            fare_col: Fare column aggregated per route
+            track_quantiles: Keep a quantile sketch per route (for medians)
+
+        Returns:
+            Populated RouteIndex
+        """
+        return cls(track_quantiles=track_quantiles).update(df, fare_col)
+
+    def __len__(self) -> int:
+        """Number of routes in the index."""
+        return len(self.labels)
+
+    def _global_ids(self, labels: List[str]) -> np.ndarray:
+        """Map route labels to index ids, registering new routes."""
+        for label in labels:
+            if label not in self._ids:
+                self._ids[label] = len(self.labels)
+                self.labels.append(label)
+                self.sketches.append(QuantileSketch(self.relative_accuracy))
+
+        grow = len(self.labels) - len(self.rows)
+        if grow:
+            self.rows = np.concatenate([self.rows, np.zeros(grow, dtype=np.int64)])
+            self.fare_count = np.concatenate([self.fare_count, np.zeros(grow, dtype=np.int64)])
+            self.fare_sum = np.concatenate([self.fare_sum, np.zeros(grow)])
+            self.fare_sum_sq = np.concatenate([self.fare_sum_sq, np.zeros(grow)])
+
+        return np.array([self._ids[label] for label in labels], dtype=np.int64)
+
+    def update(self, df: pd.DataFrame, fare_col: str = FARE_COLUMN) -> "RouteIndex":
+        """
+        Fold a chunk of flight data into the index.
+
+        Args:
+            df: DataFrame chunk with Source, Destination and fare columns
+            fare_col: Fare column aggregated per route
+
+        Returns:
+            The index itself, to allow chaining
+        """
+        local_ids, labels = encode_routes(df)
+        mapping = self._global_ids(labels)
+        valid = local_ids >= 0
+        route_ids = mapping[local_ids[valid]]
+        size = len(self.labels)
+
+        self.rows += np.bincount(route_ids, minlength=size)
+
+        fares = df[fare_col].to_numpy(dtype=np.float64)[valid]
+        has_fare = ~np.isnan(fares)
+        route_ids, fares = route_ids[has_fare], fares[has_fare]
+        self.fare_count += np.bincount(route_ids, minlength=size)
+        self.fare_sum += np.bincount(route_ids, weights=fares, minlength=size)
+        self.fare_sum_sq += np.bincount(route_ids, weights=fares**2, minlength=size)
+
+        if self.track_quantiles and len(route_ids):
+            # One sort groups the rows by route, then each sketch takes a slice
+            order = np.argsort(route_ids, kind="stable")
+            sorted_ids, sorted_fares = route_ids[order], fares[order]
+            starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+            for start, end in zip(starts, np.r_[starts[1:], len(sorted_ids)]):
+                self.sketches[sorted_ids[start]].update(sorted_fares[start:end])
+
+        return self
+
+    def merge(self, other: "RouteIndex") -> "RouteIndex":
+        """
+        Merge an index built over another part of the data.
+
+        Args:
+            other: Index to merge into this one
+
+        Returns:
+            The index itself, to allow chaining
+        """
+        mapping = self._global_ids(other.labels)
+        np.add.at(self.rows, mapping, other.rows)
+        np.add.at(self.fare_count, mapping, other.fare_count)
+        np.add.at(self.fare_sum, mapping, other.fare_sum)
+        np.add.at(self.fare_sum_sq, mapping, other.fare_sum_sq)
+        self.track_quantiles = self.track_quantiles and other.track_quantiles
+        if self.track_quantiles:
+            for route_id, sketch in zip(mapping.tolist(), other.sketches):
+                self.sketches[route_id].merge(sketch)
+        return self
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Per-route statistics.
+
+        Returns:
+            DataFrame indexed by Route with rows, count (non-null fares), mean,
+            std and (if tracked) approximate median, sorted by route
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.fare_sum / self.fare_count
+            variance = (self.fare_sum_sq - self.fare_count * mean**2) / (self.fare_count - 1)
+
+        stats = pd.DataFrame(
+            {
+                "rows": self.rows,
+                "count": self.fare_count,
+                "mean": mean,
+                "std": np.sqrt(np.clip(variance, 0, None)),
+            },
+            index=pd.Index(self.labels, name="Route"),
+        )
+        if self.track_quantiles:
+            stats["median"] = [sketch.quantile(0.5) for sketch in self.sketches]
+        return stats.sort_index()
+
+    def popular(self, top_n: Optional[int] = None) -> pd.Series:
+        """
+        Routes by number of flights, like ``df["Route"].value_counts()``.
+
+        Args:
+            top_n: Number of routes to return (all if omitted)
+
+        Returns:
+            Series of flight counts indexed by Route, most popular first
+        """
+        counts = pd.Series(self.rows, index=pd.Index(self.labels, name="Route"), name="count")
+        counts = counts[counts > 0].sort_values(ascending=False, kind="stable")
+        return counts if top_n is None else counts.head(top_n)
+
+    def expensive(self, top_n: Optional[int] = None, min_count: int = 10) -> pd.DataFrame:
+        """
+        Routes by average fare.
+
+        Args:
+            top_n: Number of routes to return (all if omitted)
+            min_count: Minimum number of fares for a route to be ranked
+
+        Returns:
+            DataFrame with mean and count indexed by Route, most expensive first
+        """
+        stats = self.summary()[["mean", "count"]]
+        stats = stats[stats["count"] >= min_count].sort_values("mean", ascending=False)
+        return stats if top_n is None else stats.head(top_n)
+
+    def lookup(self, route: str) -> Dict[str, float]:
+        """
+        Statistics of a single route.
+
+        Args:
+            route: Route label, e.g. "DAC → CXB"
+
+        Returns:
+            Dictionary with rows, count, mean, std and (if tracked) median
+        """
+        if route not in self._ids:
+            raise KeyError(f"Unknown route: {route}")
+
+        route_id = self._ids[route]
+        count = int(self.fare_count[route_id])
+        mean = self.fare_sum[route_id] / count if count else float("nan")
+        variance = (
+            (self.fare_sum_sq[route_id] - count * mean**2) / (count - 1) if count > 1 else np.nan
+        )
+        stats = {
+            "rows": int(self.rows[route_id]),
+            "count": count,
+            "mean": float(mean),
+            "std": float(np.sqrt(max(variance, 0))) if count > 1 else float("nan"),
+        }
+        if self.track_quantiles:
+            stats["median"] = self.sketches[route_id].quantile(0.5)
+        return stats
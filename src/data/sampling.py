@@ -0,0 +1,259 @@
+"""
+Reservoir and stratified sampling of the flight data.
+
+Every row gets a uniform random key from a seeded generator, drawn in file
+order, and a sample keeps the rows with the smallest keys: overall
+(reservoir sampling) or within each stratum (stratified sampling, e.g. by
+Airline/Class/Route with per-stratum quotas). The file is streamed chunk by
+chunk, so only the sample is ever held in memory, and the same seed selects
+the same rows whatever the chunk size.
+
+load_sample caches samples as Parquet files keyed by the raw file's hash and
+the sampling parameters, so repeated notebook runs reuse them.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.loader import apply_flight_dtypes, iter_flight_chunks
+from src.data.manifest import current_file_hash
+from src.data.routes import ROUTE_COLUMNS, route_column
+
+logger = logging.getLogger(__name__)
+
+SAMPLES_DIR = Path("data/03-features/samples")
+
+# Random key column used while sampling, dropped from the result
+SAMPLE_KEY = "_sample_key"
+
+# Strata derived from other columns
+DERIVED_STRATA = {"Route": list(ROUTE_COLUMNS)}
+
+
+def stratum_source_columns(by: Sequence[str]) -> List[str]:
+    """
+    Raw columns needed to compute the given strata.
+
+    Args:
+        by: Stratum columns, possibly derived ones such as "Route"
+
+    Returns:
+        Columns to read from the data file
+    """
+    return list(dict.fromkeys(col for dim in by for col in DERIVED_STRATA.get(dim, [dim])))
+
+
+def _add_strata(df: pd.DataFrame, by: Sequence[str]) -> pd.DataFrame:
+    """Add derived stratum columns missing from a chunk."""
+    if "Route" in by and "Route" not in df.columns:
+        df = df.copy(deep=False)
+        df["Route"] = route_column(df)
+    return df
+
+
+def count_strata(df: pd.DataFrame, by: Sequence[str]) -> int:
+    """
+    Number of non-empty strata in a DataFrame.
+
+    Args:
+        df: DataFrame with the stratum (or stratum source) columns
+        by: Stratum columns
+
+    Returns:
+        Number of distinct stratum values present
+    """
+    return _add_strata(df, by).groupby(list(by), observed=True).ngroups
+
+
+def _keep_smallest(
+    candidates: pd.DataFrame,
+    n: Optional[int],
+    by: Optional[Sequence[str]],
+    per_stratum: int,
+    quotas: Optional[Dict[Any, int]],
+) -> pd.DataFrame:
+    """Keep the rows with the smallest keys, overall or per stratum."""
+    candidates = candidates.sort_values(SAMPLE_KEY)
+    if not by:
+        return candidates.head(n)
+
+    grouped = candidates.groupby(list(by), observed=True, sort=False)
+    rank = grouped.cumcount().to_numpy()
+    if quotas:
+        # Groups are numbered in the order of the size() index
+        limits = np.array([quotas.get(key, per_stratum) for key in grouped.size().index])
+        limit = limits[grouped.ngroup().to_numpy()]
+    else:
+        limit = per_stratum
+    return candidates[rank < limit]
+
+
+def sample_chunks(
+    chunks: Iterable[pd.DataFrame],
+    n: Optional[int] = None,
+    by: Optional[Sequence[str]] = None,
+    per_stratum: int = 100,
+    quotas: Optional[Dict[Any, int]] = None,
+    seed: Optional[int] = 42,
+) -> pd.DataFrame:
+    """
+    Sample rows from a stream of DataFrame chunks.
+
+    Args:
+        chunks: DataFrame chunks in a fixed order
+        n: Sample size for reservoir sampling (used when ``by`` is omitted)
+        by: Stratum columns for stratified sampling ("Route" is derived from
+            Source and Destination)
+        per_stratum: Rows kept per stratum
+        quotas: Per-stratum overrides of ``per_stratum``, keyed by stratum
+            value (a tuple of values for several stratum columns)
+        seed: Seed of the random keys; the same seed gives the same sample
+
+    Returns:
+        Sampled rows, in their original order and with their original index
+    """
+    if not by and n is None:
+        raise ValueError("Either a sample size n or stratum columns must be given")
+
+    rng = np.random.default_rng(seed)
+    kept: Optional[pd.DataFrame] = None
+    for chunk in chunks:
+        chunk = _add_strata(chunk, by or [])
+        keys = rng.random(len(chunk))
+
+        # Once the reservoir is full, only rows with smaller keys can enter it
+        if not by and kept is not None and len(kept) == n:
+            entering = keys < kept[SAMPLE_KEY].iloc[-1]
+            chunk, keys = chunk[entering], keys[entering]
+
+        chunk = chunk.assign(**{SAMPLE_KEY: keys})
+        candidates = chunk if kept is None else pd.concat([kept, chunk])
+        kept = _keep_smallest(candidates, n, by, per_stratum, quotas)
+
+    if kept is None:
+        return pd.DataFrame()
+    sample = kept.drop(columns=SAMPLE_KEY).sort_index()
+    for column in DERIVED_STRATA:
+        if column in sample.columns:
+            sample[column] = sample[column].astype("category")
+    # Values too large for the compact dtypes stay wide instead of failing
+    return apply_flight_dtypes(sample, errors="coerce")
+
+
+def sample_frame(
+    df: pd.DataFrame,
+    n: Optional[int] = None,
+    by: Optional[Sequence[str]] = None,
+    per_stratum: int = 100,
+    quotas: Optional[Dict[Any, int]] = None,
+    seed: Optional[int] = 42,
+) -> pd.DataFrame:
+    """
+    Sample rows of an in-memory DataFrame (see sample_chunks).
+
+    Returns:
+        Sampled rows of ``df``
+    """
+    return sample_chunks([df], n=n, by=by, per_stratum=per_stratum, quotas=quotas, seed=seed)
+
+
+def sample_file(
+    filepath: Union[str, Path],
+    n: Optional[int] = None,
+    by: Optional[Sequence[str]] = None,
+    per_stratum: int = 100,
+    quotas: Optional[Dict[Any, int]] = None,
+    seed: Optional[int] = 42,
+    columns: Optional[List[str]] = None,
+    chunksize: int = 500_000,
+) -> pd.DataFrame:
+    """
+    Sample rows of a data file without loading it (see sample_chunks).
+
+    Malformed values are read as missing, so they cannot stop the sample.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        n: Sample size for reservoir sampling (used when ``by`` is omitted)
+        by: Stratum columns for stratified sampling
+        per_stratum: Rows kept per stratum
+        quotas: Per-stratum overrides of ``per_stratum``
+        seed: Seed of the random keys
+        columns: Columns to return (all if omitted; stratum columns are always read)
+        chunksize: Rows read per chunk
+
+    Returns:
+        Sampled rows, indexed by their row position in the file
+    """
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + stratum_source_columns(by or [])))
+    chunks = iter_flight_chunks(filepath, chunksize=chunksize, columns=columns, errors="coerce")
+    return sample_chunks(chunks, n=n, by=by, per_stratum=per_stratum, quotas=quotas, seed=seed)
+
+
+def load_sample(
+    filepath: Union[str, Path],
+    n: Optional[int] = None,
+    by: Optional[Sequence[str]] = None,
+    per_stratum: int = 100,
+    quotas: Optional[Dict[Any, int]] = None,
+    seed: int = 42,
+    columns: Optional[List[str]] = None,
+    cache_dir: Union[str, Path] = SAMPLES_DIR,
+) -> pd.DataFrame:
+    """
+    Load a cached sample of a data file, drawing and caching it if missing.
+
+    Samples are keyed by the file's SHA256 and the sampling parameters, so a
+    changed file or different parameters never reuse a stale sample.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        n: Sample size for reservoir sampling (used when ``by`` is omitted)
+        by: Stratum columns for stratified sampling
+        per_stratum: Rows kept per stratum
+        quotas: Per-stratum overrides of ``per_stratum``
+        seed: Seed of the random keys
+        columns: Columns to return (all if omitted)
+        cache_dir: Directory holding cached samples
+
+    Returns:
+        Sampled rows, indexed by their row position in the file
+    """
+    filepath = Path(filepath)
+    params = {
+        "source": current_file_hash(filepath),
+        "n": n,
+        "by": list(by) if by else None,
+        "per_stratum": per_stratum if by else None,
+        "quotas": sorted((repr(key), value) for key, value in (quotas or {}).items()),
+        "seed": seed,
+        "columns": columns,
+    }
+    key = hashlib.blake2b(json.dumps(params).encode(), digest_size=8).hexdigest()
+    cache_path = Path(cache_dir) / f"{filepath.stem}.sample.{key}.parquet"
+
+    if cache_path.exists():
+        logger.info(f"Reading cached sample {cache_path}")
+        return apply_flight_dtypes(pd.read_parquet(cache_path), errors="coerce")
+
+    sample = sample_file(
+        filepath, n=n, by=by, per_stratum=per_stratum, quotas=quotas, seed=seed, columns=columns
+    )
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".parquet.tmp")
+        sample.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+        tmp_path.replace(cache_path)
+        logger.info(f"Cached {len(sample):,}-row sample at {cache_path}")
+    except ImportError:
+        logger.warning("pyarrow is not installed, not caching the sample")
+
+    return sample
@@ -0,0 +1,494 @@
+"""
+One-pass, mergeable summary statistics for numeric columns.
+
+StreamingStats combines exact sums of the values and their squares with a
+logarithmic-bin quantile sketch (DDSketch). Both support ``update(chunk)``
+and ``merge(other)``, so statistics can be computed over partitions in
+separate worker processes and combined. The sums are kept as exact
+rationals and sketch merges are exact bin-count additions, which makes the
+result independent of how the data was partitioned, down to the last bit.
+
+ValueCounts keeps exact distinct values with their counts instead. It costs
+memory proportional to the number of distinct values, and in exchange gives
+exact distinct counts, medians and quantiles that match pandas.
+"""
+
+import math
+from fractions import Fraction
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[pd.Series, np.ndarray]
+
+# Queued distinct values that trigger a ValueCounts merge (about 64 MB)
+PENDING_VALUES_LIMIT = 1 << 22
+
+# Integers are summed in int64 in pieces of this many bits, which stays exact
+# for up to 2**(63 - LIMB_BITS) values per chunk
+LIMB_BITS = 27
+
+
+class QuantileSketch:
+    """DDSketch quantile sketch with a relative-accuracy guarantee."""
+
+    def __init__(self, relative_accuracy: float = 0.001):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of returned quantiles
+        """
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def bin_keys(self, magnitudes: np.ndarray) -> np.ndarray:
+        """
+        Logarithmic bin key of each value.
+
+        Args:
+            magnitudes: Positive values (absolute values of negative ones)
+
+        Returns:
+            Array of int64 bin keys
+        """
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def _add_bins(self, bins: Dict[int, int], values: np.ndarray) -> None:
+        """Count absolute values into logarithmic bins."""
+        if len(values) == 0:
+            return
+        keys = self.bin_keys(values)
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        for key, count in zip(unique_keys.tolist(), counts.tolist()):
+            bins[key] = bins.get(key, 0) + count
+
+    def update(self, values: ArrayLike) -> "QuantileSketch":
+        """
+        Add a batch of values to the sketch. NaN values are ignored.
+
+        Args:
+            values: Numeric values
+
+        Returns:
+            The sketch itself, to allow chaining
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self._add_bins(self.positive, values[values > 0])
+        self._add_bins(self.negative, -values[values < 0])
+        self.zero_count += int((values == 0).sum())
+        self.count += len(values)
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Merge another sketch built with the same relative accuracy.
+
+        Args:
+            other: Sketch to merge into this one
+
+        Returns:
+            The sketch itself, to allow chaining
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def _bin_value(self, key: int) -> float:
+        """Representative value of a bin."""
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def _sorted_bins(self) -> Iterator[Tuple[float, int]]:
+        """Yield (value, count) pairs in ascending value order."""
+        for key in sorted(self.negative, reverse=True):
+            yield -self._bin_value(key), self.negative[key]
+        if self.zero_count:
+            yield 0.0, self.zero_count
+        for key in sorted(self.positive):
+            yield self._bin_value(key), self.positive[key]
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated quantile value, or NaN if the sketch is empty
+        """
+        if self.count == 0:
+            return float("nan")
+        rank = q * (self.count - 1)
+        cumulative = 0
+        value = float("nan")
+        for value, count in self._sorted_bins():
+            cumulative += count
+            if cumulative > rank:
+                break
+        return value
+
+    def count_outside(self, lower: float, upper: float) -> int:
+        """
+        Estimate how many values fall below ``lower`` or above ``upper``.
+
+        Args:
+            lower: Lower bound
+            upper: Upper bound
+
+        Returns:
+            Estimated number of values outside [lower, upper]
+        """
+        return sum(count for value, count in self._sorted_bins() if value < lower or value > upper)
+
+
+def _group_totals(values: np.ndarray, starts: np.ndarray) -> List[int]:
+    """Exact sums of groups of int64 values below 2**54 in magnitude, summed by limbs."""
+    low = np.add.reduceat(values & ((1 << LIMB_BITS) - 1), starts).tolist()
+    high = np.add.reduceat(values >> LIMB_BITS, starts).tolist()
+    return [(h << LIMB_BITS) + l for h, l in zip(high, low)]
+
+
+def exact_sums(values: np.ndarray) -> Tuple[Fraction, Fraction]:
+    """
+    Exact sum and sum of squares of finite float64 values.
+
+    Each value is split into an integer mantissa and a power-of-two exponent;
+    mantissas (and the pieces of their squares) are summed exactly per
+    exponent, so the result does not depend on the order of the values.
+
+    Args:
+        values: Finite float64 values
+
+    Returns:
+        Tuple of the sum and the sum of squares as fractions
+    """
+    if len(values) == 0:
+        return Fraction(0), Fraction(0)
+    fractions, exponents = np.frexp(values)
+    lowest = int(exponents.min())
+    groups = (exponents - lowest).astype(np.int16)
+    # A stable sort of 16-bit keys is a radix sort
+    order = np.argsort(groups, kind="stable")
+    mantissas = (fractions[order] * 2.0**53).astype(np.int64)
+    sizes = np.bincount(groups)
+    present = np.flatnonzero(sizes)
+    starts = (np.cumsum(sizes) - sizes)[present]
+
+    # mantissa**2 == high**2 << 54 + high * low << 28 + low**2, each term below 2**54
+    high, low = mantissas >> 27, mantissas & ((1 << 27) - 1)
+    sums = _group_totals(mantissas, starts)
+    squares = zip(
+        _group_totals(high * high, starts),
+        _group_totals(high * low, starts),
+        _group_totals(low * low, starts),
+    )
+
+    total, total_squares = Fraction(0), Fraction(0)
+    for group, value, (high_sq, cross, low_sq) in zip(present.tolist(), sums, squares):
+        scale = Fraction(2) ** (group + lowest - 53)
+        total += value * scale
+        total_squares += ((high_sq << 54) + (cross << 28) + low_sq) * scale * scale
+    return total, total_squares
+
+
+class StreamingStats:
+    """Count, mean, variance, min, max and quantiles computed in one pass."""
+
+    def __init__(self, relative_accuracy: float = 0.001):
+        """
+        Initialize empty statistics.
+
+        Args:
+            relative_accuracy: Relative accuracy of the quantile sketch
+        """
+        self.count = 0
+        self.sum = Fraction(0)
+        self.sum_squares = Fraction(0)
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore pickled statistics, converting the float moments of older versions."""
+        if "m2" in state:
+            count, mean, m2 = state["count"], state.pop("mean"), state.pop("m2")
+            state["sum"] = Fraction(mean) * count
+            state["sum_squares"] = Fraction(m2) + Fraction(mean) ** 2 * count
+        self.__dict__.update(state)
+
+    @property
+    def mean(self) -> float:
+        """Mean, correctly rounded from the exact sum."""
+        if self.count == 0:
+            return 0.0
+        return float(self.sum / self.count)
+
+    @property
+    def m2(self) -> float:
+        """Sum of squared deviations from the mean, correctly rounded."""
+        if self.count == 0:
+            return 0.0
+        return float(self.sum_squares - self.sum**2 / self.count)
+
+    def update(self, values: ArrayLike) -> "StreamingStats":
+        """
+        Add a chunk of values. NaN and infinite values are ignored.
+
+        Args:
+            values: Numeric values
+
+        Returns:
+            The statistics object itself, to allow chaining
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+
+        chunk_sum, chunk_squares = exact_sums(values)
+        self.count += len(values)
+        self.sum += chunk_sum
+        self.sum_squares += chunk_squares
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        """
+        Merge statistics computed over another partition.
+
+        Args:
+            other: Statistics to merge into this object
+
+        Returns:
+            The statistics object itself, to allow chaining
+        """
+        self.count += other.count
+        self.sum += other.sum
+        self.sum_squares += other.sum_squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, as in pandas)."""
+        if self.count < 2:
+            return float("nan")
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    @property
+    def median(self) -> float:
+        """Approximate median from the quantile sketch."""
+        return self.sketch.quantile(0.5)
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile from the quantile sketch."""
+        return self.sketch.quantile(q)
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarize the statistics.
+
+        Returns:
+            Dictionary with mean, median, min, max and std
+        """
+        if self.count == 0:
+            nan = float("nan")
+            return {"mean": nan, "median": nan, "min": nan, "max": nan, "std": nan}
+        return {
+            "mean": self.mean,
+            "median": self.median,
+            "min": self.min,
+            "max": self.max,
+            "std": self.std,
+        }
+
+
+class ValueCounts:
+    """Exact, mergeable table of distinct values and their counts."""
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self.values = np.empty(0)
+        self.counts = np.empty(0, dtype=np.int64)
+        self._sorted = True
+        # Per-chunk tables are queued and merged in large batches, since every
+        # merge re-hashes the merged table
+        self._pending: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._pending_size = 0
+
+    def update(self, values: ArrayLike) -> "ValueCounts":
+        """
+        Count a chunk of values. NaN/NaT values are ignored.
+
+        Args:
+            values: Numeric or datetime64 values
+
+        Returns:
+            The table itself, to allow chaining
+        """
+        # Hash-based counting; values are only sorted once, when quantiles are read
+        counts = pd.Series(np.asarray(values)).value_counts(sort=False, dropna=True)
+        if len(counts):
+            self._add(counts.index.to_numpy(), counts.to_numpy(dtype=np.int64))
+        return self
+
+    def merge(self, other: "ValueCounts") -> "ValueCounts":
+        """
+        Merge a table built over another part of the data.
+
+        Args:
+            other: Table to merge into this one
+
+        Returns:
+            The table itself, to allow chaining
+        """
+        other._compact()
+        if len(other.values):
+            self._add(other.values, other.counts)
+        return self
+
+    def _add(self, values: np.ndarray, counts: np.ndarray) -> None:
+        """Queue a table, compacting once the queue outgrows the merged table."""
+        self._pending.append((values, counts))
+        self._pending_size += len(values)
+        if self._pending_size > max(2 * len(self.values), PENDING_VALUES_LIMIT):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Merge queued tables into the main table."""
+        if not self._pending:
+            return
+        tables = ([self.values] if len(self.values) else []) + [v for v, _ in self._pending]
+        counts = ([self.counts] if len(self.values) else []) + [c for _, c in self._pending]
+        if len(tables) == 1:
+            # A single table is already distinct
+            self.values, self.counts = tables[0], counts[0]
+        else:
+            codes, values = pd.factorize(np.concatenate(tables))
+            self.values = np.asarray(values)
+            self.counts = np.bincount(codes, weights=np.concatenate(counts)).astype(np.int64)
+        self._sorted = False
+        self._pending = []
+        self._pending_size = 0
+
+    def _sort(self) -> None:
+        """Merge queued tables and sort the table by value."""
+        self._compact()
+        if not self._sorted:
+            order = np.argsort(self.values)
+            self.values = self.values[order]
+            self.counts = self.counts[order]
+            self._sorted = True
+
+    @property
+    def count(self) -> int:
+        """Number of non-null values counted."""
+        self._compact()
+        return int(self.counts.sum())
+
+    @property
+    def nunique(self) -> int:
+        """Number of distinct values."""
+        self._compact()
+        return len(self.values)
+
+    @property
+    def mean(self) -> float:
+        """Mean of the counted values."""
+        if self.count == 0:
+            return float("nan")
+        return float(np.dot(self.values.astype(np.float64), self.counts) / self.count)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, as in pandas)."""
+        count = self.count
+        if count < 2:
+            return float("nan")
+        deviations = self.values.astype(np.float64) - self.mean
+        return math.sqrt(float(np.dot(deviations**2, self.counts)) / (count - 1))
+
+    @property
+    def min(self) -> float:
+        """Smallest counted value."""
+        self._sort()
+        return float(self.values[0]) if len(self.values) else float("nan")
+
+    @property
+    def max(self) -> float:
+        """Largest counted value."""
+        self._sort()
+        return float(self.values[-1]) if len(self.values) else float("nan")
+
+    @property
+    def median(self) -> float:
+        """Exact median."""
+        return self.quantile(0.5)
+
+    def quantile(self, q: float) -> float:
+        """
+        Exact quantile with linear interpolation, as in ``Series.quantile``.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Quantile value, or NaN if the table is empty
+        """
+        self._sort()
+        count = self.count
+        if count == 0:
+            return float("nan")
+        cumulative = np.cumsum(self.counts)
+        rank = q * (count - 1)
+        lower, upper = np.searchsorted(cumulative, [math.floor(rank), math.ceil(rank)], "right")
+        low, high = float(self.values[lower]), float(self.values[upper])
+        return low + (high - low) * (rank - math.floor(rank))
+
+    def count_outside(self, lower: float, upper: float) -> int:
+        """
+        Count values below ``lower`` or above ``upper``.
+
+        Args:
+            lower: Lower bound
+            upper: Upper bound
+
+        Returns:
+            Number of values outside [lower, upper]
+        """
+        self._compact()
+        outside = (self.values < lower) | (self.values > upper)
+        return int(self.counts[outside].sum())
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarize the values.
+
+        Returns:
+            Dictionary with mean, median, min, max and std
+        """
+        return {
+            "mean": self.mean,
+            "median": self.median,
+            "min": self.min,
+            "max": self.max,
+            "std": self.std,
+        }
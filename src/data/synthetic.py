@@ -0,0 +1,205 @@
+"""
+Synthetic Flight Price Dataset generator for benchmarks and load testing.
+
+Produces rows with the same columns, formats and rough distributions as the
+Kaggle export, at any scale. Large files are written chunk by chunk so
+memory stays bounded by the chunk size.
+"""
+
+import logging
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.loader import DATETIME_FORMAT
+
+logger = logging.getLogger(__name__)
+
+AIRLINES = [
+    "Biman Bangladesh Airlines",
+    "US-Bangla Airlines",
+    "NovoAir",
+    "Air Astra",
+    "Emirates",
+    "Qatar Airways",
+    "Etihad Airways",
+    "FlyDubai",
+    "Air Arabia",
+    "Saudia",
+    "Turkish Airlines",
+    "Singapore Airlines",
+    "Malaysian Airlines",
+    "Thai Airways",
+    "Cathay Pacific",
+    "IndiGo",
+    "Air India",
+    "SriLankan Airlines",
+    "British Airways",
+    "Lufthansa",
+]
+
+AIRPORTS = {
+    "DAC": "Hazrat Shahjalal International Airport, Dhaka",
+    "CGP": "Shah Amanat International Airport, Chittagong",
+    "ZYL": "Osmani International Airport, Sylhet",
+    "CXB": "Cox's Bazar Airport",
+    "JSR": "Jessore Airport",
+    "RJH": "Shah Makhdum Airport, Rajshahi",
+    "SPD": "Saidpur Airport",
+    "BZL": "Barisal Airport",
+    "DXB": "Dubai International Airport",
+    "DOH": "Hamad International Airport, Doha",
+    "JED": "King Abdulaziz International Airport, Jeddah",
+    "KUL": "Kuala Lumpur International Airport",
+    "SIN": "Singapore Changi Airport",
+    "BKK": "Suvarnabhumi Airport, Bangkok",
+    "CCU": "Netaji Subhas Chandra Bose International Airport, Kolkata",
+    "IST": "Istanbul Airport",
+    "LHR": "London Heathrow Airport",
+    "JFK": "John F. Kennedy International Airport, New York",
+}
+
+DOMESTIC_AIRPORTS = ["DAC", "CGP", "ZYL", "CXB", "JSR", "RJH", "SPD", "BZL"]
+
+AIRCRAFT_TYPES = ["Boeing 737", "Boeing 777", "Boeing 787", "Airbus A320", "Airbus A350"]
+CLASSES = ["Economy", "Business", "First"]
+CLASS_WEIGHTS = [0.7, 0.22, 0.08]
+CLASS_FARE_MULTIPLIER = np.array([1.0, 2.6, 4.2])
+BOOKING_SOURCES = ["Online Website", "Travel Agency", "Direct Booking"]
+STOPOVERS = np.array(["Direct", "1 Stop", "2 Stops"])
+
+
+def _seasonality(departure: pd.DatetimeIndex) -> np.ndarray:
+    """Assign a season label from the departure month."""
+    month = departure.month.to_numpy()
+    season = np.full(len(month), "Regular", dtype=object)
+    season[np.isin(month, [12, 1])] = "Winter Holidays"
+    season[np.isin(month, [4, 6])] = "Eid"
+    season[month == 7] = "Hajj"
+    return season
+
+
+def generate_flights(rows: int, seed: Optional[int] = 42, start_row: int = 0) -> pd.DataFrame:
+    """
+    Generate synthetic flight records in the raw (string-dated) CSV layout.
+
+    Args:
+        rows: Number of rows to generate
+        seed: Random seed for reproducible output
+        start_row: Offset mixed into the seed so chunks of one file differ
+
+    Returns:
+        DataFrame with the raw dataset columns
+    """
+    rng = np.random.default_rng(None if seed is None else [seed, start_row])
+    codes = np.array(list(AIRPORTS))
+    names = np.array(list(AIRPORTS.values()))
+    domestic = np.isin(codes, DOMESTIC_AIRPORTS)
+
+    # Most departures leave from Dhaka, with a domestic-heavy destination mix
+    source_idx = np.where(
+        rng.random(rows) < 0.6,
+        np.flatnonzero(codes == "DAC")[0],
+        rng.integers(0, len(codes), rows),
+    )
+    dest_weights = np.where(domestic, 3.0, 1.0)
+    dest_idx = rng.choice(len(codes), rows, p=dest_weights / dest_weights.sum())
+    same = dest_idx == source_idx
+    dest_idx[same] = (dest_idx[same] + 1) % len(codes)
+
+    international = ~(domestic[source_idx] & domestic[dest_idx])
+    duration = np.where(
+        international, rng.uniform(2.0, 18.0, rows), rng.uniform(0.5, 1.5, rows)
+    ).round(2)
+    stops = np.where(
+        international,
+        rng.choice(3, rows, p=[0.45, 0.4, 0.15]),
+        rng.choice(3, rows, p=[0.9, 0.1, 0.0]),
+    )
+
+    departure = pd.Timestamp("2025-01-01") + pd.to_timedelta(
+        rng.integers(0, 365 * 24 * 60, rows), unit="min"
+    )
+    arrival = departure + pd.to_timedelta(duration * 3600, unit="s").round("min")
+    days_before = rng.integers(1, 91, rows)
+
+    class_idx = rng.choice(len(CLASSES), rows, p=CLASS_WEIGHTS)
+    base_fare = (
+        np.where(international, rng.lognormal(10.4, 0.5, rows), rng.lognormal(8.4, 0.3, rows))
+        * CLASS_FARE_MULTIPLIER[class_idx]
+        * (1 + 0.4 * np.exp(-days_before / 10))
+    )
+    # Stay inside the validator's fare bounds
+    base_fare = np.minimum(base_fare, 900_000).round(2)
+    tax = (base_fare * np.where(international, 0.2, 0.1)).round(2)
+
+    return pd.DataFrame(
+        {
+            "Airline": rng.choice(AIRLINES, rows),
+            "Source": codes[source_idx],
+            "Source Name": names[source_idx],
+            "Destination": codes[dest_idx],
+            "Destination Name": names[dest_idx],
+            "Departure Date & Time": departure.strftime(DATETIME_FORMAT),
+            "Arrival Date & Time": arrival.strftime(DATETIME_FORMAT),
+            "Duration (hrs)": duration,
+            "Stopovers": STOPOVERS[stops],
+            "Aircraft Type": rng.choice(AIRCRAFT_TYPES, rows),
+            "Class": np.array(CLASSES)[class_idx],
+            "Booking Source": rng.choice(BOOKING_SOURCES, rows),
+            "Base Fare (BDT)": base_fare,
+            "Tax & Surcharge (BDT)": tax,
+            "Total Fare (BDT)": (base_fare + tax).round(2),
+            "Seasonality": _seasonality(departure),
+            "Days Before Departure": days_before,
+        },
+        index=pd.RangeIndex(start_row, start_row + rows),
+    )
+
+
+def iter_synthetic_chunks(
+    rows: int, chunksize: int = 1_000_000, seed: Optional[int] = 42
+) -> Iterator[pd.DataFrame]:
+    """
+    Generate synthetic flight records chunk by chunk.
+
+    Args:
+        rows: Total number of rows
+        chunksize: Rows per chunk
+        seed: Random seed for reproducible output
+
+    Yields:
+        DataFrame chunks in the raw CSV layout
+    """
+    for start in range(0, rows, chunksize):
+        yield generate_flights(min(chunksize, rows - start), seed=seed, start_row=start)
+
+
+def write_synthetic_csv(
+    filepath: Union[str, Path],
+    rows: int,
+    chunksize: int = 1_000_000,
+    seed: Optional[int] = 42,
+) -> Path:
+    """
+    Write a synthetic dataset to CSV, streaming chunks to disk.
+
+    Args:
+        filepath: Destination CSV path
+        rows: Total number of rows (e.g. 1e5 to 1e8)
+        chunksize: Rows generated and written per chunk
+        seed: Random seed for reproducible output
+
+    Returns:
+        Path to the written CSV file
+    """
+    path = Path(filepath)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    for i, chunk in enumerate(iter_synthetic_chunks(rows, chunksize=chunksize, seed=seed)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+
+    logger.info(f"Wrote {rows:,} synthetic rows to {path}")
+    return path
@@ -5,18 +5,44 @@ Data validation module using Pandera for schema validation.
 import pandas as pd
 import pandera as pa
 from pandera import Column, Check, DataFrameSchema
-from typing import Dict, Any
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
 import logging
 
+from src.data.accumulators import FailureCaseSampler, ValidationAccumulator
+from src.data.fast_checks import FastSchemaCheck
+from src.data.loader import (
+    RAW_NUMERIC_DTYPES,
+    csv_partition,
+    iter_flight_chunks,
+    iter_partition_chunks,
+    load_raw_data,
+    plan_partitions,
+)
+from src.data.manifest import RawDataManifest
+from src.data.record_validation import RecordValidator
+
 logger = logging.getLogger(__name__)
 
 
 class FlightDataValidator:
     """Validates Flight Price Dataset against expected schema."""
 
-    def __init__(self):
-        """Initialize the validator with schema definition."""
+    def __init__(self, max_failure_cases: Optional[int] = None):
+        """
+        Initialize the validator with schema definition.
+
+        Args:
+            max_failure_cases: Maximum failure cases reported per (column, check),
+                or None to report all of them
+        """
         self.schema = self._define_schema()
+        self.fast_check = FastSchemaCheck(self.schema)
+        self.record_validator = RecordValidator(self.schema)
+        self.max_failure_cases = max_failure_cases
 
     def _define_schema(self) -> DataFrameSchema:
         """
@@ -53,15 +79,16 @@ class FlightDataValidator:
                     nullable=False,
                 ),
                 "Destination Name": Column(str, nullable=False),
-                "Departure Date & Time": Column(str, nullable=False),
-                "Arrival Date & Time": Column(str, nullable=False),
+                "Departure Date & Time": Column("datetime64[ns]", nullable=False, coerce=True),
+                "Arrival Date & Time": Column("datetime64[ns]", nullable=False, coerce=True),
                 "Duration (hrs)": Column(
-                    float,
+                    RAW_NUMERIC_DTYPES["Duration (hrs)"],
                     checks=[
                         Check.greater_than(0),
                         Check.less_than(50, error="Duration too long"),
                     ],
                     nullable=False,
+                    coerce=True,
                 ),
                 "Stopovers": Column(str, nullable=False),
                 "Aircraft Type": Column(str, nullable=True),
@@ -74,37 +101,41 @@ class FlightDataValidator:
                 ),
                 "Booking Source": Column(str, nullable=False),
                 "Base Fare (BDT)": Column(
-                    float,
+                    RAW_NUMERIC_DTYPES["Base Fare (BDT)"],
                     checks=[
                         Check.greater_than(0, error="Base fare must be positive"),
                         Check.less_than(1000000),
                     ],
                     nullable=False,
+                    coerce=True,
                 ),
                 "Tax & Surcharge (BDT)": Column(
-                    float,
+                    RAW_NUMERIC_DTYPES["Tax & Surcharge (BDT)"],
                     checks=[
                         Check.greater_than_or_equal_to(0),
                         Check.less_than(500000),
                     ],
                     nullable=False,
+                    coerce=True,
                 ),
                 "Total Fare (BDT)": Column(
-                    float,
+                    RAW_NUMERIC_DTYPES["Total Fare (BDT)"],
                     checks=[
                         Check.greater_than(0, error="Total fare must be positive"),
                         Check.less_than(1500000),
                     ],
                     nullable=False,
+                    coerce=True,
                 ),
                 "Seasonality": Column(str, nullable=False),
                 "Days Before Departure": Column(
-                    int,
+                    RAW_NUMERIC_DTYPES["Days Before Departure"],
                     checks=[
                         Check.greater_than_or_equal_to(0),
                         Check.less_than(365),
                     ],
                     nullable=False,
+                    coerce=True,
                 ),
             },
             strict=False,  # Allow additional columns during exploration
@@ -120,31 +151,202 @@ class FlightDataValidator:
         Returns:
             Dictionary with validation results
         """
-        results = {
-            "is_valid": False,
-            "errors": [],
-            "warnings": [],
-            "stats": {},
-        }
+        failures = FailureCaseSampler(self.max_failure_cases)
+        accumulator = ValidationAccumulator()
+        self._validate_chunk(df, failures, accumulator)
+        return self._build_results(failures, accumulator)
 
-        try:
-            # Attempt validation
-            _validated_df = self.schema.validate(df, lazy=True)  # noqa: F841
-            results["is_valid"] = True
-            logger.info("✅ Schema validation passed")
+    def validate_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a single record (e.g. one API request) without building a DataFrame.
 
-        except pa.errors.SchemaErrors as e:
-            results["errors"] = e.failure_cases.to_dict("records")
-            logger.error(f"❌ Schema validation failed with {len(e.failure_cases)} errors")
+        Applies the same schema checks as validate() through the compiled
+        RecordValidator; business rules and statistics need a batch and are
+        not computed.
 
-        # Additional business rule checks
-        business_warnings = self._check_business_rules(df)
-        warnings_list = results["warnings"]
-        if isinstance(warnings_list, list):
-            warnings_list.extend(business_warnings)
+        Args:
+            record: Mapping from column name to value
 
-        # Calculate statistics
-        results["stats"] = self._calculate_stats(df)
+        Returns:
+            Dictionary with is_valid and errors (Pandera-style failure cases)
+        """
+        return self.record_validator.validate(record)
+
+    def validate_stream(
+        self, filepath: Union[str, Path], chunksize: int = 100_000
+    ) -> Dict[str, Any]:
+        """
+        Validate a CSV or Parquet file chunk by chunk.
+
+        Produces the same report as loading the file and calling validate(),
+        without holding the whole dataset in memory.
+
+        Args:
+            filepath: Path to the CSV or Parquet file
+            chunksize: Number of rows per chunk
+
+        Returns:
+            Dictionary with validation results
+        """
+        return self._build_results(*self._validate_chunks(filepath, chunksize))
+
+    def validate_parallel(
+        self,
+        filepath: Union[str, Path],
+        max_workers: Optional[int] = None,
+        chunksize: int = 100_000,
+    ) -> Dict[str, Any]:
+        """
+        Validate a CSV or Parquet file across worker processes.
+
+        The file is split into row-group ranges (Parquet) or line-aligned byte
+        ranges (CSV). Each worker streams its partitions chunk by chunk, so
+        its memory follows ``chunksize`` rather than the partition size, and
+        the partial results are merged into the same report as validate().
+
+        Args:
+            filepath: Path to the CSV or Parquet file
+            max_workers: Number of worker processes (defaults to the CPU count)
+            chunksize: Number of rows per chunk within a partition
+
+        Returns:
+            Dictionary with validation results
+        """
+        return self._build_results(*self._validate_partitions(filepath, max_workers, chunksize))
+
+    def validate_incremental(
+        self,
+        filepath: Union[str, Path],
+        manifest: RawDataManifest,
+        max_workers: int = 1,
+        chunksize: int = 100_000,
+    ) -> Dict[str, Any]:
+        """
+        Validate a file, processing only the rows appended since it was last validated.
+
+        The failure cases and accumulated rules/statistics are saved with the
+        manifest. When the file only grew since then, the appended rows are
+        validated and folded into the saved state; otherwise the whole file
+        is validated (in parallel if max_workers > 1).
+
+        Args:
+            filepath: Path to the CSV or Parquet file
+            manifest: Raw data manifest the file is recorded in
+            max_workers: Worker processes for a full validation
+            chunksize: Number of rows per chunk
+
+        Returns:
+            Dictionary with validation results
+        """
+        saved = manifest.load_state(filepath, "validation")
+        if saved is None:
+            if max_workers > 1:
+                failures, accumulator = self._validate_partitions(filepath, max_workers, chunksize)
+            else:
+                failures, accumulator = self._validate_chunks(filepath, chunksize)
+        else:
+            (failures, accumulator), start = saved
+            if start < Path(filepath).stat().st_size:
+                logger.info(f"Validating the rows appended to {filepath}")
+                # Appended rows are numbered after the rows already validated
+                offset = accumulator.total_rows
+                for chunk in iter_partition_chunks(
+                    csv_partition(filepath, start),
+                    chunksize=chunksize,
+                    errors="ignore",
+                    compact=False,
+                ):
+                    chunk.index = chunk.index + offset
+                    self._validate_chunk(chunk, failures, accumulator)
+
+        manifest.save_state(filepath, "validation", (failures, accumulator))
+        return self._build_results(failures, accumulator)
+
+    def _validate_chunks(
+        self, filepath: Union[str, Path], chunksize: int
+    ) -> Tuple[FailureCaseSampler, ValidationAccumulator]:
+        """Validate a file chunk by chunk, returning the unbuilt partial results."""
+        failures = FailureCaseSampler(self.max_failure_cases)
+        accumulator = ValidationAccumulator()
+
+        for chunk in iter_flight_chunks(
+            filepath, chunksize=chunksize, errors="ignore", compact=False
+        ):
+            self._validate_chunk(chunk, failures, accumulator)
+
+        return failures, accumulator
+
+    def _validate_partitions(
+        self, filepath: Union[str, Path], max_workers: Optional[int], chunksize: int
+    ) -> Tuple[FailureCaseSampler, ValidationAccumulator]:
+        """Validate a file's partitions in worker processes and merge the partial results."""
+        max_workers = max_workers or os.cpu_count() or 1
+        # Several partitions per worker keep the pool busy when partitions are uneven
+        partitions = plan_partitions(filepath, num_partitions=max_workers * 4)
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            partials = executor.map(
+                _validate_partition,
+                partitions,
+                repeat(self.max_failure_cases),
+                repeat(chunksize),
+            )
+
+            failures = FailureCaseSampler(self.max_failure_cases)
+            accumulator = ValidationAccumulator()
+            for part_failures, part_accumulator in partials:
+                failures.merge(part_failures.shift_index(accumulator.total_rows))
+                accumulator.merge(part_accumulator)
+
+        return failures, accumulator
+
+    def _validate_chunk(
+        self, df: pd.DataFrame, failures: FailureCaseSampler, accumulator: ValidationAccumulator
+    ) -> None:
+        """
+        Run the schema on one chunk and fold it into the running results.
+
+        The categorical fast path decides most chunks on its own; Pandera only
+        runs when it cannot vouch for the chunk, to build the error report.
+
+        Args:
+            df: DataFrame chunk to validate
+            failures: Sampler collecting schema failure cases
+            accumulator: Accumulator collecting business rules and statistics
+        """
+        if not self.fast_check.is_valid(df):
+            try:
+                self.schema.validate(df, lazy=True)
+            except pa.errors.SchemaErrors as e:
+                failures.update(e.failure_cases)
+
+        accumulator.update(df)
+
+    def _build_results(
+        self, failures: FailureCaseSampler, accumulator: ValidationAccumulator
+    ) -> Dict[str, Any]:
+        """
+        Build the validation results dictionary from merged partial results.
+
+        Args:
+            failures: Sampler holding schema failure cases
+            accumulator: Accumulator holding business rules and statistics
+
+        Returns:
+            Dictionary with validation results
+        """
+        errors = failures.result()
+        results = {
+            "is_valid": not errors,
+            "errors": errors,
+            "warnings": accumulator.business_warnings(),
+            "stats": accumulator.stats(),
+        }
+
+        if errors:
+            logger.error(f"❌ Schema validation failed with {len(errors)} errors")
+        else:
+            logger.info("✅ Schema validation passed")
 
         return results
 
@@ -158,56 +360,7 @@ class FlightDataValidator:
         Returns:
             List of warnings
         """
-        warnings = []
-
-        # Check if Total Fare = Base Fare + Tax & Surcharge (within tolerance)
-        if all(
-            col in df.columns
-            for col in ["Base Fare (BDT)", "Tax & Surcharge (BDT)", "Total Fare (BDT)"]
-        ):
-            calculated_total = df["Base Fare (BDT)"] + df["Tax & Surcharge (BDT)"]
-            diff = abs(calculated_total - df["Total Fare (BDT)"])
-            mismatches = (diff > 1.0).sum()  # Allow 1 BDT tolerance for rounding
-
-            if mismatches > 0:
-                warnings.append(
-                    {
-                        "rule": "Total Fare Calculation",
-                        "message": f"{mismatches} rows have Total Fare != Base Fare + Tax",
-                        "severity": "warning",
-                    }
-                )
-
-        # Check for duplicate flights
-        duplicate_cols = ["Airline", "Source", "Destination", "Departure Date & Time"]
-        if all(col in df.columns for col in duplicate_cols):
-            duplicates = df.duplicated(subset=duplicate_cols).sum()
-            if duplicates > 0:
-                warnings.append(
-                    {
-                        "rule": "Duplicate Flights",
-                        "message": f"{duplicates} potential duplicate flight records found",
-                        "severity": "info",
-                    }
-                )
-
-        # Check for unusual fare patterns
-        if "Total Fare (BDT)" in df.columns:
-            median_fare = df["Total Fare (BDT)"].median()
-            outliers = (
-                (df["Total Fare (BDT)"] > median_fare * 10)
-                | (df["Total Fare (BDT)"] < median_fare * 0.1)
-            ).sum()
-            if outliers > 0:
-                warnings.append(
-                    {
-                        "rule": "Fare Outliers",
-                        "message": f"{outliers} rows with extreme fares (10x or 0.1x median)",
-                        "severity": "info",
-                    }
-                )
-
-        return warnings
+        return ValidationAccumulator().update(df).business_warnings()
 
     def _calculate_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -219,31 +372,49 @@ class FlightDataValidator:
         Returns:
             Dictionary of statistics
         """
-        stats = {
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "missing_values": df.isnull().sum().to_dict(),
-            "duplicate_rows": df.duplicated().sum(),
-        }
+        return ValidationAccumulator().update(df).stats()
 
-        if "Total Fare (BDT)" in df.columns:
-            stats["fare_stats"] = {
-                "mean": float(df["Total Fare (BDT)"].mean()),
-                "median": float(df["Total Fare (BDT)"].median()),
-                "min": float(df["Total Fare (BDT)"].min()),
-                "max": float(df["Total Fare (BDT)"].max()),
-                "std": float(df["Total Fare (BDT)"].std()),
-            }
 
-        return stats
+def _validate_partition(
+    partition: Dict[str, Any], max_failure_cases: Optional[int], chunksize: int
+) -> Tuple[FailureCaseSampler, ValidationAccumulator]:
+    """
+    Validate one file partition inside a worker process.
 
+    Args:
+        partition: Partition descriptor from plan_partitions
+        max_failure_cases: Maximum failure cases kept per check
+        chunksize: Number of rows per chunk
 
-def validate_raw_data(filepath: str) -> Dict[str, Any]:
+    Returns:
+        Failure cases (with partition-local row indices) and accumulated rules/stats
+    """
+    # The schema holds lambdas, so each worker builds its own validator
+    validator = FlightDataValidator(max_failure_cases)
+    failures = FailureCaseSampler(max_failure_cases)
+    accumulator = ValidationAccumulator()
+
+    for chunk in iter_partition_chunks(
+        partition, chunksize=chunksize, errors="ignore", compact=False
+    ):
+        validator._validate_chunk(chunk, failures, accumulator)
+
+    return failures, accumulator
+
+
+def validate_raw_data(
+    filepath: str, max_workers: int = 1, manifest: Optional[RawDataManifest] = None
+) -> Dict[str, Any]:
     """
     Main function to validate raw flight data.
 
     Args:
         filepath: Path to the CSV file
+        max_workers: Number of worker processes; above 1 the file is validated
+            in parallel partitions instead of being loaded whole
+        manifest: Raw data manifest; results are reused while the file is
+            unchanged since it was ingested, and only appended rows are
+            validated when it grew
 
     Returns:
         Validation results dictionary
@@ -252,13 +423,27 @@ def validate_raw_data(filepath: str) -> Dict[str, Any]:
         level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
 
-    logger.info(f"Loading data from {filepath}")
-    df = pd.read_csv(filepath)
+    results = manifest.get_result(filepath, "validation") if manifest else None
 
-    logger.info(f"Dataset shape: {df.shape}")
+    if results is not None:
+        logger.info(f"{filepath} is unchanged, using cached validation results")
+    else:
+        validator = FlightDataValidator()
 
-    validator = FlightDataValidator()
-    results = validator.validate(df)
+        if manifest is not None:
+            # Resumes from the saved state when rows were only appended
+            results = validator.validate_incremental(filepath, manifest, max_workers=max_workers)
+        elif max_workers > 1:
+            logger.info(f"Validating {filepath} with {max_workers} workers")
+            results = validator.validate_parallel(filepath, max_workers=max_workers)
+        else:
+            logger.info(f"Loading data from {filepath}")
+            df = load_raw_data(filepath, errors="ignore", compact=False)
+            logger.info(f"Dataset shape: {df.shape}")
+            results = validator.validate(df)
+
+        if manifest is not None:
+            manifest.set_result(filepath, "validation", results)
 
     # Print summary
     print("\n" + "=" * 60)
@@ -290,4 +475,6 @@ def validate_raw_data(filepath: str) -> Dict[str, Any]:
 
 
 if __name__ == "__main__":
-    results = validate_raw_data("data/01-raw/Flight_Price_Dataset_of_Bangladesh.csv")
+    results = validate_raw_data(
+        "data/01-raw/Flight_Price_Dataset_of_Bangladesh.csv", manifest=RawDataManifest()
+    )
@@ -0,0 +1 @@
+"""Feature engineering package for Flight Fare Prediction."""
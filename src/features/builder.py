@@ -0,0 +1,59 @@
+"""
+Model feature matrix shared by training, batch scoring and the API.
+
+Every consumer builds features through build_features, so the same raw
+columns always produce the same float32 matrix: the encoder registry's
+int32 codes, the numeric columns and the temporal features.
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from src.data.loader import DATETIME_COLUMNS, DATETIME_FORMAT
+from src.features.encoding import ENCODED_COLUMNS, EncoderRegistry
+from src.features.temporal import TEMPORAL_FEATURES, temporal_features
+
+TARGET_COLUMN = "Total Fare (BDT)"
+
+NUMERIC_FEATURES = ["Duration (hrs)", "Days Before Departure"]
+
+# Raw columns a prediction needs
+INPUT_COLUMNS: List[str] = ENCODED_COLUMNS + DATETIME_COLUMNS + NUMERIC_FEATURES
+
+FEATURE_COLUMNS: List[str] = ENCODED_COLUMNS + NUMERIC_FEATURES + TEMPORAL_FEATURES
+
+
+def build_features(df: pd.DataFrame, registry: EncoderRegistry) -> pd.DataFrame:
+    """
+    Build the model features of a DataFrame of flights.
+
+    Args:
+        df: DataFrame with the INPUT_COLUMNS; datetime columns may be
+            datetime64 or text in DATETIME_FORMAT
+        registry: Fitted encoder registry (covering ENCODED_COLUMNS)
+
+    Returns:
+        float32 DataFrame with the FEATURE_COLUMNS, indexed like ``df``
+    """
+    dates = {
+        col: pd.to_datetime(df[col], format=DATETIME_FORMAT)
+        for col in DATETIME_COLUMNS
+        if not pd.api.types.is_datetime64_any_dtype(df[col])
+    }
+    if dates:
+        df = df.assign(**dates)
+
+    matrix = np.empty((len(df), len(FEATURE_COLUMNS)), dtype=np.float32)
+    for j, column in enumerate(ENCODED_COLUMNS):
+        matrix[:, j] = registry[column].encode(df[column])
+    offset = len(ENCODED_COLUMNS)
+    for j, column in enumerate(NUMERIC_FEATURES, offset):
+        matrix[:, j] = df[column].to_numpy(dtype=np.float32)
+    offset += len(NUMERIC_FEATURES)
+    temporal = temporal_features(df)
+    for j, column in enumerate(TEMPORAL_FEATURES, offset):
+        matrix[:, j] = temporal[column].to_numpy(dtype=np.float32)
+
+    return pd.DataFrame(matrix, columns=FEATURE_COLUMNS, index=df.index)
@@ -0,0 +1,316 @@
+"""
+Dictionary encoding of the categorical flight columns into stable int32 codes.
+
+Each column has a CategoryEncoder holding its vocabulary: code 0 is the
+unknown bucket (unseen, rare or missing values) and known values get codes
+1..n in sorted order. Refitting on newer data only appends values, so
+existing codes never change, and training and serving share the persisted
+registry, so both produce identical codes.
+
+Encoding is a lookup, never a get_dummies:
+
+- categorical columns map their few categories through the vocabulary once
+  and gather codes with one array index
+- other batches (request payloads) look values up in a dict
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.loader import iter_flight_chunks
+from src.data.manifest import current_file_hash
+
+logger = logging.getLogger(__name__)
+
+FEATURES_DIR = Path("data/03-features")
+ENCODERS_NAME = "encoders.json"
+
+ENCODED_COLUMNS = [
+    "Airline",
+    "Source",
+    "Destination",
+    "Class",
+    "Stopovers",
+    "Booking Source",
+    "Seasonality",
+]
+
+UNKNOWN_CODE = 0
+
+
+class CategoryEncoder:
+    """Vocabulary of one categorical column, mapping values to int32 codes."""
+
+    def __init__(self, vocabulary: Optional[Sequence[str]] = None):
+        """
+        Initialize the encoder.
+
+        Args:
+            vocabulary: Known values; the value at position i gets code i + 1
+        """
+        self.vocabulary: List[str] = list(vocabulary or [])
+        self._codes: Dict[str, int] = {value: i + 1 for i, value in enumerate(self.vocabulary)}
+
+    def __len__(self) -> int:
+        """Number of codes, including the unknown bucket."""
+        return len(self.vocabulary) + 1
+
+    @property
+    def codes(self) -> Dict[str, int]:
+        """Lookup table from value to code (without the unknown bucket)."""
+        return self._codes
+
+    def extend(self, values: Iterable[Any]) -> "CategoryEncoder":
+        """
+        Append unseen values to the vocabulary, keeping existing codes.
+
+        Args:
+            values: Values to add; new ones are appended in sorted order
+
+        Returns:
+            self, for chaining
+        """
+        new = sorted({str(value) for value in values if pd.notna(value)} - self._codes.keys())
+        for value in new:
+            self.vocabulary.append(value)
+            self._codes[value] = len(self.vocabulary)
+        return self
+
+    def encode(self, values: Union[pd.Series, Sequence[Any]]) -> np.ndarray:
+        """
+        Map values to codes, unknown and missing values to UNKNOWN_CODE.
+
+        Args:
+            values: Series (categorical is fastest) or sequence of values
+
+        Returns:
+            int32 array of codes
+        """
+        if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+            categories = values.cat.categories
+            # One extra slot at the end, so that code -1 (missing) maps to unknown
+            lookup = np.zeros(len(categories) + 1, dtype=np.int32)
+            lookup[:-1] = [self._codes.get(str(value), UNKNOWN_CODE) for value in categories]
+            return lookup[values.cat.codes.to_numpy()]
+
+        get = self._codes.get
+        return np.fromiter(
+            (get(value, UNKNOWN_CODE) for value in values), dtype=np.int32, count=len(values)
+        )
+
+    def decode(self, codes: Union[np.ndarray, Sequence[int]]) -> np.ndarray:
+        """
+        Map codes back to values, the unknown code to None.
+
+        Args:
+            codes: Codes produced by encode()
+
+        Returns:
+            Object array of values
+        """
+        values = np.array([None] + self.vocabulary, dtype=object)
+        return values[np.asarray(codes)]
+
+
+class EncoderRegistry:
+    """CategoryEncoders of the encoded columns, fitted, persisted and applied together."""
+
+    def __init__(
+        self,
+        encoders: Optional[Mapping[str, CategoryEncoder]] = None,
+        source_hash: Optional[str] = None,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            encoders: Encoder per column
+            source_hash: SHA256 of the data file the vocabularies were learned from
+        """
+        self.encoders: Dict[str, CategoryEncoder] = dict(encoders or {})
+        self.source_hash = source_hash
+
+    def __getitem__(self, column: str) -> CategoryEncoder:
+        """Encoder of a column."""
+        return self.encoders[column]
+
+    @property
+    def columns(self) -> List[str]:
+        """Encoded columns, in registry order."""
+        return list(self.encoders)
+
+    def fit_counts(self, counts: Mapping[str, pd.Series], min_count: int = 1) -> "EncoderRegistry":
+        """
+        Learn vocabularies from per-column value counts.
+
+        Args:
+            counts: Value counts (Series indexed by value) per column
+            min_count: Values seen fewer times are left in the unknown bucket
+
+        Returns:
+            self, for chaining
+        """
+        for column, column_counts in counts.items():
+            frequent = column_counts.index[column_counts.to_numpy() >= min_count]
+            self.encoders.setdefault(column, CategoryEncoder()).extend(frequent)
+        return self
+
+    def fit_file(
+        self,
+        filepath: Union[str, Path],
+        columns: Sequence[str] = ENCODED_COLUMNS,
+        min_count: int = 1,
+        chunksize: int = 500_000,
+    ) -> "EncoderRegistry":
+        """
+        Learn vocabularies from a data file, reading only the encoded columns.
+
+        Args:
+            filepath: Path to the raw CSV (or Parquet) file
+            columns: Columns to encode
+            min_count: Values seen fewer times are left in the unknown bucket
+            chunksize: Rows read at a time
+
+        Returns:
+            self, for chaining
+        """
+        counts: Dict[str, pd.Series] = {}
+        for chunk in iter_flight_chunks(filepath, chunksize=chunksize, columns=list(columns)):
+            for column in columns:
+                chunk_counts = chunk[column].value_counts()
+                if column in counts:
+                    chunk_counts = counts[column].add(chunk_counts, fill_value=0)
+                counts[column] = chunk_counts
+        self.source_hash = current_file_hash(filepath)
+        return self.fit_counts({col: counts[col] for col in columns if col in counts}, min_count)
+
+    def encode_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Encode the registry's columns of a DataFrame.
+
+        Args:
+            df: DataFrame with (at least) the encoded columns
+
+        Returns:
+            DataFrame of int32 codes with the same index
+        """
+        return pd.DataFrame(
+            {column: encoder.encode(df[column]) for column, encoder in self.encoders.items()},
+            index=df.index,
+        )
+
+    def encode_records(self, records: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """
+        Encode a batch of records (e.g. API request payloads).
+
+        Args:
+            records: Mappings from column name to value; missing keys are unknown
+
+        Returns:
+            int32 array of shape (len(records), len(columns))
+        """
+        lookups = [(column, encoder.codes.get) for column, encoder in self.encoders.items()]
+        codes = [
+            [get(record.get(column), UNKNOWN_CODE) for column, get in lookups] for record in records
+        ]
+        return np.array(codes, dtype=np.int32).reshape(len(records), len(lookups))
+
+    def save(self, directory: Union[str, Path] = FEATURES_DIR, name: str = ENCODERS_NAME) -> Path:
+        """
+        Persist the vocabularies as JSON.
+
+        Args:
+            directory: Output directory
+            name: File name
+
+        Returns:
+            Path to the JSON file
+        """
+        path = Path(directory) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "source_hash": self.source_hash,
+            "unknown_code": UNKNOWN_CODE,
+            "vocabularies": {col: enc.vocabulary for col, enc in self.encoders.items()},
+        }
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(path)
+        logger.info(f"Saved encoders for {len(self.encoders)} columns to {path}")
+        return path
+
+    @classmethod
+    def load(
+        cls, directory: Union[str, Path] = FEATURES_DIR, name: str = ENCODERS_NAME
+    ) -> "EncoderRegistry":
+        """
+        Load a registry saved with save().
+
+        Args:
+            directory: Directory holding the registry file
+            name: File name
+
+        Returns:
+            The loaded EncoderRegistry
+        """
+        with open(Path(directory) / name) as f:
+            state = json.load(f)
+        encoders = {
+            column: CategoryEncoder(vocabulary)
+            for column, vocabulary in state["vocabularies"].items()
+        }
+        return cls(encoders, source_hash=state.get("source_hash"))
+
+
+def fit_encoders(
+    filepath: Union[str, Path],
+    directory: Union[str, Path] = FEATURES_DIR,
+    columns: Sequence[str] = ENCODED_COLUMNS,
+    min_count: int = 1,
+) -> EncoderRegistry:
+    """
+    Load the encoder registry, extending and saving it if the data file changed.
+
+    An existing registry is extended rather than refitted, so codes already
+    used by trained models stay valid.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        directory: Directory holding the registry file
+        columns: Columns to encode
+        min_count: Values seen fewer times are left in the unknown bucket
+
+    Returns:
+        Fitted EncoderRegistry
+    """
+    source_hash = current_file_hash(filepath)
+    registry = EncoderRegistry()
+    if (Path(directory) / ENCODERS_NAME).exists():
+        registry = EncoderRegistry.load(directory)
+        if registry.source_hash == source_hash and set(columns) <= set(registry.columns):
+            return registry
+
+    logger.info(f"Fitting categorical encoders on {filepath}")
+    registry.fit_file(filepath, columns=columns, min_count=min_count)
+    registry.save(directory)
+    return registry
+
+
+def main():
+    """Fit the encoders on the raw dataset."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    registry = fit_encoders("data/01-raw/Flight_Price_Dataset_of_Bangladesh.csv")
+    for column in registry.columns:
+        print(f"{column:<20} {len(registry[column]) - 1:>6,} values")
+
+
+if __name__ == "__main__":
+    main()
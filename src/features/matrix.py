@@ -0,0 +1,278 @@
+"""
+Cached training matrices: the encoded feature matrix and target on disk.
+
+Building features means reading and parsing the whole raw file and encoding
+every row, which costs far more than loading a finished matrix. The float32
+design matrix (FEATURE_COLUMNS order) and target are therefore written once
+as .npy files and opened as read-only memory maps:
+
+    data/03-features/matrices/<file stem>.<source sha256[:16]>.<config key>/
+        X.npy
+        y.npy
+        matrix.json
+
+The directory is keyed by the raw file's SHA256 and a hash of the feature
+configuration (feature columns, encoder vocabularies, holiday calendar and
+other temporal constants, row filter and order seed), so any change to the
+data or the features builds a new matrix. Processes opening the same matrix
+share the operating system's page cache instead of holding private copies:
+trials run in parallel workers (joblib passes memory maps by file name) add
+no memory per worker.
+
+Rows are stored in a random order fixed by the seed, so a validation set,
+cross-validation folds and the growing training prefixes of successive
+halving are all contiguous slices, i.e. memory-map views rather than copies.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+import numpy as np
+
+from src.data.loader import iter_flight_chunks
+from src.data.manifest import current_file_hash
+from src.features.builder import (
+    FEATURE_COLUMNS,
+    INPUT_COLUMNS,
+    TARGET_COLUMN,
+    build_features,
+)
+from src.features.encoding import FEATURES_DIR, EncoderRegistry, fit_encoders
+from src.features.temporal import (
+    DURATION_TOLERANCE_HRS,
+    EID_DATES,
+    HOLIDAY_YEAR_MARGIN,
+    NATIONAL_HOLIDAYS,
+    RED_EYE_END_HOUR,
+    RED_EYE_START_HOUR,
+    WEEKEND_DAYS,
+)
+
+logger = logging.getLogger(__name__)
+
+MATRIX_DIR = FEATURES_DIR / "matrices"
+METADATA_FILENAME = "matrix.json"
+
+MATRIX_DTYPE = np.float32
+
+
+def feature_config(registry: EncoderRegistry, seed: int = 42) -> Dict[str, Any]:
+    """
+    Everything besides the raw data that determines the cached matrix.
+
+    Args:
+        registry: Encoder registry used to encode the categorical columns
+        seed: Seed of the stored row order
+
+    Returns:
+        JSON-serializable feature configuration
+    """
+    return {
+        "feature_columns": FEATURE_COLUMNS,
+        "target": TARGET_COLUMN,
+        # Older matrices kept the rows without a target
+        "rows": "with target",
+        "dtype": np.dtype(MATRIX_DTYPE).name,
+        "vocabularies": {column: registry[column].vocabulary for column in registry.columns},
+        "national_holidays": NATIONAL_HOLIDAYS,
+        "eid_dates": EID_DATES,
+        "holiday_year_margin": HOLIDAY_YEAR_MARGIN,
+        "weekend_days": WEEKEND_DAYS,
+        "red_eye_hours": [RED_EYE_START_HOUR, RED_EYE_END_HOUR],
+        "duration_tolerance_hrs": DURATION_TOLERANCE_HRS,
+        "seed": seed,
+    }
+
+
+def feature_config_hash(config: Dict[str, Any]) -> str:
+    """Short stable hash of a feature configuration."""
+    payload = json.dumps(config, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def matrix_path(
+    filepath: Union[str, Path],
+    registry: EncoderRegistry,
+    seed: int = 42,
+    cache_dir: Union[str, Path] = MATRIX_DIR,
+) -> Path:
+    """
+    Directory of the cached matrix of a data file and feature configuration.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        registry: Encoder registry used to encode the categorical columns
+        seed: Seed of the stored row order
+        cache_dir: Directory holding cached matrices
+
+    Returns:
+        Path to the matrix directory (which may not exist yet)
+    """
+    filepath = Path(filepath)
+    source_hash = current_file_hash(filepath)
+    config_hash = feature_config_hash(feature_config(registry, seed))
+    return Path(cache_dir) / f"{filepath.stem}.{source_hash[:16]}.{config_hash}"
+
+
+def count_target_rows(filepath: Union[str, Path], chunksize: int = 500_000) -> int:
+    """
+    Count the rows of a data file that have a valid target.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        chunksize: Rows read at a time
+
+    Returns:
+        Number of rows whose target is present and numeric
+    """
+    return sum(
+        int(chunk[TARGET_COLUMN].notna().sum())
+        for chunk in iter_flight_chunks(
+            filepath, chunksize=chunksize, columns=[TARGET_COLUMN], errors="coerce"
+        )
+    )
+
+
+def build_feature_matrix(
+    filepath: Union[str, Path],
+    registry: EncoderRegistry,
+    seed: int = 42,
+    cache_dir: Union[str, Path] = MATRIX_DIR,
+    chunksize: int = 500_000,
+    force: bool = False,
+) -> Path:
+    """
+    Build the cached feature matrix and target of a data file.
+
+    Malformed values are read as missing: rows without a target are left
+    out, and missing inputs become NaN features (imputed by the models).
+    The rows with a target are counted first, reading only that column, so
+    X.npy and y.npy can be preallocated as memory maps; each chunk's
+    features are then written straight to its rows' shuffled positions, and
+    memory use stays at one chunk. The matrix is written to a temporary
+    directory and renamed into place, so readers never see a partial matrix.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        registry: Fitted encoder registry
+        seed: Seed of the stored row order
+        cache_dir: Directory holding cached matrices
+        chunksize: Rows processed at a time
+        force: Rebuild even if the matrix is cached
+
+    Returns:
+        Path to the matrix directory
+    """
+    filepath = Path(filepath)
+    output_dir = matrix_path(filepath, registry, seed, cache_dir)
+    if not force and (output_dir / METADATA_FILENAME).exists():
+        logger.info(f"{output_dir} is up to date with {filepath}")
+        return output_dir
+
+    n_rows = count_target_rows(filepath, chunksize)
+    if n_rows == 0:
+        raise ValueError(f"No rows to build features from in {filepath}")
+    # Row i of the file is stored at position order[i]
+    order = np.random.default_rng(seed).permutation(n_rows)
+
+    tmp_dir = output_dir.with_name(f"{output_dir.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    try:
+        X = np.lib.format.open_memmap(
+            tmp_dir / "X.npy", mode="w+", dtype=MATRIX_DTYPE, shape=(n_rows, len(FEATURE_COLUMNS))
+        )
+        y = np.lib.format.open_memmap(
+            tmp_dir / "y.npy", mode="w+", dtype=MATRIX_DTYPE, shape=(n_rows,)
+        )
+        rows = rows_read = 0
+        columns = INPUT_COLUMNS + [TARGET_COLUMN]
+        for chunk in iter_flight_chunks(
+            filepath, chunksize=chunksize, columns=columns, errors="coerce"
+        ):
+            rows_read += len(chunk)
+            chunk = chunk[chunk[TARGET_COLUMN].notna().to_numpy()]
+            if rows + len(chunk) > n_rows:
+                raise ValueError(f"{filepath} has more rows than the {n_rows:,} counted")
+            positions = order[rows : rows + len(chunk)]
+            X[positions] = build_features(chunk, registry).to_numpy()
+            y[positions] = chunk[TARGET_COLUMN].to_numpy(dtype=MATRIX_DTYPE)
+            rows += len(chunk)
+        if rows != n_rows:
+            raise ValueError(f"Read {rows:,} rows from {filepath}, counted {n_rows:,}")
+        X.flush()
+        y.flush()
+        del X, y
+
+        metadata = {
+            "source": str(filepath),
+            "source_sha256": current_file_hash(filepath),
+            "rows": n_rows,
+            "rows_without_target": rows_read - n_rows,
+            "config": feature_config(registry, seed),
+        }
+        with open(tmp_dir / METADATA_FILENAME, "w") as f:
+            json.dump(metadata, f, indent=2, default=str)
+
+        if force:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        try:
+            tmp_dir.rename(output_dir)
+        except OSError:
+            # Another process finished the same matrix first; both are identical
+            if not (output_dir / METADATA_FILENAME).exists():
+                raise
+            logger.info(f"{output_dir} was built concurrently, keeping that copy")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    logger.info(f"Cached the {n_rows:,} x {len(FEATURE_COLUMNS)} feature matrix at {output_dir}")
+    return output_dir
+
+
+def load_feature_matrix(
+    filepath: Union[str, Path],
+    registry: EncoderRegistry,
+    seed: int = 42,
+    cache_dir: Union[str, Path] = MATRIX_DIR,
+    chunksize: int = 500_000,
+) -> Tuple[np.memmap, np.memmap]:
+    """
+    Open the cached feature matrix of a data file, building it if missing.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        registry: Fitted encoder registry
+        seed: Seed of the stored row order
+        cache_dir: Directory holding cached matrices
+        chunksize: Rows processed at a time when building
+
+    Returns:
+        Read-only memory-mapped float32 feature matrix (FEATURE_COLUMNS
+        order) and target, rows in the seed's random order
+    """
+    output_dir = build_feature_matrix(
+        filepath, registry, seed=seed, cache_dir=cache_dir, chunksize=chunksize
+    )
+    X = np.load(output_dir / "X.npy", mmap_mode="r")
+    y = np.load(output_dir / "y.npy", mmap_mode="r")
+    return X, y
+
+
+def main():
+    """Build the feature matrix of the raw dataset."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    filepath = "data/01-raw/Flight_Price_Dataset_of_Bangladesh.csv"
+    X, y = load_feature_matrix(filepath, fit_encoders(filepath))
+    print(f"Feature matrix: {X.shape[0]:,} rows x {X.shape[1]} features")
+
+
+if __name__ == "__main__":
+    main()
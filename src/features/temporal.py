@@ -0,0 +1,279 @@
+"""
+Temporal features from the departure and arrival timestamps.
+
+The two datetime columns are parsed once by the loader (with the fixed
+DATETIME_FORMAT) and every feature is derived with vectorized datetime64
+arithmetic on the underlying integer minutes: no row-wise apply and no
+per-row Python objects, so millions of bookings take seconds.
+
+Features (Monday is weekday 0; Bangladesh's weekend is Friday and Saturday):
+
+- Departure Hour / Departure Weekday / Departure Month / Arrival Hour
+- Is Weekend: departure on a Friday or Saturday
+- Is Public Holiday: departure on a national holiday or Eid day
+- Days To Holiday: distance in days to the nearest such holiday
+- Is Red Eye: departure between RED_EYE_START_HOUR and RED_EYE_END_HOUR
+- Is Overnight: arrival on a later calendar day than departure
+- Scheduled Duration (hrs): arrival minus departure
+- Duration Mismatch: Scheduled Duration disagrees with "Duration (hrs)"
+
+Rows with a missing departure get -1 for the integer features and False for
+the flags.
+"""
+
+import logging
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.loader import iter_flight_chunks
+from src.data.manifest import current_file_hash
+
+logger = logging.getLogger(__name__)
+
+FEATURES_DIR = Path("data/03-features")
+
+TEMPORAL_SOURCE_COLUMNS = ["Departure Date & Time", "Arrival Date & Time", "Duration (hrs)"]
+
+TEMPORAL_FEATURES = [
+    "Departure Hour",
+    "Departure Weekday",
+    "Departure Month",
+    "Arrival Hour",
+    "Is Weekend",
+    "Is Public Holiday",
+    "Days To Holiday",
+    "Is Red Eye",
+    "Is Overnight",
+    "Scheduled Duration (hrs)",
+    "Duration Mismatch",
+]
+
+# Fixed-date national holidays in Bangladesh, as (month, day)
+NATIONAL_HOLIDAYS: List[Tuple[int, int]] = [
+    (2, 21),  # Shaheed Day / International Mother Language Day
+    (3, 26),  # Independence Day
+    (4, 14),  # Pohela Boishakh (Bengali New Year)
+    (5, 1),  # May Day
+    (12, 16),  # Victory Day
+    (12, 25),  # Christmas Day
+]
+
+# Eid al-Fitr and Eid al-Adha as observed in Bangladesh (lunar, so listed per
+# year; dates from 2026 on are estimates and should be updated when announced)
+EID_DATES = [
+    "2023-04-22",
+    "2023-06-29",
+    "2024-04-11",
+    "2024-06-17",
+    "2025-03-31",
+    "2025-06-07",
+    "2026-03-21",
+    "2026-05-27",
+]
+
+WEEKEND_DAYS = [4, 5]  # Friday, Saturday
+RED_EYE_START_HOUR = 22
+RED_EYE_END_HOUR = 6
+DURATION_TOLERANCE_HRS = 0.1
+# Years of holidays generated on each side of a departure year: the nearest
+# holiday can fall in the previous or next year
+HOLIDAY_YEAR_MARGIN = 1
+
+MINUTES_PER_DAY = 24 * 60
+# 1970-01-01 was a Thursday
+EPOCH_WEEKDAY = 3
+
+
+def _minutes(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Minutes since the epoch of a datetime column, and a mask of missing values."""
+    stamps = values.to_numpy(dtype="datetime64[ns]")
+    return stamps.astype("datetime64[m]").view(np.int64), np.isnat(stamps)
+
+
+def holiday_days(years: Iterable[int], eid_dates: Iterable[str] = EID_DATES) -> np.ndarray:
+    """
+    Sorted holiday dates as days since the epoch.
+
+    Args:
+        years: Years to generate the fixed-date national holidays for
+        eid_dates: Additional holiday dates ("YYYY-MM-DD")
+
+    Returns:
+        Sorted int64 array of unique day numbers
+    """
+    dates = [
+        f"{year:04d}-{month:02d}-{day:02d}" for year in years for month, day in NATIONAL_HOLIDAYS
+    ]
+    dates += list(eid_dates)
+    return np.unique(np.array(dates, dtype="datetime64[D]").view(np.int64))
+
+
+def _days_to_nearest(days: np.ndarray, holidays: np.ndarray) -> np.ndarray:
+    """Absolute distance in days from each day to the nearest holiday."""
+    if len(holidays) < 2:
+        return np.abs(days - holidays[0]) if len(holidays) else np.full(len(days), -1)
+    right = np.searchsorted(holidays, days).clip(1, len(holidays) - 1)
+    before = np.abs(days - holidays[right - 1])
+    after = np.abs(holidays[right] - days)
+    return np.minimum(before, after)
+
+
+def temporal_features(df: pd.DataFrame, eid_dates: Iterable[str] = EID_DATES) -> pd.DataFrame:
+    """
+    Derive the temporal features of a DataFrame of flights.
+
+    Args:
+        df: DataFrame with the datetime64 departure and arrival columns and
+            "Duration (hrs)"
+        eid_dates: Eid (or other movable holiday) dates to flag
+
+    Returns:
+        DataFrame of features with the same index as ``df``
+    """
+    departure, missing = _minutes(df["Departure Date & Time"])
+    arrival, missing_arrival = _minutes(df["Arrival Date & Time"])
+    valid = ~missing
+
+    day = departure // MINUTES_PER_DAY
+    hour = (departure - day * MINUTES_PER_DAY) // 60
+    arrival_day = arrival // MINUTES_PER_DAY
+    arrival_hour = (arrival - arrival_day * MINUTES_PER_DAY) // 60
+    weekday = (day + EPOCH_WEEKDAY) % 7
+    months = df["Departure Date & Time"].to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+    month_index = months.view(np.int64)
+    month = month_index % 12 + 1
+
+    # Covering the neighbouring years keeps a row's features independent of its batch
+    years = np.unique(month_index[valid] // 12 + 1970)
+    margin = np.arange(-HOLIDAY_YEAR_MARGIN, HOLIDAY_YEAR_MARGIN + 1)
+    holiday_years = np.unique(years[:, None] + margin)
+    holidays = holiday_days(holiday_years.tolist(), eid_dates)
+    days_to_holiday = _days_to_nearest(day, holidays)
+
+    if RED_EYE_START_HOUR > RED_EYE_END_HOUR:
+        red_eye = (hour >= RED_EYE_START_HOUR) | (hour < RED_EYE_END_HOUR)
+    else:
+        red_eye = (hour >= RED_EYE_START_HOUR) & (hour < RED_EYE_END_HOUR)
+
+    both = valid & ~missing_arrival
+    scheduled = np.where(both, (arrival - departure) / 60, np.nan).astype(np.float32)
+    mismatch = np.abs(scheduled - df["Duration (hrs)"].to_numpy(dtype=np.float32))
+
+    def integer(values: np.ndarray, valid_mask: np.ndarray, dtype: str) -> np.ndarray:
+        return np.where(valid_mask, values, -1).astype(dtype)
+
+    return pd.DataFrame(
+        {
+            "Departure Hour": integer(hour, valid, "int8"),
+            "Departure Weekday": integer(weekday, valid, "int8"),
+            "Departure Month": integer(month, valid, "int8"),
+            "Arrival Hour": integer(arrival_hour, ~missing_arrival, "int8"),
+            "Is Weekend": valid & np.isin(weekday, WEEKEND_DAYS),
+            "Is Public Holiday": valid & (days_to_holiday == 0),
+            "Days To Holiday": integer(days_to_holiday, valid, "int16"),
+            "Is Red Eye": valid & red_eye,
+            "Is Overnight": both & (arrival_day > day),
+            "Scheduled Duration (hrs)": scheduled,
+            "Duration Mismatch": both & ~(mismatch <= DURATION_TOLERANCE_HRS),
+        },
+        index=df.index,
+    )
+
+
+def build_temporal_features(
+    filepath: Union[str, Path],
+    output_dir: Union[str, Path] = FEATURES_DIR,
+    chunksize: int = 500_000,
+    force: bool = False,
+) -> Path:
+    """
+    Compute the temporal features of a data file and write them as Parquet.
+
+    Only the datetime and duration columns are read, chunk by chunk, and
+    malformed values are read as missing (so those rows get the sentinels).
+    Rows are indexed by their position in the file, so the features join
+    back onto the raw data. The source hash is stored in the file metadata and an up
+    to date file is not rebuilt.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        output_dir: Directory receiving ``<file stem>.temporal.parquet``
+        chunksize: Rows processed at a time
+        force: Rebuild even if the features are up to date
+
+    Returns:
+        Path to the feature file
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    filepath = Path(filepath)
+    output_path = Path(output_dir) / f"{filepath.stem}.temporal.parquet"
+    source_hash = current_file_hash(filepath)
+
+    if not force and output_path.exists():
+        metadata = pq.read_schema(output_path).metadata or {}
+        if metadata.get(b"source_sha256", b"").decode() == source_hash:
+            logger.info(f"{output_path} is up to date with {filepath}")
+            return output_path
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(".parquet.tmp")
+    writer: Optional[pq.ParquetWriter] = None
+    rows = 0
+    try:
+        for chunk in iter_flight_chunks(
+            filepath, chunksize=chunksize, columns=TEMPORAL_SOURCE_COLUMNS, errors="coerce"
+        ):
+            table = pa.Table.from_pandas(temporal_features(chunk))
+            if writer is None:
+                schema = table.schema.with_metadata(
+                    {**table.schema.metadata, b"source_sha256": source_hash.encode()}
+                )
+                writer = pq.ParquetWriter(tmp_path, schema, compression="zstd")
+            writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        raise ValueError(f"No rows to build features from in {filepath}")
+    tmp_path.replace(output_path)
+    logger.info(f"Wrote temporal features of {rows:,} rows to {output_path}")
+    return output_path
+
+
+def load_temporal_features(
+    filepath: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    output_dir: Union[str, Path] = FEATURES_DIR,
+) -> pd.DataFrame:
+    """
+    Load the temporal features of a data file, building them if missing or stale.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        columns: Optional subset of feature columns
+        output_dir: Directory holding the feature files
+
+    Returns:
+        Feature DataFrame indexed by row position in the file
+    """
+    path = build_temporal_features(filepath, output_dir)
+    return pd.read_parquet(path, columns=columns)
+
+
+def main():
+    """Build the temporal features of the raw dataset."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    build_temporal_features("data/01-raw/Flight_Price_Dataset_of_Bangladesh.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Model package for Flight Fare Prediction."""
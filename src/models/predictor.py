@@ -0,0 +1,81 @@
+"""
+Loading a trained fare model together with its encoders for inference.
+
+The API and the batch scoring job both predict through FarePredictor, so
+features are built the same way everywhere (see build_features).
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, List
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.features.builder import INPUT_COLUMNS, build_features
+from src.features.encoding import FEATURES_DIR, EncoderRegistry
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = Path("models/fare_model.joblib")
+
+
+class FarePredictor:
+    """Fitted model plus encoders, predicting fares for batches of flights."""
+
+    def __init__(self, model: Any, registry: EncoderRegistry):
+        """
+        Initialize the predictor.
+
+        Args:
+            model: Fitted regressor with a predict(features) method
+            registry: Encoder registry the model was trained with
+        """
+        self.model = model
+        self.registry = registry
+
+    @classmethod
+    def load(
+        cls, model_path: Path = MODEL_PATH, encoders_dir: Path = FEATURES_DIR
+    ) -> "FarePredictor":
+        """
+        Load the model and encoders from disk.
+
+        Args:
+            model_path: joblib file of the fitted model
+            encoders_dir: Directory holding the encoder registry
+
+        Returns:
+            FarePredictor
+        """
+        model = joblib.load(model_path)
+        registry = EncoderRegistry.load(encoders_dir)
+        logger.info(f"Loaded model {type(model).__name__} from {model_path}")
+        return cls(model, registry)
+
+    def predict_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Predict the Total Fare of each row of a DataFrame.
+
+        Args:
+            df: DataFrame with the INPUT_COLUMNS
+
+        Returns:
+            float64 array of predicted fares
+        """
+        features = build_features(df, self.registry)
+        return np.asarray(self.model.predict(features), dtype=np.float64)
+
+    def predict_records(self, records: List[dict]) -> List[float]:
+        """
+        Predict the fares of records keyed by column name with one model call.
+
+        Args:
+            records: Mappings with the INPUT_COLUMNS
+
+        Returns:
+            Predicted fare per record
+        """
+        frame = pd.DataFrame.from_records(records, columns=INPUT_COLUMNS)
+        return self.predict_frame(frame).tolist()
@@ -0,0 +1,367 @@
+"""
+Batch preprocessing pipeline: raw flight data to a cleaned, partitioned dataset.
+
+The raw file is streamed in chunks, so memory is bounded by the chunk size:
+the outlier fences come from a quantile sketch and the duplicate index is
+kept in on-disk partitions. Every chunk is cleaned the same way:
+
+- datetimes are parsed; rows without a valid departure time are dropped
+- duplicate flights (same Airline, Source, Destination and departure, the
+  key checked by the validator's business rules) are dropped, keeping the
+  first occurrence across the whole file
+- Total Fare values that differ from Base Fare + Tax & Surcharge by more
+  than the tolerance are repaired and flagged ("Fare Repaired")
+- fares outside the 1.5 IQR fences of the repaired Total Fare are flagged
+  ("Fare Outlier"), as in the data summary report (the quartiles are
+  estimated within the sketch's relative accuracy)
+
+The result is written as a Hive-partitioned Parquet dataset
+(``Airline=.../month=YYYY-MM/``) under ``data/02-preprocessed/<file stem>``,
+together with a ``_preprocessing.json`` report keyed by the raw file's hash,
+so unchanged inputs are not reprocessed.
+"""
+
+import json
+import logging
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.duplicates import DUPLICATE_FLIGHT_COLUMNS, DuplicateIndex, PartitionedDuplicateIndex
+from src.data.loader import (
+    CATEGORICAL_COLUMNS,
+    RAW_NUMERIC_DTYPES,
+    apply_flight_dtypes,
+    iter_flight_chunks,
+)
+from src.data.manifest import current_file_hash
+from src.data.streaming_stats import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+PREPROCESSED_DIR = Path("data/02-preprocessed")
+REPORT_FILENAME = "_preprocessing.json"
+
+PARTITION_COLUMNS = ["Airline", "month"]
+FARE_COLUMNS = ["Base Fare (BDT)", "Tax & Surcharge (BDT)", "Total Fare (BDT)"]
+
+# Parquet row groups of the output files
+OUTPUT_ROW_GROUP_SIZE = 100_000
+
+
+def repaired_total_fare(df: pd.DataFrame, tolerance: float = 1.0) -> "tuple[pd.Series, np.ndarray]":
+    """
+    Recompute Total Fare where it disagrees with Base Fare + Tax & Surcharge.
+
+    Args:
+        df: DataFrame with the three fare columns
+        tolerance: Allowed difference in BDT (rounding)
+
+    Returns:
+        Tuple of the repaired Total Fare and a mask of the repaired rows
+    """
+    base, tax, total = (df[col] for col in FARE_COLUMNS)
+    calculated = (base + tax).astype(total.dtype)
+    repaired = ((total - calculated).abs() > tolerance).to_numpy() & calculated.notna().to_numpy()
+    return total.mask(repaired, calculated), repaired
+
+
+class PreprocessingPipeline:
+    """Cleans the raw flight data chunk by chunk into a partitioned Parquet dataset."""
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path] = PREPROCESSED_DIR,
+        chunksize: int = 500_000,
+        fare_tolerance: float = 1.0,
+        iqr_multiplier: float = 1.5,
+        dedup_index_dir: Optional[Union[str, Path]] = None,
+        dedup_in_memory: bool = False,
+        fence_accuracy: float = 0.001,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            output_dir: Directory receiving one dataset per raw file
+            chunksize: Rows read and processed at a time
+            fare_tolerance: Allowed Total Fare difference in BDT before repair
+            iqr_multiplier: Width of the outlier fences in interquartile ranges
+            dedup_index_dir: Directory of the on-disk duplicate index
+                partitions (defaults to ``<dataset>.dedup`` next to the output)
+            dedup_in_memory: Keep the duplicate index in memory instead; faster,
+                but it grows with the number of distinct flights
+            fence_accuracy: Relative accuracy of the quartiles behind the
+                outlier fences
+        """
+        self.output_dir = Path(output_dir)
+        self.chunksize = chunksize
+        self.fare_tolerance = fare_tolerance
+        self.iqr_multiplier = iqr_multiplier
+        self.dedup_index_dir = Path(dedup_index_dir) if dedup_index_dir else None
+        self.dedup_in_memory = dedup_in_memory
+        self.fence_accuracy = fence_accuracy
+
+    def _parameters(self) -> Dict[str, Any]:
+        """Settings that change the output, recorded in the report."""
+        return {
+            "fare_tolerance": self.fare_tolerance,
+            "iqr_multiplier": self.iqr_multiplier,
+            "fence_accuracy": self.fence_accuracy,
+        }
+
+    def dataset_path(self, filepath: Union[str, Path]) -> Path:
+        """Output dataset directory for a raw file."""
+        return self.output_dir / Path(filepath).stem
+
+    def _dedup_path(self, filepath: Union[str, Path]) -> Path:
+        """Directory of the on-disk duplicate index of a run."""
+        if self.dedup_index_dir is not None:
+            return self.dedup_index_dir
+        dataset_path = self.dataset_path(filepath)
+        return dataset_path.with_name(f"{dataset_path.name}.dedup")
+
+    def _read_chunks(self, filepath: Path, columns=None) -> Iterator[pd.DataFrame]:
+        """
+        Stream raw chunks with lenient typing, coercing malformed values to missing.
+
+        Numeric columns keep the lossless dtypes, so a value too large for the
+        compact dtype in a later chunk does not change the output schema;
+        integer columns with missing values are nullable Int64 for the same reason.
+        """
+        for chunk in iter_flight_chunks(
+            filepath, chunksize=self.chunksize, columns=columns, errors="coerce", compact=False
+        ):
+            casts = {
+                col: chunk[col].astype("Int64")
+                for col, dtype in RAW_NUMERIC_DTYPES.items()
+                if dtype == "int64" and col in chunk.columns and chunk[col].dtype != dtype
+            }
+            yield chunk.assign(**casts) if casts else chunk
+
+    def fare_fences(self, filepath: Path) -> Dict[str, float]:
+        """
+        Compute the IQR outlier fences of the repaired Total Fare.
+
+        Only the fare columns are read, and the quartiles come from a
+        quantile sketch, so memory does not grow with the number of rows.
+
+        Args:
+            filepath: Path to the raw file
+
+        Returns:
+            Dictionary with q1, q3, lower and upper fence
+        """
+        fares = QuantileSketch(self.fence_accuracy)
+        for chunk in self._read_chunks(filepath, columns=FARE_COLUMNS):
+            fares.update(repaired_total_fare(chunk, self.fare_tolerance)[0])
+
+        q1, q3 = fares.quantile(0.25), fares.quantile(0.75)
+        spread = self.iqr_multiplier * (q3 - q1)
+        return {"q1": q1, "q3": q3, "lower": q1 - spread, "upper": q3 + spread}
+
+    def clean_chunk(
+        self, chunk: pd.DataFrame, index, fences: Dict[str, float], report: Dict[str, int]
+    ) -> pd.DataFrame:
+        """
+        Clean one chunk of raw rows.
+
+        Args:
+            chunk: Typed raw chunk
+            index: DuplicateIndex (or PartitionedDuplicateIndex) of flights seen so far
+            fences: Outlier fences from fare_fences
+            report: Counters updated in place
+
+        Returns:
+            Cleaned chunk with Fare Repaired, Fare Outlier and month columns
+        """
+        report["rows_read"] += len(chunk)
+
+        departure = chunk["Departure Date & Time"]
+        valid = departure.notna().to_numpy()
+        report["invalid_departures"] += int((~valid).sum())
+        chunk = chunk[valid]
+
+        duplicates = index.add_frame(chunk, DUPLICATE_FLIGHT_COLUMNS)
+        report["duplicates_removed"] += int(duplicates.sum())
+        chunk = chunk[~duplicates]
+
+        total, repaired = repaired_total_fare(chunk, self.fare_tolerance)
+        report["fares_repaired"] += int(repaired.sum())
+        outlier = ((total < fences["lower"]) | (total > fences["upper"])).to_numpy()
+        report["fare_outliers"] += int(outlier.sum())
+
+        departure = chunk["Departure Date & Time"]
+        month = (departure.dt.year * 100 + departure.dt.month).to_numpy()
+        months, month_codes = np.unique(month, return_inverse=True)
+        labels = [f"{m // 100:04d}-{m % 100:02d}" for m in months.tolist()]
+
+        chunk = chunk.assign(
+            **{
+                "Total Fare (BDT)": total,
+                "Fare Repaired": repaired,
+                "Fare Outlier": outlier,
+                "month": pd.Categorical.from_codes(month_codes, categories=labels),
+            }
+        )
+        report["rows_written"] += len(chunk)
+        return chunk
+
+    def _record_batches(self, filepath: Path, fences: Dict[str, float], report: Dict[str, int]):
+        """Cleaned chunks as Arrow record batches with a fixed schema."""
+        import pyarrow as pa
+
+        if self.dedup_in_memory:
+            index = DuplicateIndex()
+        else:
+            shutil.rmtree(self._dedup_path(filepath), ignore_errors=True)
+            index = PartitionedDuplicateIndex(self._dedup_path(filepath))
+
+        schema = None
+        for chunk in self._read_chunks(filepath):
+            cleaned = self.clean_chunk(chunk, index, fences, report)
+            # Contiguous partitions let the writer emit whole row groups per partition
+            cleaned = cleaned.sort_values(PARTITION_COLUMNS, kind="stable")
+            # Plain strings keep the schema identical across chunks with different
+            # categories; the "string" dtype keeps missing values null
+            text = {col: cleaned[col].astype("string") for col in CATEGORICAL_COLUMNS + ["month"]}
+            table = pa.Table.from_pandas(
+                cleaned.assign(**text), schema=schema, preserve_index=False
+            )
+            schema = schema or table.schema.remove_metadata()
+            yield from table.cast(schema).to_batches()
+
+    def run(self, filepath: Union[str, Path], force: bool = False) -> Dict[str, Any]:
+        """
+        Preprocess a raw file into ``<output_dir>/<file stem>``.
+
+        Args:
+            filepath: Path to the raw CSV (or Parquet) file
+            force: Reprocess even if the output matches the file and settings
+
+        Returns:
+            Report with row counts, cleaning counters and outlier fences
+        """
+        import pyarrow.dataset as ds
+
+        filepath = Path(filepath)
+        dataset_path = self.dataset_path(filepath)
+        source_hash = current_file_hash(filepath)
+
+        report_path = dataset_path / REPORT_FILENAME
+        if not force and report_path.exists():
+            with open(report_path) as f:
+                previous = json.load(f)
+            if (
+                previous.get("source_sha256") == source_hash
+                and previous.get("parameters") == self._parameters()
+            ):
+                logger.info(f"{dataset_path} is up to date with {filepath}")
+                return previous
+
+        start = time.perf_counter()
+        logger.info(f"Computing Total Fare outlier fences for {filepath}")
+        fences = self.fare_fences(filepath)
+
+        counters = dict.fromkeys(
+            [
+                "rows_read",
+                "invalid_departures",
+                "duplicates_removed",
+                "fares_repaired",
+                "fare_outliers",
+                "rows_written",
+            ],
+            0,
+        )
+
+        # Write next to the final location and swap it in once complete
+        tmp_path = dataset_path.with_name(f"{dataset_path.name}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        batches = self._record_batches(filepath, fences, counters)
+        first = next(batches, None)
+        if first is None:
+            raise ValueError(f"No rows to preprocess in {filepath}")
+
+        def all_batches():
+            yield first
+            yield from batches
+
+        ds.write_dataset(
+            all_batches(),
+            tmp_path,
+            schema=first.schema,
+            format="parquet",
+            partitioning=PARTITION_COLUMNS,
+            partitioning_flavor="hive",
+            basename_template="part-{i}.parquet",
+            file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+            max_rows_per_group=OUTPUT_ROW_GROUP_SIZE,
+        )
+
+        report = {
+            "source": str(filepath),
+            "source_sha256": source_hash,
+            "parameters": self._parameters(),
+            "fare_fences": fences,
+            **counters,
+            "partitions": sum(1 for _ in tmp_path.glob("*/*/")),
+            "seconds": round(time.perf_counter() - start, 2),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(tmp_path / REPORT_FILENAME, "w") as f:
+            json.dump(report, f, indent=2, default=float)
+
+        shutil.rmtree(dataset_path, ignore_errors=True)
+        tmp_path.replace(dataset_path)
+        if not self.dedup_in_memory:
+            shutil.rmtree(self._dedup_path(filepath), ignore_errors=True)
+
+        logger.info(
+            f"Preprocessed {counters['rows_read']:,} rows into {report['partitions']} partitions "
+            f"at {dataset_path} ({counters['duplicates_removed']:,} duplicates removed, "
+            f"{counters['fares_repaired']:,} fares repaired)"
+        )
+        return report
+
+
+def load_preprocessed(dataset_path: Union[str, Path], columns=None, filters=None) -> pd.DataFrame:
+    """
+    Load a preprocessed dataset, optionally only some columns and partitions.
+
+    Args:
+        dataset_path: Dataset directory written by PreprocessingPipeline
+        columns: Optional subset of columns
+        filters: Optional pyarrow filters, e.g. [("Airline", "==", "Emirates")]
+
+    Returns:
+        Typed DataFrame
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    # Plain string partition keys: pyarrow cannot convert dictionary-encoded
+    # keys that include the null partition (``Airline=__HIVE_DEFAULT_PARTITION__``)
+    partitioning = ds.partitioning(
+        pa.schema([(col, pa.string()) for col in PARTITION_COLUMNS]), flavor="hive"
+    )
+    df = pd.read_parquet(dataset_path, columns=columns, filters=filters, partitioning=partitioning)
+    # The pipeline keeps values that do not fit the compact dtypes
+    return apply_flight_dtypes(df, errors="coerce")
+
+
+def main():
+    """Main entry point for preprocessing."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    report = PreprocessingPipeline().run("data/01-raw/Flight_Price_Dataset_of_Bangladesh.csv")
+    print(json.dumps(report, indent=2, default=float))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Offline batch scoring of a flight file into data/04-predictions.
+
+The input (CSV or Parquet) is split with plan_partitions into row-group
+ranges or line-aligned byte ranges. Worker processes each load the model
+and encoders once, then stream their partitions chunk by chunk through
+build_features and model.predict, writing one Parquet file per partition.
+Malformed values are read as missing, so every row gets a prediction and
+the model handles them like any other missing input:
+
+    data/04-predictions/<file stem>/part-00000.parquet
+    data/04-predictions/<file stem>/_checkpoint.json
+
+Part files are written to a temporary name and renamed when complete, and
+the checkpoint lists completed partitions together with the source, model
+and encoder hashes. An interrupted run started again with the same inputs
+only scores the partitions that are missing; any changed input starts over.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.loader import iter_partition_chunks, partition_rows, plan_partitions
+from src.data.manifest import current_file_hash
+from src.features.encoding import ENCODERS_NAME, FEATURES_DIR
+from src.models.predictor import MODEL_PATH, FarePredictor
+
+logger = logging.getLogger(__name__)
+
+PREDICTIONS_DIR = Path("data/04-predictions")
+CHECKPOINT_FILENAME = "_checkpoint.json"
+
+PREDICTION_COLUMN = "Predicted Total Fare (BDT)"
+
+# Columns copied next to each prediction to identify the flight
+KEY_COLUMNS = ["Airline", "Source", "Destination", "Departure Date & Time", "Class"]
+
+# Model and encoders of the current worker process, loaded by _init_worker
+_predictor: Optional[FarePredictor] = None
+
+
+def _file_digest(path: Union[str, Path]) -> str:
+    """SHA256 of a small file such as a model or encoder registry."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _init_worker(model_path: str, encoders_dir: str) -> None:
+    """Load the predictor once per worker process."""
+    global _predictor
+    _predictor = FarePredictor.load(Path(model_path), Path(encoders_dir))
+
+
+def _score_partition(
+    partition: Dict[str, Any], number: int, offset: int, output_dir: str, chunksize: int
+) -> int:
+    """
+    Score one partition inside a worker process and write its part file.
+
+    Args:
+        partition: Partition descriptor from plan_partitions
+        number: Partition number, used in the part file name
+        offset: Row position of the partition's first row in the input file
+        output_dir: Directory of the part files
+        chunksize: Rows scored at a time
+
+    Returns:
+        Number of rows scored
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    part_path = Path(output_dir) / f"part-{number:05d}.parquet"
+    tmp_path = part_path.with_suffix(".parquet.tmp")
+    writer: Optional[pq.ParquetWriter] = None
+    rows = 0
+    try:
+        for chunk in iter_partition_chunks(partition, chunksize=chunksize, errors="coerce"):
+            predictions = _predictor.predict_frame(chunk)
+            # Plain strings keep the schema identical across chunks with different
+            # categories; the "string" dtype keeps missing values null
+            keys = {
+                col: (
+                    chunk[col].astype("string")
+                    if isinstance(chunk[col].dtype, pd.CategoricalDtype)
+                    else chunk[col]
+                )
+                for col in KEY_COLUMNS
+            }
+            scored = pd.DataFrame(
+                {
+                    "row": np.arange(offset + rows, offset + rows + len(chunk), dtype=np.int64),
+                    **keys,
+                    PREDICTION_COLUMN: predictions.astype(np.float32),
+                }
+            )
+            table = pa.Table.from_pandas(scored, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema, compression="zstd")
+            writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        tmp_path.replace(part_path)
+    return rows
+
+
+class BatchScorer:
+    """Scores data files with a trained model across worker processes, with checkpoints."""
+
+    def __init__(
+        self,
+        model_path: Union[str, Path] = MODEL_PATH,
+        encoders_dir: Union[str, Path] = FEATURES_DIR,
+        output_dir: Union[str, Path] = PREDICTIONS_DIR,
+        max_workers: Optional[int] = None,
+        chunksize: int = 200_000,
+    ):
+        """
+        Initialize the scorer.
+
+        Args:
+            model_path: joblib file of the fitted model
+            encoders_dir: Directory holding the encoder registry
+            output_dir: Directory receiving one prediction directory per input file
+            max_workers: Worker processes (defaults to the CPU count)
+            chunksize: Rows scored at a time within a partition
+        """
+        self.model_path = Path(model_path)
+        self.encoders_dir = Path(encoders_dir)
+        self.output_dir = Path(output_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+
+    def _signature(self, filepath: Path) -> Dict[str, str]:
+        """Hashes of everything the predictions depend on."""
+        return {
+            "source_sha256": current_file_hash(filepath),
+            "model_sha256": _file_digest(self.model_path),
+            "encoders_sha256": _file_digest(self.encoders_dir / ENCODERS_NAME),
+        }
+
+    def run(self, filepath: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Score a file, resuming a previous interrupted run of the same inputs.
+
+        Args:
+            filepath: Path to the CSV or Parquet file to score
+
+        Returns:
+            The final checkpoint: signature, per-partition row counts and totals
+        """
+        filepath = Path(filepath)
+        run_dir = self.output_dir / filepath.stem
+        checkpoint_path = run_dir / CHECKPOINT_FILENAME
+        signature = self._signature(filepath)
+
+        checkpoint: Optional[Dict[str, Any]] = None
+        if checkpoint_path.exists():
+            with open(checkpoint_path) as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("signature") != signature:
+                logger.info(f"Inputs changed since the last run, rescoring {filepath}")
+                checkpoint = None
+
+        if checkpoint is None:
+            shutil.rmtree(run_dir, ignore_errors=True)
+            run_dir.mkdir(parents=True)
+            # The plan is kept in the checkpoint so a resumed run splits the file the same way
+            partitions = plan_partitions(filepath, num_partitions=self.max_workers * 4)
+            offsets = np.cumsum([0] + [partition_rows(p) for p in partitions]).tolist()
+            checkpoint = {
+                "source": str(filepath),
+                "signature": signature,
+                "partitions": [
+                    {**p, "header": p["header"].decode()} if "header" in p else p
+                    for p in partitions
+                ],
+                "offsets": offsets[:-1],
+                "completed": {},
+            }
+            self._save_checkpoint(checkpoint, checkpoint_path)
+
+        completed = checkpoint["completed"]
+        pending = [
+            number
+            for number in range(len(checkpoint["partitions"]))
+            if str(number) not in completed
+            or (completed[str(number)] and not (run_dir / f"part-{number:05d}.parquet").exists())
+        ]
+        if pending:
+            logger.info(
+                f"Scoring {len(pending)} of {len(checkpoint['partitions'])} partitions "
+                f"of {filepath} with {self.max_workers} workers"
+            )
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, max(len(pending), 1)),
+            initializer=_init_worker,
+            initargs=(str(self.model_path), str(self.encoders_dir)),
+        ) as executor:
+            futures = {}
+            for number in pending:
+                partition = dict(checkpoint["partitions"][number])
+                if "header" in partition:
+                    partition["header"] = partition["header"].encode()
+                future = executor.submit(
+                    _score_partition,
+                    partition,
+                    number,
+                    checkpoint["offsets"][number],
+                    str(run_dir),
+                    self.chunksize,
+                )
+                futures[future] = number
+
+            for future in as_completed(futures):
+                checkpoint["completed"][str(futures[future])] = future.result()
+                self._save_checkpoint(checkpoint, checkpoint_path)
+
+        checkpoint["rows"] = sum(checkpoint["completed"].values())
+        checkpoint["seconds"] = round(time.perf_counter() - start, 2)
+        self._save_checkpoint(checkpoint, checkpoint_path)
+        logger.info(f"Scored {checkpoint['rows']:,} rows of {filepath} into {run_dir}")
+        return checkpoint
+
+    @staticmethod
+    def _save_checkpoint(checkpoint: Dict[str, Any], path: Path) -> None:
+        """Write the checkpoint atomically."""
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f, indent=2)
+        tmp_path.replace(path)
+
+
+def load_predictions(
+    filepath: Union[str, Path], output_dir: Union[str, Path] = PREDICTIONS_DIR
+) -> pd.DataFrame:
+    """
+    Load the predictions of a scored file, ordered by input row.
+
+    Args:
+        filepath: Path of the scored input file
+        output_dir: Directory the scorer wrote to
+
+    Returns:
+        DataFrame with the row position, key columns and predicted fare
+    """
+    run_dir = Path(output_dir) / Path(filepath).stem
+    parts = sorted(run_dir.glob("part-*.parquet"))
+    return pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+
+
+def main():
+    """Main entry point for batch scoring."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    checkpoint = BatchScorer().run("data/01-raw/Flight_Price_Dataset_of_Bangladesh.csv")
+    print(f"Scored {checkpoint['rows']:,} rows in {checkpoint['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Training package for Flight Fare Prediction."""
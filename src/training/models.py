@@ -0,0 +1,98 @@
+"""
+Model definitions and hyperparameter search spaces.
+
+Each model has a factory taking hyperparameters and a search space sampling
+them from a NumPy generator. XGBoost is imported lazily, so the other models
+work without it. Missing feature values (from missing or malformed raw
+values) are handled natively by XGBoost; the scikit-learn models are
+pipelines that impute them with the training median first.
+"""
+
+from typing import Any, Callable, Dict
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+
+SearchSpace = Callable[[np.random.Generator], Dict[str, Any]]
+
+
+def _xgboost(**params: Any) -> Any:
+    """XGBoost regressor with histogram trees and early stopping on the eval set."""
+    from xgboost import XGBRegressor
+
+    return XGBRegressor(tree_method="hist", early_stopping_rounds=20, **params)
+
+
+def _imputed(estimator: Callable[..., Any]) -> Callable[..., Pipeline]:
+    """Factory of a pipeline imputing missing features before the estimator."""
+
+    def factory(**params: Any) -> Pipeline:
+        return Pipeline(
+            [("impute", SimpleImputer(strategy="median")), ("model", estimator(**params))]
+        )
+
+    return factory
+
+
+MODEL_FACTORIES: Dict[str, Callable[..., Any]] = {
+    "linear": _imputed(LinearRegression),
+    "random_forest": _imputed(RandomForestRegressor),
+    "xgboost": _xgboost,
+}
+
+# Parameters fixed for every trial of a model
+DEFAULT_PARAMS: Dict[str, Dict[str, Any]] = {
+    "linear": {},
+    "random_forest": {"n_estimators": 200, "random_state": 42},
+    "xgboost": {"n_estimators": 1000, "random_state": 42},
+}
+
+# Keyword controlling the threads a model trains with
+THREAD_PARAMS: Dict[str, str] = {"random_forest": "n_jobs", "xgboost": "n_jobs"}
+
+
+def _log_uniform(rng: np.random.Generator, low: float, high: float) -> float:
+    """Sample log-uniformly from [low, high]."""
+    return float(np.exp(rng.uniform(np.log(low), np.log(high))))
+
+
+SEARCH_SPACES: Dict[str, SearchSpace] = {
+    "linear": lambda rng: {},
+    "random_forest": lambda rng: {
+        "max_depth": int(rng.choice([8, 12, 16, 24, 32])),
+        "min_samples_leaf": int(rng.choice([1, 2, 5, 10, 20])),
+        "max_features": float(rng.choice([0.3, 0.5, 0.7, 1.0])),
+        "max_samples": float(rng.uniform(0.3, 1.0)),
+    },
+    "xgboost": lambda rng: {
+        "learning_rate": _log_uniform(rng, 0.01, 0.3),
+        "max_depth": int(rng.integers(3, 11)),
+        "min_child_weight": _log_uniform(rng, 1, 50),
+        "subsample": float(rng.uniform(0.5, 1.0)),
+        "colsample_bytree": float(rng.uniform(0.5, 1.0)),
+        "reg_lambda": _log_uniform(rng, 0.1, 10),
+    },
+}
+
+
+def make_model(name: str, params: Dict[str, Any], threads: int = -1) -> Any:
+    """
+    Build an unfitted model.
+
+    Args:
+        name: Key of MODEL_FACTORIES
+        params: Hyperparameters (merged over DEFAULT_PARAMS)
+        threads: Training threads for models that support them (-1 for all cores)
+
+    Returns:
+        Unfitted estimator
+    """
+    if name not in MODEL_FACTORIES:
+        raise ValueError(f"Unknown model: {name}. Choose from {sorted(MODEL_FACTORIES)}")
+    params = {**DEFAULT_PARAMS[name], **params}
+    if name in THREAD_PARAMS:
+        params[THREAD_PARAMS[name]] = threads
+    return MODEL_FACTORIES[name](**params)
@@ -0,0 +1,308 @@
+"""
+Parallel successive-halving hyperparameter search.
+
+n_trials configurations are sampled from the model's search space and
+trained on a small prefix of the (shuffled) training rows. Each rung keeps
+the best 1/eta of the trials by validation RMSE and gives the survivors eta
+times more rows, until the last rung trains on all rows. Most of the
+compute therefore goes to promising configurations; unpromising ones are
+stopped after training on a fraction of the data. XGBoost trials also stop
+adding trees once the error on the tail of their training prefix stops
+improving; that early-stopping slice is not trained on, and the validation
+set, which picks the survivors, takes no part in fitting. Because the
+validation set selects among many trials, its RMSE of the best trial is
+optimistic: callers report metrics on a test set the search never sees.
+
+Trials of a rung run in parallel in joblib worker processes. The feature
+matrices are built once and shared with the workers as read-only memory
+maps, so trials never rebuild or copy them, and rung prefixes are views.
+Matrices opened from the feature matrix cache (src.features.matrix) are
+already memory maps in random row order: they are passed with
+shuffle=False and every worker reads the same cached file.
+Every trial is logged as a nested run in a local MLflow file store when
+mlflow is installed.
+"""
+
+import logging
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from src.training.models import SEARCH_SPACES, make_model
+
+logger = logging.getLogger(__name__)
+
+MLRUNS_DIR = Path("mlruns")
+
+
+def regression_metrics(y_true: np.ndarray, predictions: np.ndarray) -> Dict[str, float]:
+    """
+    Score predictions of the target.
+
+    Args:
+        y_true: Actual target values
+        predictions: Predicted values
+
+    Returns:
+        Dictionary with rmse, mae and r2
+    """
+    return {
+        "rmse": float(np.sqrt(mean_squared_error(y_true, predictions))),
+        "mae": float(mean_absolute_error(y_true, predictions)),
+        "r2": float(r2_score(y_true, predictions)),
+    }
+
+
+def evaluate_trial(
+    name: str,
+    params: Dict[str, Any],
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    rows: int,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+    threads: int = 1,
+    return_model: bool = False,
+    early_stopping_fraction: float = 0.1,
+) -> Dict[str, Any]:
+    """
+    Train one configuration on the first ``rows`` training rows and score it.
+
+    XGBoost fits on the start of the prefix and uses its last
+    ``early_stopping_fraction`` for early stopping, so the validation set
+    only scores the fitted model.
+
+    Args:
+        name: Model name (see MODEL_FACTORIES)
+        params: Hyperparameters of the trial
+        X_train: Shuffled training features
+        y_train: Training target
+        rows: Number of leading training rows to fit on
+        X_val: Validation features
+        y_val: Validation target
+        threads: Training threads of the model
+        return_model: Include the fitted model in the result
+        early_stopping_fraction: Share of the prefix held out for XGBoost
+            early stopping
+
+    Returns:
+        Dictionary with rmse, mae, r2, fit_seconds (and model)
+    """
+    model = make_model(name, params, threads=threads)
+    fit_rows, fit_kwargs = rows, {}
+    if name == "xgboost":
+        fit_rows = rows - max(1, int(rows * early_stopping_fraction))
+        stopping_set = (X_train[fit_rows:rows], y_train[fit_rows:rows])
+        fit_kwargs = {"eval_set": [stopping_set], "verbose": False}
+
+    start = time.perf_counter()
+    model.fit(X_train[:fit_rows], y_train[:fit_rows], **fit_kwargs)
+    fit_seconds = time.perf_counter() - start
+
+    result = {**regression_metrics(y_val, model.predict(X_val)), "fit_seconds": fit_seconds}
+    if getattr(model, "best_iteration", None) is not None:
+        result["best_iteration"] = int(model.best_iteration)
+    if return_model:
+        result["model"] = model
+    return result
+
+
+class TrialLogger:
+    """Logs searches and trials to an MLflow file store, or does nothing without mlflow."""
+
+    def __init__(self, experiment: str, tracking_dir: Union[str, Path] = MLRUNS_DIR):
+        """
+        Initialize the logger.
+
+        Args:
+            experiment: MLflow experiment name
+            tracking_dir: Directory of the local file store
+        """
+        try:
+            import mlflow
+        except ImportError:
+            logger.warning("mlflow is not installed, trials will not be tracked")
+            self.mlflow = None
+            return
+
+        self.mlflow = mlflow
+        mlflow.set_tracking_uri(Path(tracking_dir).resolve().as_uri())
+        mlflow.set_experiment(experiment)
+
+    def start(self, params: Dict[str, Any]) -> None:
+        """Open the parent run of a search."""
+        if self.mlflow is not None:
+            self.mlflow.start_run()
+            self.mlflow.log_params(params)
+
+    def trial(self, trial: int, rung: int, rows: int, params: Dict[str, Any], result: Dict) -> None:
+        """Log one trial evaluation as a nested run."""
+        if self.mlflow is None:
+            return
+        with self.mlflow.start_run(run_name=f"trial-{trial}-rung-{rung}", nested=True):
+            self.mlflow.log_params({**params, "trial": trial, "rung": rung, "rows": rows})
+            self.mlflow.log_metrics(
+                {key: value for key, value in result.items() if isinstance(value, (int, float))}
+            )
+
+    def finish(self, metrics: Dict[str, float], artifacts: Optional[List[Path]] = None) -> None:
+        """Log the search outcome and close the parent run."""
+        if self.mlflow is None:
+            return
+        self.mlflow.log_metrics(metrics)
+        for path in artifacts or []:
+            self.mlflow.log_artifact(str(path))
+        self.mlflow.end_run()
+
+
+class SuccessiveHalvingSearch:
+    """Successive-halving search over a model's hyperparameters, run in parallel."""
+
+    def __init__(
+        self,
+        model_name: str,
+        n_trials: int = 27,
+        eta: int = 3,
+        min_rows: int = 10_000,
+        n_jobs: int = -1,
+        seed: int = 42,
+        trial_logger: Optional[TrialLogger] = None,
+    ):
+        """
+        Initialize the search.
+
+        Args:
+            model_name: Model to tune (see MODEL_FACTORIES)
+            n_trials: Configurations sampled for the first rung
+            eta: Reduction factor: each rung keeps 1/eta of the trials and
+                gives them eta times more rows
+            min_rows: Fewest training rows a rung may use
+            n_jobs: Parallel trials (-1 for one per core)
+            seed: Seed of the configuration sampler
+            trial_logger: Where trials are logged (none if omitted)
+        """
+        if model_name not in SEARCH_SPACES:
+            raise ValueError(f"Unknown model: {model_name}")
+        self.model_name = model_name
+        self.n_trials = n_trials
+        self.eta = eta
+        self.min_rows = min_rows
+        self.n_jobs = n_jobs
+        self.seed = seed
+        self.trial_logger = trial_logger
+
+    def rungs(self, n_rows: int) -> List[Tuple[int, int]]:
+        """
+        Plan the rungs for a training set size.
+
+        Args:
+            n_rows: Number of training rows
+
+        Returns:
+            (trials, rows) per rung; the last rung uses all rows
+        """
+        n_rungs = int(math.log(self.n_trials, self.eta) + 1e-9) + 1
+        while n_rungs > 1 and n_rows / self.eta ** (n_rungs - 1) < self.min_rows:
+            n_rungs -= 1
+        return [
+            (
+                max(1, math.ceil(self.n_trials / self.eta**rung)),
+                math.ceil(n_rows / self.eta ** (n_rungs - 1 - rung)),
+            )
+            for rung in range(n_rungs)
+        ]
+
+    def fit(
+        self,
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        X_val: np.ndarray,
+        y_val: np.ndarray,
+        shuffle: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Run the search.
+
+        Args:
+            X_train: Training features
+            y_train: Training target
+            X_val: Validation features
+            y_val: Validation target
+            shuffle: Shuffle the training rows once first; pass False when
+                they are already in random order, so they are not copied
+
+        Returns:
+            Dictionary with the best params, its validation metrics (biased
+            upwards by the selection; score a held-out test set for an
+            unbiased estimate), the fitted best model and every trial
+            evaluation
+        """
+        rng = np.random.default_rng(self.seed)
+        if shuffle:
+            # One shuffle up front makes every rung's rows a prefix, i.e. a view
+            order = rng.permutation(len(X_train))
+            X_train, y_train = X_train[order], y_train[order]
+
+        space = SEARCH_SPACES[self.model_name]
+        configs = [space(rng) for _ in range(self.n_trials)]
+        # Models without hyperparameters need a single trial
+        if not any(configs):
+            configs = configs[:1]
+        survivors = list(range(len(configs)))
+
+        rungs = self.rungs(len(X_train))
+        if self.trial_logger:
+            self.trial_logger.start(
+                {"model": self.model_name, "n_trials": len(configs), "eta": self.eta}
+            )
+
+        history: List[Dict[str, Any]] = []
+        results: Dict[int, Dict[str, Any]] = {}
+        parallel = Parallel(n_jobs=self.n_jobs, max_nbytes="1M", mmap_mode="r")
+        for rung, (n_keep, rows) in enumerate(rungs):
+            last = rung == len(rungs) - 1
+            survivors = survivors[:n_keep]
+            # Parallel trials train single-threaded; a lone trial gets every core
+            threads = 1 if self.n_jobs != 1 and len(survivors) > 1 else -1
+            logger.info(f"Rung {rung}: {len(survivors)} {self.model_name} trials on {rows:,} rows")
+            evaluations = parallel(
+                delayed(evaluate_trial)(
+                    self.model_name,
+                    configs[trial],
+                    X_train,
+                    y_train,
+                    rows,
+                    X_val,
+                    y_val,
+                    threads=threads,
+                    return_model=last,
+                )
+                for trial in survivors
+            )
+            results = dict(zip(survivors, evaluations))
+            for trial in survivors:
+                result = results[trial]
+                history.append({"trial": trial, "rung": rung, "rows": rows, **configs[trial]})
+                history[-1].update({k: v for k, v in result.items() if k != "model"})
+                if self.trial_logger:
+                    self.trial_logger.trial(trial, rung, rows, configs[trial], result)
+            survivors.sort(key=lambda trial: results[trial]["rmse"])
+
+        best = survivors[0]
+        best_result = results[best]
+        logger.info(
+            f"Best {self.model_name} trial {best}: RMSE {best_result['rmse']:,.2f}, "
+            f"R² {best_result['r2']:.4f} ({configs[best]})"
+        )
+        return {
+            "model_name": self.model_name,
+            "params": configs[best],
+            "metrics": {key: best_result[key] for key in ("rmse", "mae", "r2")},
+            "model": best_result["model"],
+            "trials": history,
+        }
@@ -0,0 +1,143 @@
+"""
+Training pipeline: raw data to a saved fare model.
+
+Features are built with the shared build_features (so training and serving
+agree) and cached as a memory-mapped matrix keyed by the raw file and the
+feature configuration, so repeated experiments skip reading and encoding
+the raw data. Rows without a valid Total Fare are left out of the matrix,
+and missing inputs are imputed by the models. The cached rows are in random
+order: the first rows are a test set, the next ones are held out for
+validation and the rest train the model, which is either fitted with
+default parameters or tuned with SuccessiveHalvingSearch. The search picks
+its survivors on the validation set, so the reported metrics come from the
+test set, which neither training nor the search ever sees. The chosen model
+is saved where FarePredictor loads it from.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import joblib
+
+from src.features.encoding import FEATURES_DIR, fit_encoders
+from src.features.matrix import MATRIX_DIR, load_feature_matrix
+from src.models.predictor import MODEL_PATH
+from src.training.search import (
+    MLRUNS_DIR,
+    SuccessiveHalvingSearch,
+    TrialLogger,
+    evaluate_trial,
+    regression_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def train_model(
+    filepath: Union[str, Path],
+    model_name: str = "xgboost",
+    tune: bool = False,
+    n_trials: int = 27,
+    eta: int = 3,
+    n_jobs: int = -1,
+    model_path: Union[str, Path] = MODEL_PATH,
+    encoders_dir: Union[str, Path] = FEATURES_DIR,
+    matrix_dir: Union[str, Path] = MATRIX_DIR,
+    tracking_dir: Union[str, Path] = MLRUNS_DIR,
+    validation_fraction: float = 0.2,
+    test_fraction: float = 0.1,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """
+    Train a fare model on a data file and save it.
+
+    Args:
+        filepath: Path to the raw CSV (or Parquet) file
+        model_name: "linear", "random_forest" or "xgboost"
+        tune: Run the successive-halving search instead of default parameters
+        n_trials: Configurations sampled when tuning
+        eta: Successive-halving reduction factor
+        n_jobs: Parallel trials when tuning (-1 for one per core)
+        model_path: Where the fitted model is saved
+        encoders_dir: Directory holding the encoder registry
+        matrix_dir: Directory holding cached feature matrices
+        tracking_dir: MLflow file store directory
+        validation_fraction: Share of rows held out for validation
+        test_fraction: Share of rows held out for the reported metrics
+        seed: Seed of the cached row order (hence the split) and the search
+
+    Returns:
+        Report with the model name, params, test and validation metrics and paths
+    """
+    registry = fit_encoders(filepath, directory=encoders_dir)
+    X, y = load_feature_matrix(filepath, registry, seed=seed, cache_dir=matrix_dir)
+    # Rows are cached in random order, so the splits are memory-map views
+    n_test = int(len(X) * test_fraction)
+    n_val = int(len(X) * validation_fraction)
+    X_test, y_test = X[:n_test], y[:n_test]
+    X_val, y_val = X[n_test : n_test + n_val], y[n_test : n_test + n_val]
+    X_train, y_train = X[n_test + n_val :], y[n_test + n_val :]
+    logger.info(
+        f"Training {model_name} on {len(X_train):,} rows, "
+        f"{n_val:,} held out for validation and {n_test:,} for testing"
+    )
+
+    trial_logger = TrialLogger(f"fare-{model_name}", tracking_dir)
+    if tune:
+        search = SuccessiveHalvingSearch(
+            model_name,
+            n_trials=n_trials,
+            eta=eta,
+            n_jobs=n_jobs,
+            seed=seed,
+            trial_logger=trial_logger,
+        )
+        result = search.fit(X_train, y_train, X_val, y_val, shuffle=False)
+    else:
+        trial_logger.start({"model": model_name, "n_trials": 1})
+        evaluation = evaluate_trial(
+            model_name,
+            {},
+            X_train,
+            y_train,
+            len(X_train),
+            X_val,
+            y_val,
+            threads=-1,
+            return_model=True,
+        )
+        trial_logger.trial(0, 0, len(X_train), {}, evaluation)
+        result = {
+            "params": {},
+            "metrics": {key: evaluation[key] for key in ("rmse", "mae", "r2")},
+            "model": evaluation["model"],
+            "trials": [evaluation],
+        }
+
+    metrics = regression_metrics(y_test, result["model"].predict(X_test))
+    logger.info(f"Test RMSE {metrics['rmse']:,.2f}, R² {metrics['r2']:.4f}")
+
+    model_path = Path(model_path)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(result["model"], model_path)
+
+    report = {
+        "model_name": model_name,
+        "params": result["params"],
+        "metrics": metrics,
+        "validation_metrics": result["metrics"],
+        "trials": len(result["trials"]),
+        "train_rows": int(len(X_train)),
+        "validation_rows": n_val,
+        "test_rows": n_test,
+        "model_path": str(model_path),
+    }
+    report_path = model_path.with_suffix(".json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    trial_logger.finish(metrics, artifacts=[model_path, report_path])
+    logger.info(f"Saved {model_name} model to {model_path}")
+    return report
@@ -0,0 +1,64 @@
+"""Shared fixtures: small synthetic copies of the Flight Price Dataset."""
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import loader
+from src.data.synthetic import generate_flights
+
+
+@pytest.fixture
+def flights_csv(tmp_path: Path) -> Path:
+    """Path to a 3,000-row synthetic flights CSV with a few invalid rows."""
+    df = generate_flights(3_000, seed=0)
+    df.loc[10, "Class"] = "Premium"
+    df.loc[500, "Days Before Departure"] = 65_600  # Does not fit the int16 column dtype
+    df.loc[1_200, "Total Fare (BDT)"] = 1.0
+    df.loc[2_500, "Airline"] = np.nan
+    df = pd.concat([df, df.iloc[[20, 21]]], ignore_index=True)  # Duplicate rows
+
+    path = tmp_path / "flights.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def incomplete_flights_csv(flights_csv: Path) -> Path:
+    """Path to the invalid-row flights CSV with missing and malformed fares and durations."""
+    df = pd.read_csv(flights_csv, dtype=str, keep_default_na=False)
+    df.loc[30, "Total Fare (BDT)"] = ""
+    df.loc[40, "Total Fare (BDT)"] = "n/a"
+    df.loc[50, "Duration (hrs)"] = ""
+    df.loc[60, "Duration (hrs)"] = "two"
+
+    path = flights_csv.with_name("incomplete.csv")
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def clean_flights_csv(tmp_path: Path) -> Path:
+    """Path to a 5,000-row synthetic flights CSV without invalid values."""
+    path = tmp_path / "clean" / "flights.csv"
+    path.parent.mkdir()
+    generate_flights(5_000, seed=2).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def range_reads(monkeypatch) -> List[int]:
+    """Sizes of the reads from CSV byte ranges."""
+    sizes: List[int] = []
+    readinto = loader._CsvRange.readinto
+
+    def recording_readinto(self, buffer):
+        size = readinto(self, buffer)
+        sizes.append(size)
+        return size
+
+    monkeypatch.setattr(loader._CsvRange, "readinto", recording_readinto)
+    return sizes
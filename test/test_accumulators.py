@@ -0,0 +1,89 @@
+"""Tests for the chunked validation and summary accumulators."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.accumulators import FailureCaseSampler, SummaryAccumulator, ValidationAccumulator
+from src.data.loader import apply_flight_dtypes
+from src.data.synthetic import generate_flights
+
+
+@pytest.fixture
+def flights():
+    df = generate_flights(2_000, seed=1)
+    df.loc[5, "Total Fare (BDT)"] = np.nan
+    df.loc[7, "Base Fare (BDT)"] += 500  # Fare mismatch
+    df = pd.concat([df, df.iloc[[3, 1_500]]], ignore_index=True)
+    return apply_flight_dtypes(df, errors="coerce", compact=False)
+
+
+def _parts(df, n):
+    return [df.iloc[i : i + n] for i in range(0, len(df), n)]
+
+
+def test_validation_accumulator_streaming_matches_single_pass(flights):
+    single = ValidationAccumulator().update(flights)
+    streamed = ValidationAccumulator()
+    for part in _parts(flights, 450):
+        streamed.update(part)
+
+    assert streamed.stats() == single.stats()
+    assert streamed.business_warnings() == single.business_warnings()
+    assert streamed.stats()["duplicate_rows"] == 2
+    assert streamed.fare_mismatches == 1
+
+
+def test_validation_accumulator_merge_matches_single_pass(flights):
+    single = ValidationAccumulator().update(flights)
+    merged = ValidationAccumulator()
+    for part in _parts(flights, 333):
+        merged.merge(ValidationAccumulator().update(part))
+
+    assert merged.stats() == single.stats()
+    assert merged.business_warnings() == single.business_warnings()
+
+
+def _case(column, index):
+    return {
+        "schema_context": "Column",
+        "column": column,
+        "check": "check",
+        "check_number": 0,
+        "failure_case": index,
+        "index": index,
+    }
+
+
+def test_failure_sampler_keeps_lowest_indices_after_shift_and_merge():
+    first = FailureCaseSampler(max_cases_per_check=3)
+    first.update(pd.DataFrame([_case("Class", i) for i in (4, 1, 9)]))
+    second = FailureCaseSampler(max_cases_per_check=3)
+    second.update(pd.DataFrame([_case("Class", i) for i in (0, 2)])).shift_index(5)
+
+    merged = first.merge(second)
+
+    assert [record["index"] for record in merged.result()] == [1, 4, 5]
+
+
+def test_summary_accumulator_merge_matches_single_pass(flights):
+    single = SummaryAccumulator().update(flights).result()
+    merged = SummaryAccumulator()
+    for part in _parts(flights, 700):
+        merged.merge(SummaryAccumulator().update(part))
+    result = merged.result()
+
+    assert result["total_rows"] == single["total_rows"] == len(flights)
+    assert result["duplicate_rows"] == single["duplicate_rows"] == 2
+    assert result["missing_values"] == single["missing_values"]
+    assert result["value_counts"] == single["value_counts"]
+    routes = {route: (rows, mean) for route, rows, mean in result["routes"]}
+    for route, rows, mean in single["routes"]:
+        assert routes[route] == (rows, pytest.approx(mean))
+    for col, rows in single["group_means"].items():
+        assert [row[0] for row in result["group_means"][col]] == [row[0] for row in rows]
+        assert [row[1] for row in result["group_means"][col]] == pytest.approx(
+            [row[1] for row in rows]
+        )
+    for col, summary in single["numeric"].items():
+        assert result["numeric"][col] == pytest.approx(summary)
@@ -0,0 +1,59 @@
+"""Tests for the data summary report's incremental path."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.data.manifest import RawDataManifest
+
+
+@pytest.fixture
+def data_summary(monkeypatch):
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[1] / "scripts"))
+    import data_summary
+
+    return data_summary
+
+
+def _record(manifest, path):
+    change = manifest.check(path)
+    appended_to = change["entry"] if change["status"] == "appended" else None
+    manifest.record(path, change["scan"], appended_to=appended_to)
+
+
+def test_summary_of_appended_rows_matches_full(data_summary, flights_csv, tmp_path, range_reads):
+    raw = flights_csv.read_bytes()
+    split = raw.index(b"\n", len(raw) // 3) + 1
+
+    data_dir = tmp_path / "raw"
+    data_dir.mkdir()
+    path = data_dir / "flights.csv"
+    path.write_bytes(raw[:split])
+    manifest = RawDataManifest(data_dir)
+    _record(manifest, path)
+    data_summary.compute_data_summary(str(path), chunksize=500)
+
+    with open(path, "ab") as f:
+        f.write(raw[split:])
+    _record(manifest, path)
+    range_reads.clear()
+    incremental = data_summary.compute_data_summary(str(path), chunksize=500)
+
+    full_dir = tmp_path / "full"
+    full_dir.mkdir()
+    shutil.copy(flights_csv, full_dir / "flights.csv")
+    full = data_summary.compute_data_summary(str(full_dir / "flights.csv"), chunksize=500)
+
+    # Only the appended range was read, in parser-sized pieces
+    assert sum(range_reads) < len(raw)
+    assert max(range_reads) < len(raw) - split
+    assert incremental["total_rows"] == full["total_rows"] == 3_002
+    for key in ("missing_values", "duplicate_rows", "fare_mismatches", "value_counts"):
+        assert incremental[key] == full[key]
+    # Routes with equal counts may come in either order
+    routes = {route: (rows, mean) for route, rows, mean in incremental["routes"]}
+    for route, rows, mean in full["routes"]:
+        assert routes[route] == (rows, pytest.approx(mean))
+    for col, summary in full["numeric"].items():
+        assert incremental["numeric"][col] == pytest.approx(summary)
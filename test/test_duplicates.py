@@ -0,0 +1,43 @@
+"""Tests for the streaming duplicate indexes."""
+
+import numpy as np
+import pytest
+
+from src.data.duplicates import DuplicateIndex, PartitionedDuplicateIndex
+
+
+@pytest.fixture
+def fingerprints():
+    rng = np.random.default_rng(11)
+    return rng.integers(0, 1 << 63, 3_000, dtype=np.uint64)[rng.integers(0, 3_000, 20_000)]
+
+
+def _expected_duplicates(fingerprints):
+    first = np.zeros(len(fingerprints), dtype=bool)
+    first[np.unique(fingerprints, return_index=True)[1]] = True
+    return ~first
+
+
+@pytest.mark.parametrize("batch", [700, 5_000])
+def test_index_flags_repeats_across_batches(fingerprints, batch, tmp_path):
+    for index in (DuplicateIndex(), PartitionedDuplicateIndex(tmp_path / f"parts-{batch}")):
+        duplicates = np.concatenate(
+            [index.add(fingerprints[i : i + batch]) for i in range(0, len(fingerprints), batch)]
+        )
+
+        np.testing.assert_array_equal(duplicates, _expected_duplicates(fingerprints))
+        assert len(index) == len(np.unique(fingerprints))
+        assert index.duplicate_count == int(duplicates.sum())
+
+
+def test_index_keys_stay_sorted_and_merge(fingerprints):
+    left, right = DuplicateIndex(), DuplicateIndex()
+    for i in range(0, 10_000, 100):
+        left.add(fingerprints[i : i + 100])
+    right.add(fingerprints[10_000:])
+
+    np.testing.assert_array_equal(left.keys, np.unique(fingerprints[:10_000]))
+    left.merge(right)
+    np.testing.assert_array_equal(left.keys, np.unique(fingerprints))
+    assert left.contains(fingerprints).all()
+    assert not left.contains(np.array([1, 2, 3], dtype=np.uint64)).any()
@@ -0,0 +1,70 @@
+"""Tests for the typed flight data loader."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.loader import (
+    COLUMN_DTYPES,
+    csv_partition,
+    iter_flight_chunks,
+    iter_partition_chunks,
+    load_raw_data,
+    plan_partitions,
+)
+
+DAYS = "Days Before Departure"
+
+
+def test_compact_dtypes_on_clean_file(clean_flights_csv):
+    df = load_raw_data(clean_flights_csv)
+
+    assert df[DAYS].dtype == COLUMN_DTYPES[DAYS]
+    assert df["Airline"].dtype == "category"
+    assert len(df) == 5_000
+
+
+def test_out_of_range_integer_is_not_wrapped(flights_csv):
+    # 65600 would silently wrap to 64 under int16
+    with pytest.raises(ValueError, match=DAYS):
+        load_raw_data(flights_csv)
+
+    assert load_raw_data(flights_csv, errors="ignore")[DAYS].dtype == np.int64
+    assert load_raw_data(flights_csv, compact=False)[DAYS][500] == 65_600
+
+
+def test_coerce_keeps_unparseable_values_as_missing(flights_csv):
+    text = flights_csv.read_text().replace("65600", "sixty", 1)
+    flights_csv.write_text(text)
+
+    df = load_raw_data(flights_csv, errors="coerce")
+
+    assert np.isnan(df[DAYS][500])
+    assert df[DAYS].drop(500).between(1, 90).all()
+
+
+def test_chunks_match_whole_file(clean_flights_csv):
+    chunks = list(iter_flight_chunks(clean_flights_csv, chunksize=1_234))
+
+    assert [len(chunk) for chunk in chunks] == [1_234] * 4 + [64]
+    assert chunks[1].index[0] == 1_234
+
+
+def test_partitions_stream_the_whole_file(clean_flights_csv):
+    partitions = plan_partitions(clean_flights_csv, num_partitions=3)
+    chunks = [c for p in partitions for c in iter_partition_chunks(p, chunksize=700)]
+
+    expected = load_raw_data(clean_flights_csv)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+def test_csv_range_starts_after_offset(clean_flights_csv):
+    text = clean_flights_csv.read_bytes()
+    start = text.index(b"\n", len(text) // 2) + 1
+
+    chunks = list(iter_partition_chunks(csv_partition(clean_flights_csv, start), chunksize=500))
+
+    tail = pd.concat(chunks, ignore_index=True)
+    expected = load_raw_data(clean_flights_csv).iloc[-len(tail) :].reset_index(drop=True)
+    assert len(tail) == text[start:].count(b"\n")
+    pd.testing.assert_frame_equal(tail, expected)
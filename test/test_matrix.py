@@ -0,0 +1,94 @@
+"""Tests for the cached feature matrix."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.data.loader import load_raw_data
+from src.features.builder import FEATURE_COLUMNS, TARGET_COLUMN, build_features
+from src.features.encoding import fit_encoders
+from src.features.matrix import (
+    METADATA_FILENAME,
+    build_feature_matrix,
+    load_feature_matrix,
+    matrix_path,
+)
+
+
+@pytest.fixture
+def registry(clean_flights_csv, tmp_path):
+    return fit_encoders(clean_flights_csv, directory=tmp_path / "features")
+
+
+def test_matrix_holds_shuffled_features(clean_flights_csv, registry, tmp_path):
+    X, y = load_feature_matrix(
+        clean_flights_csv, registry, seed=5, cache_dir=tmp_path / "matrices", chunksize=700
+    )
+
+    df = load_raw_data(clean_flights_csv)
+    order = np.random.default_rng(5).permutation(len(df))
+    assert X.shape == (len(df), len(FEATURE_COLUMNS))
+    assert isinstance(X, np.memmap) and not X.flags.writeable
+    np.testing.assert_allclose(X[order], build_features(df, registry).to_numpy(np.float32))
+    np.testing.assert_allclose(y[order], df[TARGET_COLUMN].to_numpy(np.float32))
+
+
+def test_cached_matrix_is_reused(clean_flights_csv, registry, tmp_path):
+    cache_dir = tmp_path / "matrices"
+    first = build_feature_matrix(clean_flights_csv, registry, cache_dir=cache_dir)
+    mtime = (first / "X.npy").stat().st_mtime_ns
+
+    second = build_feature_matrix(clean_flights_csv, registry, cache_dir=cache_dir)
+
+    assert second == first
+    assert (second / "X.npy").stat().st_mtime_ns == mtime
+    assert build_feature_matrix(clean_flights_csv, registry, cache_dir=cache_dir, force=True)
+    assert (first / "X.npy").stat().st_mtime_ns != mtime
+
+
+def test_interrupted_build_is_redone(clean_flights_csv, registry, tmp_path):
+    cache_dir = tmp_path / "matrices"
+    output_dir = matrix_path(clean_flights_csv, registry, cache_dir=cache_dir)
+    # A crash leaves a partial matrix under a temporary name, never at output_dir
+    partial = output_dir.with_name(f"{output_dir.name}.tmp-{os.getpid()}")
+    partial.mkdir(parents=True)
+    (partial / "X.npy").write_bytes(b"partial")
+
+    built = build_feature_matrix(clean_flights_csv, registry, cache_dir=cache_dir)
+
+    assert built == output_dir
+    assert (built / METADATA_FILENAME).exists()
+    assert not partial.exists()
+    assert np.load(built / "X.npy").shape[0] == 5_000
+
+
+def test_matrix_key_follows_data_and_config(clean_flights_csv, registry, tmp_path):
+    cache_dir = tmp_path / "matrices"
+    original = matrix_path(clean_flights_csv, registry, cache_dir=cache_dir)
+
+    assert matrix_path(clean_flights_csv, registry, seed=1, cache_dir=cache_dir) != original
+    with open(clean_flights_csv, "a") as f:
+        f.write(clean_flights_csv.read_text().splitlines()[1] + "\n")
+    assert matrix_path(clean_flights_csv, registry, cache_dir=cache_dir) != original
+
+
+def test_rows_without_target_are_left_out(incomplete_flights_csv, tmp_path):
+    registry = fit_encoders(incomplete_flights_csv, directory=tmp_path / "features")
+    output_dir = build_feature_matrix(
+        incomplete_flights_csv, registry, cache_dir=tmp_path / "matrices", chunksize=700
+    )
+    X, y = np.load(output_dir / "X.npy"), np.load(output_dir / "y.npy")
+
+    df = load_raw_data(incomplete_flights_csv, errors="coerce")
+    df = df[df[TARGET_COLUMN].notna()]
+    order = np.random.default_rng(42).permutation(len(df))
+    assert len(df) == 3_000
+    assert np.isfinite(y).all()
+    np.testing.assert_allclose(y[order], df[TARGET_COLUMN].to_numpy(np.float32))
+    np.testing.assert_allclose(X[order], build_features(df, registry).to_numpy(np.float32))
+    # Missing inputs stay missing for the models to impute
+    assert np.isnan(X).any(axis=1).sum() == 2
+    with open(output_dir / METADATA_FILENAME) as f:
+        assert json.load(f)["rows_without_target"] == 2
@@ -0,0 +1,56 @@
+"""Tests for the batch preprocessing pipeline."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.synthetic import generate_flights
+from src.pipelines.preprocessing import PreprocessingPipeline, load_preprocessed
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    df = generate_flights(2_000, seed=4)
+    df.loc[3, "Class"] = np.nan
+    df.loc[8, "Airline"] = np.nan
+    df = pd.concat([df, df.iloc[:25]], ignore_index=True)
+    path = tmp_path / "flights.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("dedup_in_memory", [False, True])
+def test_preprocessing_keeps_nulls_and_drops_duplicates(raw_csv, tmp_path, dedup_in_memory):
+    pipeline = PreprocessingPipeline(
+        output_dir=tmp_path / "out", chunksize=600, dedup_in_memory=dedup_in_memory
+    )
+    report = pipeline.run(raw_csv)
+    df = load_preprocessed(pipeline.dataset_path(raw_csv))
+
+    assert report["rows_read"] == 2_025
+    assert report["duplicates_removed"] == 25
+    assert report["rows_written"] == len(df) == 2_000
+    assert df["Class"].isna().sum() == 1
+    assert df["Airline"].isna().sum() == 1
+    assert "nan" not in set(df["Class"].dropna()) | set(df["Airline"].dropna())
+    assert not (tmp_path / "out" / f"{raw_csv.stem}.dedup").exists()
+
+
+def test_fences_are_within_sketch_accuracy(raw_csv, tmp_path):
+    pipeline = PreprocessingPipeline(output_dir=tmp_path / "out", fence_accuracy=0.001)
+    fences = pipeline.fare_fences(raw_csv)
+
+    fares = np.sort(pd.read_csv(raw_csv)["Total Fare (BDT)"].to_numpy())
+    for q in (0.25, 0.75):
+        exact = fares[int(q * (len(fares) - 1))]
+        assert fences[f"q{int(q * 4)}"] == pytest.approx(exact, rel=0.001)
+
+
+def test_out_of_range_value_after_first_chunk(flights_csv, tmp_path):
+    # Row 500 has 65,600 days before departure, past the first chunk
+    pipeline = PreprocessingPipeline(output_dir=tmp_path / "out", chunksize=400)
+    report = pipeline.run(flights_csv)
+    df = load_preprocessed(pipeline.dataset_path(flights_csv))
+
+    assert report["rows_written"] == len(df) == 3_000
+    assert df["Days Before Departure"].max() == 65_600
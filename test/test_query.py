@@ -0,0 +1,38 @@
+"""Tests for the lazy query layer."""
+
+import pandas as pd
+import pytest
+
+from src.data.loader import load_raw_data
+from src.data.query import FlightQuery
+
+
+@pytest.fixture
+def flights_parquet(flights_csv):
+    path = flights_csv.with_suffix(".parquet")
+    load_raw_data(flights_csv, compact=False).to_parquet(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("source", ["flights_csv", "flights_parquet"])
+def test_query_matches_eager_load(source, request):
+    path = request.getfixturevalue(source)
+    query = (
+        FlightQuery(path, chunksize=700)
+        .filter("Departure Date & Time", ">=", "2025-02-01")
+        .filter("Days Before Departure", ">", "30")
+        .select("Airline", "Days Before Departure", "Total Fare (BDT)")
+    )
+
+    df = load_raw_data(path, errors="coerce")
+    expected = df.loc[
+        (df["Departure Date & Time"] >= pd.Timestamp("2025-02-01"))
+        & (df["Days Before Departure"] > 30),
+        ["Airline", "Days Before Departure", "Total Fare (BDT)"],
+    ].reset_index(drop=True)
+    result = query.collect()
+
+    # Row 500 has 65,600 days before departure, too large for the compact dtype
+    assert 65_600 in result["Days Before Departure"].tolist()
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected, check_dtype=False)
+    assert query.count() == len(expected)
@@ -0,0 +1,16 @@
+"""Tests for sampling rows of a data file."""
+
+from src.data.sampling import load_sample, sample_file
+
+
+def test_sample_reads_malformed_values_as_missing(incomplete_flights_csv, tmp_path):
+    sample = sample_file(incomplete_flights_csv, n=3_002, chunksize=700)
+
+    assert len(sample) == 3_002
+    assert sample.loc[[30, 40], "Total Fare (BDT)"].isna().all()
+    assert sample.loc[[50, 60], "Duration (hrs)"].isna().all()
+    # Row 500 does not fit the compact dtype and keeps its value
+    assert sample.loc[500, "Days Before Departure"] == 65_600
+
+    cached = load_sample(incomplete_flights_csv, n=100, cache_dir=tmp_path / "samples")
+    assert cached.equals(load_sample(incomplete_flights_csv, n=100, cache_dir=tmp_path / "samples"))
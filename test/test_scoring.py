@@ -0,0 +1,119 @@
+"""Tests for checkpointed batch scoring."""
+
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.data.loader import load_raw_data
+from src.features.builder import TARGET_COLUMN, build_features
+from src.features.encoding import fit_encoders
+from src.pipelines.scoring import (
+    CHECKPOINT_FILENAME,
+    PREDICTION_COLUMN,
+    BatchScorer,
+    load_predictions,
+)
+from src.training.models import make_model
+
+
+@pytest.fixture
+def scorer(clean_flights_csv, tmp_path):
+    encoders_dir = tmp_path / "features"
+    registry = fit_encoders(clean_flights_csv, directory=encoders_dir)
+    df = load_raw_data(clean_flights_csv)
+    model = LinearRegression().fit(build_features(df, registry), df[TARGET_COLUMN])
+    model_path = tmp_path / "model.joblib"
+    joblib.dump(model, model_path)
+
+    return BatchScorer(
+        model_path=model_path,
+        encoders_dir=encoders_dir,
+        output_dir=tmp_path / "predictions",
+        max_workers=2,
+        chunksize=400,
+    )
+
+
+def _part_mtimes(run_dir):
+    return {path.name: path.stat().st_mtime_ns for path in run_dir.glob("part-*.parquet")}
+
+
+def test_scores_every_row_in_order(scorer, clean_flights_csv):
+    checkpoint = scorer.run(clean_flights_csv)
+    predictions = load_predictions(clean_flights_csv, scorer.output_dir)
+
+    assert checkpoint["rows"] == 5_000
+    assert len(checkpoint["completed"]) == len(checkpoint["partitions"]) == 8
+    assert predictions["row"].tolist() == list(range(5_000))
+
+    df = load_raw_data(clean_flights_csv)
+    registry = fit_encoders(clean_flights_csv, directory=scorer.encoders_dir)
+    expected = joblib.load(scorer.model_path).predict(build_features(df, registry))
+    np.testing.assert_allclose(predictions[PREDICTION_COLUMN], expected, rtol=1e-5)
+    assert (predictions["Airline"] == df["Airline"].astype(str)).all()
+
+
+def test_resume_scores_only_missing_partitions(scorer, clean_flights_csv):
+    scorer.run(clean_flights_csv)
+    run_dir = scorer.output_dir / clean_flights_csv.stem
+    expected = load_predictions(clean_flights_csv, scorer.output_dir)
+
+    # Simulate a run interrupted before partitions 2 and 5 finished
+    checkpoint_path = run_dir / CHECKPOINT_FILENAME
+    checkpoint = json.loads(checkpoint_path.read_text())
+    for number in (2, 5):
+        del checkpoint["completed"][str(number)]
+        (run_dir / f"part-{number:05d}.parquet").unlink()
+    checkpoint_path.write_text(json.dumps(checkpoint))
+    before = _part_mtimes(run_dir)
+
+    resumed = scorer.run(clean_flights_csv)
+    after = _part_mtimes(run_dir)
+
+    assert resumed["rows"] == 5_000
+    assert set(after) - set(before) == {"part-00002.parquet", "part-00005.parquet"}
+    assert all(after[name] == mtime for name, mtime in before.items())
+    pd.testing.assert_frame_equal(load_predictions(clean_flights_csv, scorer.output_dir), expected)
+
+
+def test_changed_model_rescores_everything(scorer, clean_flights_csv):
+    scorer.run(clean_flights_csv)
+    run_dir = scorer.output_dir / clean_flights_csv.stem
+    before = _part_mtimes(run_dir)
+
+    model = joblib.load(scorer.model_path)
+    model.intercept_ += 100.0
+    joblib.dump(model, scorer.model_path)
+    checkpoint = scorer.run(clean_flights_csv)
+    after = _part_mtimes(run_dir)
+
+    assert checkpoint["rows"] == 5_000
+    assert all(after[name] != mtime for name, mtime in before.items())
+
+
+def test_malformed_values_are_scored_as_missing(incomplete_flights_csv, tmp_path):
+    encoders_dir = tmp_path / "features"
+    registry = fit_encoders(incomplete_flights_csv, directory=encoders_dir)
+    df = load_raw_data(incomplete_flights_csv, errors="coerce")
+    known = df[df[TARGET_COLUMN].notna()]
+    model = make_model("linear", {}).fit(build_features(known, registry), known[TARGET_COLUMN])
+    joblib.dump(model, tmp_path / "model.joblib")
+    scorer = BatchScorer(
+        model_path=tmp_path / "model.joblib",
+        encoders_dir=encoders_dir,
+        output_dir=tmp_path / "predictions",
+        max_workers=2,
+        chunksize=400,
+    )
+
+    checkpoint = scorer.run(incomplete_flights_csv)
+    predictions = load_predictions(incomplete_flights_csv, scorer.output_dir)
+
+    assert checkpoint["rows"] == len(predictions) == 3_002
+    assert predictions[PREDICTION_COLUMN].notna().all()
+    # Row 2,500 has no Airline
+    assert predictions["Airline"].isna().tolist() == df["Airline"].isna().tolist()
@@ -0,0 +1,87 @@
+"""Tests for the mergeable streaming statistics."""
+
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.streaming_stats import QuantileSketch, StreamingStats, ValueCounts
+
+QUANTILES = [0.0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0]
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(7)
+    return np.concatenate([rng.lognormal(9.5, 1.2, 50_000), -rng.lognormal(2, 1, 500), [0.0] * 20])
+
+
+@pytest.mark.parametrize("relative_accuracy", [0.01, 0.001])
+def test_sketch_quantiles_within_relative_accuracy(values, relative_accuracy):
+    sketch = QuantileSketch(relative_accuracy).update(values)
+    ordered = np.sort(values)
+
+    for q in QUANTILES:
+        exact = ordered[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= relative_accuracy * abs(exact) + 1e-12
+
+
+def test_sketch_merge_equals_single_pass(values):
+    merged = QuantileSketch(0.01)
+    for part in np.array_split(values, 7):
+        merged.merge(QuantileSketch(0.01).update(part))
+    single = QuantileSketch(0.01).update(values)
+
+    assert merged.count == single.count == len(values)
+    assert [merged.quantile(q) for q in QUANTILES] == [single.quantile(q) for q in QUANTILES]
+
+
+def test_sketch_ignores_nan_and_rejects_mismatched_merge():
+    sketch = QuantileSketch(0.01).update(np.array([1.0, np.nan, 3.0]))
+
+    assert sketch.count == 2
+    assert np.isnan(QuantileSketch().quantile(0.5))
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(0.001))
+
+
+def test_streaming_stats_merge_matches_pandas(values):
+    merged = StreamingStats()
+    for part in np.array_split(values, 5):
+        merged.merge(StreamingStats().update(part))
+    series = pd.Series(values)
+
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(series.mean(), rel=1e-12)
+    assert merged.std == pytest.approx(series.std(), rel=1e-9)
+    assert (merged.min, merged.max) == (series.min(), series.max())
+
+
+def test_streaming_stats_are_exact_for_any_partitioning(values):
+    single = StreamingStats().update(values)
+    exact_mean = sum(Fraction(value) for value in values.tolist()) / len(values)
+
+    assert single.mean == float(exact_mean)
+    for parts in (2, 7, 64):
+        merged = StreamingStats()
+        for part in np.array_split(values[::-1], parts):
+            merged.merge(StreamingStats().update(part))
+        assert merged.summary() == single.summary()
+
+
+def test_value_counts_are_exact_and_mergeable():
+    rng = np.random.default_rng(3)
+    values = rng.integers(0, 500, 20_000).astype(float)
+    values[::97] = np.nan
+
+    merged = ValueCounts()
+    for part in np.array_split(values, 4):
+        merged.merge(ValueCounts().update(part))
+    series = pd.Series(values)
+
+    assert merged.count == series.count()
+    assert merged.nunique == series.nunique()
+    assert merged.median == series.median()
+    assert merged.quantile(0.25) == series.quantile(0.25)
+    assert merged.std == pytest.approx(series.std())
@@ -0,0 +1,51 @@
+"""Tests for the temporal features."""
+
+import pandas as pd
+
+from src.features.temporal import build_temporal_features, temporal_features
+
+
+def _flights(departures):
+    departure = pd.to_datetime(pd.Series(departures))
+    return pd.DataFrame(
+        {
+            "Departure Date & Time": departure,
+            "Arrival Date & Time": departure + pd.Timedelta(hours=1),
+            "Duration (hrs)": 1.0,
+        }
+    )
+
+
+def test_days_to_holiday_crosses_year_boundary():
+    features = temporal_features(_flights(["2025-01-02 10:00:00", "2024-12-20 10:00:00"]))
+
+    # Nearest holidays: Christmas 2024 and Victory Day 2024 / Christmas 2024
+    assert features["Days To Holiday"].tolist() == [8, 4]
+
+
+def test_features_do_not_depend_on_batch():
+    departures = ["2025-01-02 10:00:00", "2024-06-01 08:30:00", "2023-12-30 23:00:00", None]
+    batch = temporal_features(_flights(departures))
+
+    for position, departure in enumerate(departures):
+        alone = temporal_features(_flights([departure]))
+        pd.testing.assert_frame_equal(
+            alone.reset_index(drop=True), batch.iloc[[position]].reset_index(drop=True)
+        )
+
+
+def test_missing_departure_gets_sentinels():
+    features = temporal_features(_flights([None]))
+
+    assert features["Days To Holiday"].tolist() == [-1]
+    assert not features["Is Public Holiday"].any()
+
+
+def test_build_reads_malformed_values_as_missing(incomplete_flights_csv, tmp_path):
+    path = build_temporal_features(incomplete_flights_csv, output_dir=tmp_path, chunksize=700)
+    features = pd.read_parquet(path)
+
+    assert len(features) == 3_002
+    # Rows 50 and 60 lack a valid Duration; their departures still give the calendar features
+    assert (features["Departure Hour"] >= 0).all()
+    assert features["Scheduled Duration (hrs)"].notna().all()
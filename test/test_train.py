@@ -0,0 +1,35 @@
+"""Tests for the training pipeline."""
+
+import numpy as np
+import pytest
+
+from src.training.models import make_model
+from src.training.train import train_model
+
+
+@pytest.mark.parametrize("model_name", ["linear", "random_forest"])
+def test_models_impute_missing_features(model_name):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    y = X @ np.array([1.0, 2.0, 3.0])
+    X[::7, 1] = np.nan
+
+    model = make_model(model_name, {"n_estimators": 10} if model_name == "random_forest" else {})
+    model.fit(X, y)
+
+    assert np.isfinite(model.predict(X)).all()
+
+
+def test_training_skips_missing_targets_and_imputes_inputs(incomplete_flights_csv, tmp_path):
+    report = train_model(
+        incomplete_flights_csv,
+        model_name="linear",
+        model_path=tmp_path / "model.joblib",
+        encoders_dir=tmp_path / "features",
+        matrix_dir=tmp_path / "matrices",
+        tracking_dir=tmp_path / "mlruns",
+    )
+
+    # Two of the 3,002 rows have no Total Fare, two more lack a Duration
+    assert report["train_rows"] + report["validation_rows"] + report["test_rows"] == 3_000
+    assert all(np.isfinite(value) for value in report["metrics"].values())
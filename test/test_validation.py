@@ -0,0 +1,104 @@
+"""Tests for the one-shot, streaming, parallel and incremental validation paths."""
+
+import pandas as pd
+import pytest
+
+from src.data.loader import load_raw_data, plan_partitions
+from src.data.manifest import RawDataManifest
+from src.data.validation import FlightDataValidator, _validate_partition
+
+
+def assert_same_results(actual, expected):
+    """Compare validation results; failure cases may hold NaN, so compare them as frames."""
+    pd.testing.assert_frame_equal(pd.DataFrame(actual["errors"]), pd.DataFrame(expected["errors"]))
+    assert {k: v for k, v in actual.items() if k != "errors"} == {
+        k: v for k, v in expected.items() if k != "errors"
+    }
+
+
+@pytest.fixture
+def one_shot(flights_csv):
+    return FlightDataValidator().validate(
+        load_raw_data(flights_csv, errors="ignore", compact=False)
+    )
+
+
+def test_one_shot_reports_invalid_rows(one_shot):
+    failures = {(error["column"], error["index"]) for error in one_shot["errors"]}
+
+    assert not one_shot["is_valid"]
+    assert failures == {("Airline", 2500), ("Class", 10), ("Days Before Departure", 500)}
+    assert one_shot["stats"]["total_rows"] == 3_002
+    assert one_shot["stats"]["duplicate_rows"] == 2
+
+
+def test_out_of_range_value_is_reported_unwrapped(one_shot):
+    (days,) = [e for e in one_shot["errors"] if e["column"] == "Days Before Departure"]
+    assert days["failure_case"] == 65_600
+
+
+@pytest.mark.parametrize("chunksize", [700, 1_000_000])
+def test_stream_matches_one_shot(flights_csv, one_shot, chunksize):
+    results = FlightDataValidator().validate_stream(flights_csv, chunksize=chunksize)
+
+    assert_same_results(results, one_shot)
+
+
+def test_parallel_matches_one_shot(flights_csv, one_shot):
+    results = FlightDataValidator().validate_parallel(flights_csv, max_workers=2, chunksize=700)
+
+    assert_same_results(results, one_shot)
+
+
+def test_partition_worker_streams_its_range(flights_csv, range_reads):
+    (partition,) = plan_partitions(flights_csv, num_partitions=1)
+
+    failures, accumulator = _validate_partition(partition, None, chunksize=500)
+
+    # The range is read in pieces as the parser asks for them, never whole
+    size = len(partition["header"]) + partition["end"] - partition["start"]
+    assert sum(range_reads) == size
+    assert max(range_reads) < size / 2
+    assert accumulator.total_rows == 3_002
+    assert {case["index"] for case in failures.result()} == {10, 500, 2500}
+
+
+def test_incremental_matches_full_after_append(flights_csv, one_shot, tmp_path, range_reads):
+    raw = flights_csv.read_bytes()
+    header, rows = raw.split(b"\n", 1)
+    split = rows.index(b"\n", len(rows) // 2) + 1
+
+    data_dir = tmp_path / "raw"
+    data_dir.mkdir()
+    path = data_dir / flights_csv.name
+    path.write_bytes(header + b"\n" + rows[:split])
+
+    manifest = RawDataManifest(data_dir)
+    manifest.record(path, manifest.check(path)["scan"])
+    validator = FlightDataValidator()
+    validator.validate_incremental(path, manifest)
+
+    with open(path, "ab") as f:
+        f.write(rows[split:])
+    change = manifest.check(path)
+    assert change["status"] == "appended"
+    manifest.record(path, change["scan"], appended_to=change["entry"])
+    assert manifest.load_state(path, "validation")[1] == len(header) + 1 + split
+    range_reads.clear()
+    results = validator.validate_incremental(path, manifest)
+
+    # Only the appended rows were read, in parser-sized pieces
+    assert len(header) + 1 + len(rows) - split == sum(range_reads)
+    assert max(range_reads) < len(rows) - split
+
+    assert_same_results(results, one_shot)
+
+
+def test_record_validation_agrees_with_schema(flights_csv):
+    df = pd.read_csv(flights_csv)
+    validator = FlightDataValidator()
+
+    assert validator.validate_record(df.iloc[0].to_dict())["is_valid"]
+    assert not validator.validate_record(df.iloc[10].to_dict())["is_valid"]
+    assert not validator.validate_record(df.iloc[500].to_dict())["is_valid"]
+    assert not validator.validate_record(df.iloc[2500].to_dict())["is_valid"]